@@ -181,6 +181,12 @@ def recibir_webhook():
 # PÁGINA DE ESTADO
 # =============================================================================
 
+@app.route('/estado', methods=['GET'])
+def estado():
+    """Métricas para monitoreo: circuito MySQL, pool, spool, cola de intereses."""
+    return jsonify(bot.estado()), 200
+
+
 @app.route('/', methods=['GET'])
 def inicio():
     return """
@@ -190,6 +196,7 @@ def inicio():
         <ul style="list-style:none; padding:0;">
             <li>📌 <b>POST /procesar</b> → WPPConnect (pruebas WhatsApp personal)</li>
             <li>📌 <b>GET/POST /webhook</b> → WhatsApp Business API (producción)</li>
+            <li>📌 <b>GET /estado</b> → Métricas de MySQL, catálogo y colas</li>
         </ul>
     </body></html>
     """, 200
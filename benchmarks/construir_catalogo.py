@@ -0,0 +1,91 @@
+"""
+Benchmark de construcción del catálogo: fila a fila vs. procesos en paralelo
+vs. vectorizada con pandas (si está instalado).
+
+    python -m benchmarks.construir_catalogo [procesos] [tamaños...]
+
+Ejemplo: python -m benchmarks.construir_catalogo 4 1000 10000 100000 1000000
+"""
+import os
+import random
+import sys
+import time
+
+from src import catalogo_builder
+from src.catalogo_builder import (
+    agrupar_por_categoria,
+    construir_catalogo_paralelo,
+    construir_catalogo_vectorizado,
+    construir_categoria,
+    ensamblar_catalogo,
+)
+from src.catalogo_compacto import TablaProductos
+from src.indice_busqueda import iterar_productos
+
+MOTORES = (("dict", None), ("compacto", TablaProductos))
+
+CATEGORIAS = ["Neveras", "Televisores", "Lavadoras", "Estufas", "Sonido", "Computadores",
+              "Congeladores", "Aires acondicionados", "Celulares", "Colchones", "Muebles", "Motos"]
+MARCAS = ["LG", "Samsung", "Haceb", "Mabe", "Whirlpool", "Challenger", "Kalley", "Sony",
+          "Lenovo", "HP", "Electrolux", "Abba", "Indurama", "Xiaomi", "Motorola", "AKT"]
+ESTADOS = [None, "Disponible", "Disponible", "Agotado", "Exhibición"]
+
+
+def articulos_sinteticos(cantidad, semilla=146):
+    rnd = random.Random(semilla)
+    return [
+        {
+            "id_articulo": i,
+            "referencia": f"REF-{i:07d}",
+            "nombre": f"{rnd.choice(CATEGORIAS)[:-1]} modelo {rnd.randint(100, 9999)}",
+            "marca": rnd.choice(MARCAS),
+            "categoria": rnd.choice(CATEGORIAS),
+            "estado": rnd.choice(ESTADOS),
+            "precio": rnd.randint(200, 9000) * 1000,
+        }
+        for i in range(1, cantidad + 1)
+    ]
+
+
+def construir_fila_a_fila(articulos, fabrica_productos=None):
+    """El camino secuencial sin la selección automática por tamaño."""
+    nodos = {}
+    for nombre, items in agrupar_por_categoria(articulos).items():
+        nodos[nombre], _ = construir_categoria(nombre, items, fabrica_productos=fabrica_productos)
+    return ensamblar_catalogo(nodos)
+
+
+def _medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main(argv):
+    procesos = int(argv[0]) if argv else (os.cpu_count() or 1)
+    tamanos = [int(t) for t in argv[1:]] or [1000, 10000, 100000, 1000000]
+    con_pandas = catalogo_builder._pandas()
+    print(f"CPUs: {os.cpu_count()}  procesos: {procesos}  pandas: {'sí' if con_pandas else 'no'}")
+    print(f"{'motor':>9} {'artículos':>10} {'filas':>9} {'paralelo':>9} {'vectorizado':>12}")
+    for cantidad in tamanos:
+        articulos = articulos_sinteticos(cantidad)
+        for motor, fabrica in MOTORES:
+            secuencial, t_sec = _medir(construir_fila_a_fila, articulos, fabrica)
+            esperado = [e[:3] for e in iterar_productos(secuencial)]
+            del secuencial
+
+            paralelo, t_par = _medir(construir_catalogo_paralelo, articulos, procesos, fabrica)
+            # Mismo orden, misma numeración y mismos productos
+            assert [e[:3] for e in iterar_productos(paralelo)] == esperado
+            del paralelo
+            columna_vec = "-"
+            if con_pandas:
+                vectorizado, t_vec = _medir(construir_catalogo_vectorizado, articulos, fabrica)
+                assert [e[:3] for e in iterar_productos(vectorizado)] == esperado
+                del vectorizado
+                columna_vec = f"{t_vec:.2f}s ({t_sec / t_vec:.2f}x)"
+            print(f"{motor:>9} {cantidad:>10} {t_sec:>8.2f}s {t_par:>8.2f}s {columna_vec:>12}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,61 @@
+"""
+Benchmark del tiempo de importación de los módulos del bot, cada medición en
+un proceso nuevo con `python -X importtime`.
+
+    python -m benchmarks.importacion [repeticiones] [módulos...]
+
+"con .pyc" es el arranque normal; "sin .pyc" compila el código fuente (primer
+arranque tras un despliegue). La última columna es el primer acceso a
+CATALOGO, que solo paga quien usa el catálogo de respaldo.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+MODULOS = ("src.catalogo", "src.catalogo_builder", "src.cerebro")
+PRIMER_ACCESO = (
+    "import time; from src.catalogo import CATALOGO; t = time.perf_counter(); "
+    "CATALOGO['nevera']; print(int((time.perf_counter() - t) * 1e6))"
+)
+
+
+def _ejecutar(argumentos, entorno=None):
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.run(
+        [sys.executable, *argumentos], cwd=raiz, env=entorno, capture_output=True, text=True, check=True
+    )
+
+
+def tiempo_importacion(modulo, repeticiones, sin_pyc=False):
+    """Mediana del tiempo acumulado de importación (ms) de `modulo`."""
+    tiempos = []
+    for _ in range(repeticiones):
+        entorno = dict(os.environ)
+        if sin_pyc:
+            # Carpeta de bytecode vacía en cada ejecución: se compila todo desde el fuente
+            entorno["PYTHONPYCACHEPREFIX"] = tempfile.mkdtemp(prefix="pyc-")
+        salida = _ejecutar(["-X", "importtime", "-c", f"import {modulo}"], entorno).stderr
+        for linea in salida.splitlines():
+            campos = [c.strip() for c in linea.split("|")]
+            if len(campos) == 3 and campos[2] == modulo:
+                tiempos.append(int(campos[1]) / 1000)
+    return statistics.median(tiempos)
+
+
+def main(argv):
+    repeticiones = int(argv[0]) if argv else 5
+    modulos = argv[1:] or MODULOS
+    _ejecutar(["-c", f"import {', '.join(modulos)}"])  # deja los .pyc al día
+    print(f"{'módulo':>22} {'con .pyc':>10} {'sin .pyc':>10}")
+    for modulo in modulos:
+        caliente = tiempo_importacion(modulo, repeticiones)
+        frio = tiempo_importacion(modulo, repeticiones, sin_pyc=True)
+        print(f"{modulo:>22} {caliente:>8.1f}ms {frio:>8.1f}ms")
+    acceso = statistics.median(int(_ejecutar(["-c", PRIMER_ACCESO]).stdout) for _ in range(repeticiones))
+    print(f"primer acceso a CATALOGO: {acceso / 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
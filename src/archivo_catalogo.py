@@ -0,0 +1,218 @@
+"""
+Snapshot binario del catálogo en disco (CATALOGO_SNAPSHOT_RUTA).
+
+Cada catálogo construido desde MySQL se guarda en un archivo versionado y con
+CRC32. Al arrancar, el archivo se abre con mmap y el bot responde de inmediato
+con ese catálogo mientras la recarga desde la BD corre en segundo plano.
+
+Los productos quedan por columnas dentro del archivo (ids y precios en int64,
+textos en UTF-8 contiguo) y se leen con vistas `TablaProductos` sin copiarlos
+a memoria propia: varios workers sobre el mismo archivo comparten las mismas
+páginas de la caché del sistema operativo.
+
+Formato (little-endian):
+    cabecera  magia, formato, reservado, crc32, largo_meta, filas
+    meta      JSON: versión, origen, firma y el árbol categorías → marcas
+    columnas  ids, centavos y cinco columnas de texto (desplazamientos + datos)
+"""
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from array import array
+
+from src.catalogo_compacto import _SIN_ID, TablaProductos
+from src.gestor_catalogo import SnapshotCatalogo
+
+MAGIA = b"CATBOT\r\n"
+FORMATO = 1
+_CABECERA = struct.Struct("<8sHHIQQ")
+# Byte que nunca aparece en UTF-8 válido: marca los valores None
+_NULO = b"\xff"
+_TEXTOS = ("nombre", "referencia", "marca", "categoria", "estado")
+
+
+def _relleno(largo):
+    return b"\0" * (-largo % 8)
+
+
+class ArchivoInvalido(ValueError):
+    pass
+
+
+class _ColumnaTexto:
+    """Columna de texto del archivo mapeado, restringida a las filas de una marca."""
+
+    __slots__ = ("_desplazamientos", "_datos", "_inicio", "_largo")
+
+    def __init__(self, desplazamientos, datos, inicio, fin):
+        self._desplazamientos = desplazamientos
+        self._datos = datos
+        self._inicio = inicio
+        self._largo = fin - inicio
+
+    def __len__(self):
+        return self._largo
+
+    def __getitem__(self, fila):
+        if not 0 <= fila < self._largo:
+            raise IndexError(fila)
+        i = self._inicio + fila
+        crudo = self._datos[self._desplazamientos[i]:self._desplazamientos[i + 1]]
+        return None if crudo == _NULO else str(crudo, "utf-8")
+
+
+class ArchivoCatalogo:
+    def __init__(self, ruta, origenes=("bd",)):
+        """Solo se guardan snapshots cuyo origen esté en `origenes` (no el respaldo)."""
+        self.ruta = ruta
+        self.origenes = origenes
+
+    # --- escritura ----------------------------------------------------------
+
+    def guardar(self, snapshot):
+        """Escribe el snapshot en disco. Devuelve False si no aplica o falla."""
+        if snapshot.origen not in self.origenes:
+            return False
+        inicio = time.perf_counter()
+        try:
+            cuerpo, largo_meta, filas = self._serializar(snapshot)
+            temporal = f"{self.ruta}.{os.getpid()}.tmp"
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            with open(temporal, "wb") as f:
+                f.write(_CABECERA.pack(MAGIA, FORMATO, 0, zlib.crc32(cuerpo), largo_meta, filas))
+                f.write(cuerpo)
+                f.flush()
+                os.fsync(f.fileno())
+            # Reemplazo atómico: los procesos que tienen mapeado el archivo anterior lo siguen leyendo intacto
+            os.replace(temporal, self.ruta)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"⚠️ No se pudo guardar el snapshot del catálogo en {self.ruta}: {e}")
+            return False
+        print(
+            f"💾 Snapshot v{snapshot.version} del catálogo guardado en {self.ruta} "
+            f"({filas} productos, {time.perf_counter() - inicio:.2f}s)"
+        )
+        return True
+
+    def _serializar(self, snapshot):
+        ids = array("q")
+        centavos = array("q")
+        textos = {campo: [] for campo in _TEXTOS}
+        categorias = []
+        for clave, nodo in snapshot.catalogo.items():
+            marcas = []
+            for sid, marca in nodo["subcategorias"].items():
+                productos = marca["productos"]
+                if list(productos) != [str(i) for i in range(1, len(productos) + 1)]:
+                    raise ValueError(f"productos de {clave}/{sid} sin numeración 1..n")
+                desde = len(ids)
+                for producto in productos.values():
+                    # Fila original de `articulos` (con su nombre tal cual, aunque sea None)
+                    articulo = getattr(producto, "articulo", producto)
+                    id_articulo = articulo.get("id_articulo")
+                    if id_articulo is not None and (not isinstance(id_articulo, int) or id_articulo < 0):
+                        raise ValueError(f"id_articulo no entero: {id_articulo!r}")
+                    ids.append(_SIN_ID if id_articulo is None else id_articulo)
+                    centavos.append(int(round(producto["precio_num"] * 100)))
+                    for campo in _TEXTOS:
+                        valor = articulo.get(campo)
+                        textos[campo].append(_NULO if valor is None else str(valor).encode("utf-8"))
+                resto = {k: v for k, v in marca.items() if k != "productos"}
+                marcas.append([sid, resto, desde, len(ids)])
+            resto = {k: v for k, v in nodo.items() if k != "subcategorias"}
+            categorias.append([clave, resto, marcas])
+
+        firma = snapshot.firma
+        meta = json.dumps(
+            {
+                "version": snapshot.version,
+                "origen": snapshot.origen,
+                "firma": list(firma) if isinstance(firma, tuple) else firma,
+                "creado_en": snapshot.creado_en,
+                "categorias": categorias,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        partes = [meta, _relleno(len(meta)), ids.tobytes(), centavos.tobytes()]
+        for campo in _TEXTOS:
+            desplazamientos = array("q", [0])
+            total = 0
+            for valor in textos[campo]:
+                total += len(valor)
+                desplazamientos.append(total)
+            partes += [desplazamientos.tobytes(), b"".join(textos[campo]), _relleno(total)]
+        return b"".join(partes), len(meta), len(ids)
+
+    # --- lectura ------------------------------------------------------------
+
+    def cargar(self):
+        """SnapshotCatalogo leído del archivo, o None si no existe o no es válido."""
+        if not os.path.exists(self.ruta):
+            return None
+        inicio = time.perf_counter()
+        try:
+            with open(self.ruta, "rb") as f:
+                # El mapa sigue vivo mientras lo referencien las vistas de los productos
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            snapshot, filas = self._leer(memoryview(mapa))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Snapshot del catálogo {self.ruta} descartado: {e}")
+            return None
+        print(
+            f"📦 Catálogo v{snapshot.version} cargado desde {self.ruta} "
+            f"({filas} productos, {(time.perf_counter() - inicio) * 1000:.0f} ms)"
+        )
+        return snapshot
+
+    @staticmethod
+    def _leer(vista):
+        if len(vista) < _CABECERA.size:
+            raise ArchivoInvalido("archivo truncado")
+        magia, formato, _, crc, largo_meta, filas = _CABECERA.unpack_from(vista)
+        if magia != MAGIA:
+            raise ArchivoInvalido("no es un snapshot del catálogo")
+        if formato != FORMATO:
+            raise ArchivoInvalido(f"formato {formato} no soportado (se esperaba {FORMATO})")
+        if zlib.crc32(vista[_CABECERA.size:]) != crc:
+            raise ArchivoInvalido("CRC32 no coincide")
+
+        posicion = _CABECERA.size
+
+        def tomar(largo):
+            nonlocal posicion
+            if posicion + largo > len(vista):
+                raise ArchivoInvalido("archivo truncado")
+            trozo = vista[posicion:posicion + largo]
+            posicion += largo + (-largo % 8)
+            return trozo
+
+        meta = json.loads(str(tomar(largo_meta), "utf-8"))
+        ids = tomar(8 * filas).cast("q")
+        centavos = tomar(8 * filas).cast("q")
+        columnas = {}
+        for campo in _TEXTOS:
+            desplazamientos = tomar(8 * (filas + 1)).cast("q")
+            columnas[campo] = (desplazamientos, tomar(desplazamientos[filas]))
+
+        catalogo = {}
+        for clave, nodo, marcas in meta["categorias"]:
+            subcategorias = {}
+            for sid, marca, desde, hasta in marcas:
+                textos = {campo: _ColumnaTexto(*columnas[campo], desde, hasta) for campo in _TEXTOS}
+                marca["productos"] = TablaProductos.desde_vistas(ids[desde:hasta], centavos[desde:hasta], **textos)
+                subcategorias[sid] = marca
+            nodo["subcategorias"] = subcategorias
+            catalogo[clave] = nodo
+
+        firma = meta["firma"]
+        snapshot = SnapshotCatalogo(
+            meta["version"], catalogo, meta["origen"], tuple(firma) if isinstance(firma, list) else firma
+        )
+        snapshot.creado_en = meta["creado_en"]
+        return snapshot, filas
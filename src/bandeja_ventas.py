@@ -0,0 +1,178 @@
+"""
+Bandeja de salida (outbox) para las órdenes de venta.
+
+El flujo de conversación solo inserta la orden en un SQLite local y responde
+de inmediato; un hilo en segundo plano la escribe en MySQL y la reintenta con
+espera exponencial mientras falle. Cada orden lleva una clave de idempotencia
+que viaja hasta MySQL, así un reintento nunca duplica la venta.
+
+Tras `max_intentos` fallos la orden pasa a la tabla `ventas_fallidas` del mismo
+archivo (con el último error) y deja de reintentarse: queda para revisión manual.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class BandejaVentas:
+    def __init__(self, ruta, escribir, intervalo=2.0, reintento_max=300.0, arrendamiento=60.0, lote=50,
+                 max_intentos=50):
+        """
+        `escribir(clave, orden) -> bool` hace la escritura real; False o una
+        excepción dejan la orden pendiente para otro intento.
+        """
+        self.ruta = ruta
+        self._escribir = escribir
+        self.intervalo = intervalo
+        self.reintento_max = reintento_max
+        self.arrendamiento = arrendamiento
+        self.lote = lote
+        self.max_intentos = max_intentos
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._metricas = {"registradas": 0, "escritas": 0, "reintentos": 0, "descartadas": 0}
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with self._conexion() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ventas_pendientes ("
+                "clave TEXT PRIMARY KEY, datos TEXT NOT NULL, intentos INTEGER NOT NULL, "
+                "creado REAL NOT NULL, proximo_intento REAL NOT NULL, error TEXT)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_ventas_pendientes_proximo ON ventas_pendientes (proximo_intento)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ventas_fallidas ("
+                "clave TEXT PRIMARY KEY, datos TEXT NOT NULL, intentos INTEGER NOT NULL, "
+                "creado REAL NOT NULL, fallida REAL NOT NULL, error TEXT)"
+            )
+
+        self._detener = threading.Event()
+        self._despertar = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, name="bandeja-ventas", daemon=True)
+        self._hilo.start()
+
+    def _conexion(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.ruta, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Una orden confirmada al cliente no puede perderse con un corte de luz
+            conn.execute("PRAGMA synchronous=FULL")
+            self._local.conn = conn
+        return conn
+
+    def registrar(self, orden):
+        """Guarda la orden (dict apto para JSON) y devuelve su clave de idempotencia."""
+        clave = uuid.uuid4().hex
+        ahora = time.time()
+        with self._conexion() as conn:
+            conn.execute(
+                "INSERT INTO ventas_pendientes (clave, datos, intentos, creado, proximo_intento) "
+                "VALUES (?, ?, 0, ?, ?)",
+                (clave, json.dumps(orden, ensure_ascii=False, default=str), ahora, ahora),
+            )
+        with self._lock:
+            self._metricas["registradas"] += 1
+        self._despertar.set()
+        return clave
+
+    def pendientes(self):
+        return self._conexion().execute("SELECT COUNT(*) FROM ventas_pendientes").fetchone()[0]
+
+    def fallidas(self):
+        return self._conexion().execute("SELECT COUNT(*) FROM ventas_fallidas").fetchone()[0]
+
+    def procesar_pendientes(self):
+        """Intenta escribir las órdenes vencidas. Devuelve cuántas quedaron escritas."""
+        conn = self._conexion()
+        ahora = time.time()
+        filas = conn.execute(
+            "SELECT clave, datos, intentos, proximo_intento FROM ventas_pendientes "
+            "WHERE proximo_intento <= ? ORDER BY creado LIMIT ?",
+            (ahora, self.lote),
+        ).fetchall()
+
+        escritas = intentadas = descartadas = 0
+        for clave, datos, intentos, proximo in filas:
+            # Reclamar la orden: con varios workers sobre el mismo archivo solo uno la procesa
+            with conn:
+                reclamada = conn.execute(
+                    "UPDATE ventas_pendientes SET proximo_intento = ? WHERE clave = ? AND proximo_intento = ?",
+                    (ahora + self.arrendamiento, clave, proximo),
+                ).rowcount
+            if not reclamada:
+                continue
+            intentadas += 1
+
+            error = None
+            try:
+                ok = self._escribir(clave, json.loads(datos))
+            except Exception as e:
+                ok, error = False, str(e)
+
+            descartada = not ok and intentos + 1 >= self.max_intentos
+            with conn:
+                if ok:
+                    conn.execute("DELETE FROM ventas_pendientes WHERE clave = ?", (clave,))
+                elif descartada:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO ventas_fallidas (clave, datos, intentos, creado, fallida, error) "
+                        "SELECT clave, datos, intentos + 1, creado, ?, ? FROM ventas_pendientes WHERE clave = ?",
+                        (time.time(), error or "sin conexión", clave),
+                    )
+                    conn.execute("DELETE FROM ventas_pendientes WHERE clave = ?", (clave,))
+                else:
+                    espera = min(self.reintento_max, self.intervalo * 2 ** intentos)
+                    conn.execute(
+                        "UPDATE ventas_pendientes SET intentos = intentos + 1, proximo_intento = ?, error = ? "
+                        "WHERE clave = ?",
+                        (time.time() + espera, error, clave),
+                    )
+            if ok:
+                escritas += 1
+            elif descartada:
+                descartadas += 1
+                print(
+                    f"❌ Venta {clave} descartada tras {intentos + 1} intentos: {error or 'sin conexión'} "
+                    f"(queda en ventas_fallidas de {self.ruta})"
+                )
+            else:
+                print(f"⚠️ Venta {clave} no escrita en MySQL (intento {intentos + 1}): {error or 'sin conexión'}")
+
+        with self._lock:
+            self._metricas["escritas"] += escritas
+            self._metricas["reintentos"] += intentadas - escritas - descartadas
+            self._metricas["descartadas"] += descartadas
+        return escritas
+
+    def metricas(self):
+        with self._lock:
+            datos = dict(self._metricas)
+        datos["pendientes"] = self.pendientes()
+        datos["fallidas"] = self.fallidas()
+        return datos
+
+    def detener(self, timeout=10):
+        """Último intento de escritura y apagado del hilo; lo no escrito queda en disco."""
+        self._detener.set()
+        self._despertar.set()
+        self._hilo.join(timeout=timeout)
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            try:
+                self.procesar_pendientes()
+            except sqlite3.Error as e:
+                print(f"❌ Error leyendo la bandeja de ventas: {e}")
+            self._despertar.wait(self.intervalo)
+            self._despertar.clear()
+        try:
+            self.procesar_pendientes()
+        except sqlite3.Error as e:
+            print(f"❌ Error leyendo la bandeja de ventas: {e}")
@@ -1,9 +1,29 @@
 """
 Construye la estructura de catálogo del bot a partir de la tabla `articulos`.
 """
+import importlib.util
 import re
+import sys
 import unicodedata
 from collections import defaultdict
+from collections.abc import Mapping
+
+from src.cache import CacheLRU
+from src.texto import sin_acentos
+
+# pandas es opcional (sin él no hay construcción vectorizada) y se importa con el
+# primer catálogo grande: importarlo al arrancar cuesta casi medio segundo
+np = pd = None
+_HAY_PANDAS = importlib.util.find_spec("pandas") is not None
+
+
+def _pandas():
+    """Importa pandas/NumPy en el primer uso. False si pandas no está instalado."""
+    global np, pd
+    if pd is None and _HAY_PANDAS:
+        import numpy as np
+        import pandas as pd
+    return pd is not None
 
 
 EMOJI_POR_CATEGORIA = {
@@ -35,6 +55,9 @@ EMOJI_POR_CATEGORIA = {
     "nevecones": "❄️",
 }
 
+# Por debajo de este número de artículos arrancar procesos cuesta más de lo que ahorra
+MIN_ARTICULOS_PARALELO = 50000
+
 ESTADOS_NO_DISPONIBLES = {
     "agotado",
     "sin stock",
@@ -75,6 +98,11 @@ def _formato_precio(precio):
     return f"{texto} COP", valor
 
 
+def _internar(valor):
+    """Cadenas repetidas (marca, categoría, estado) comparten un solo objeto."""
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
 def _producto_disponible(estado):
     if not estado:
         return True
@@ -113,11 +141,103 @@ def _descripcion_amplia(articulo, precio_texto, disponible):
     return "\n".join(lineas)
 
 
+_RENDERIZADORES = {
+    "descripcion_corta": _descripcion_corta,
+    "descripcion_amplia": _descripcion_amplia,
+}
+
+# Caché LRU opcional de descripciones compartida por todas las versiones del catálogo
+_cache_descripciones = None
+
+
+def usar_cache_descripciones(max_entradas):
+    """Activa (max_entradas > 0) o desactiva la caché acotada de descripciones."""
+    global _cache_descripciones
+    _cache_descripciones = CacheLRU(max_entradas=max_entradas, ttl=None) if max_entradas else None
+
+
+def descripcion_producto(campo, articulo, precio_texto, disponible):
+    """Genera 'descripcion_corta' o 'descripcion_amplia' pasando por la caché LRU si está activa."""
+    render = _RENDERIZADORES[campo]
+    if _cache_descripciones is None:
+        return render(articulo, precio_texto, disponible)
+
+    # La clave es el contenido: un artículo modificado no reutiliza el texto anterior
+    clave = (
+        campo,
+        articulo.get("nombre"),
+        articulo.get("marca"),
+        articulo.get("referencia"),
+        articulo.get("categoria"),
+        articulo.get("estado"),
+        precio_texto,
+    )
+    texto = _cache_descripciones.obtener(clave)
+    if texto is None:
+        texto = render(articulo, precio_texto, disponible)
+        _cache_descripciones.guardar(clave, texto)
+    return texto
+
+
+class ProductoCatalogo(Mapping):
+    """
+    Producto del catálogo con la interfaz de un dict de solo lectura.
+
+    Las descripciones no se generan al construir el catálogo sino la primera
+    vez que se leen; quedan guardadas en el producto (es decir, por versión
+    del catálogo) o, con la caché LRU activa, solo en ella.
+    """
+
+    __slots__ = ("_datos", "_articulo", "_descripciones")
+
+    def __init__(self, datos, articulo):
+        self._datos = datos
+        self._articulo = articulo
+        self._descripciones = None
+
+    def __getitem__(self, campo):
+        if campo in _RENDERIZADORES:
+            return self._descripcion(campo)
+        return self._datos[campo]
+
+    def __iter__(self):
+        yield from self._datos
+        yield from _RENDERIZADORES
+
+    def __len__(self):
+        return len(self._datos) + len(_RENDERIZADORES)
+
+    @property
+    def articulo(self):
+        """Fila original de `articulos` de la que salió el producto."""
+        return self._articulo
+
+    def __repr__(self):
+        return f"ProductoCatalogo({self._datos!r})"
+
+    def __reduce__(self):
+        # Más rápido que el estado genérico de __slots__ (construcción en paralelo)
+        return ProductoCatalogo, (self._datos, self._articulo)
+
+    def _descripcion(self, campo):
+        if self._descripciones and campo in self._descripciones:
+            return self._descripciones[campo]
+        texto = descripcion_producto(campo, self._articulo, self._datos["precio"], self._datos["disponible"])
+        if _cache_descripciones is None:
+            if self._descripciones is None:
+                self._descripciones = {}
+            self._descripciones[campo] = texto
+        return texto
+
+
 def _articulo_a_producto(articulo):
     precio_texto, precio_num = _formato_precio(articulo.get("precio"))
     disponible = _producto_disponible(articulo.get("estado"))
+    return _producto(articulo, precio_texto, precio_num, disponible)
 
-    return {
+
+def _producto(articulo, precio_texto, precio_num, disponible):
+    datos = {
         "id_articulo": articulo.get("id_articulo"),
         "nombre": articulo.get("nombre") or "Producto sin nombre",
         "referencia": articulo.get("referencia"),
@@ -128,77 +248,371 @@ def _articulo_a_producto(articulo):
         "precio": precio_texto,
         "precio_num": precio_num,
         "imagenes": [],
-        "descripcion_corta": _descripcion_corta(articulo, precio_texto, disponible),
-        "descripcion_amplia": _descripcion_amplia(articulo, precio_texto, disponible),
     }
+    return ProductoCatalogo(datos, articulo)
 
 
-def construir_catalogo_desde_articulos(articulos):
-    """
-    Agrupa artículos por categoría y marca para el flujo conversacional del bot.
-    Retorna None si no hay artículos.
-    """
-    if not articulos:
-        return None
+def productos_como_dicts(articulos):
+    """Motor por defecto: un dict por producto, numerados desde "1"."""
+    return {str(idx_prod): _articulo_a_producto(articulo) for idx_prod, articulo in enumerate(articulos, start=1)}
 
+
+def nombre_categoria(articulo):
+    return (articulo.get("categoria") or "General").strip()
+
+
+def agrupar_por_categoria(articulos):
+    """Agrupa artículos por nombre de categoría conservando el orden de llegada."""
     por_categoria = defaultdict(list)
     for articulo in articulos:
-        categoria = (articulo.get("categoria") or "General").strip()
-        por_categoria[categoria].append(articulo)
+        por_categoria[nombre_categoria(articulo)].append(articulo)
+    return por_categoria
 
-    catalogo = {}
 
-    for nombre_categoria, items_categoria in sorted(por_categoria.items(), key=lambda x: x[0].lower()):
+def _agrupar_por_marca(items_categoria):
+    """[(marca, articulos)] en el orden del menú: marcas y productos por nombre."""
+    por_marca = defaultdict(list)
+    for articulo in sorted(items_categoria, key=lambda a: (a.get("nombre") or "").lower()):
+        marca = (articulo.get("marca") or "Varios").strip()
+        por_marca[marca].append(articulo)
+    return sorted(por_marca.items(), key=lambda x: x[0].lower())
+
+
+def _construir_subcategorias(items_categoria, marcas_previas=None, fabrica_productos=None, firma=None):
+    """
+    Agrupa por marca y numera productos. Si `marcas_previas` trae
+    {marca: (firma, nodo)} y la firma de una marca no cambió, se reutiliza el
+    nodo ya construido. La firma es la lista de artículos de la marca o, con
+    `firma(articulos)`, algo más liviano que los identifique (ids + crc).
+    `fabrica_productos(articulos)` arma el mapa {"1": producto, ...} de cada
+    marca (por defecto, dicts). Devuelve (subcategorias, marcas).
+    """
+    firma = firma or (lambda articulos: articulos)
+    fabrica_productos = fabrica_productos or productos_como_dicts
+    marcas_previas = marcas_previas or {}
+    marcas = {}
+    subcategorias = {}
+    for idx_marca, (marca, productos_marca) in enumerate(_agrupar_por_marca(items_categoria), start=1):
+        firma_marca = firma(productos_marca)
+        previo = marcas_previas.get(marca)
+        if previo is not None and previo[0] == firma_marca:
+            nodo = previo[1]
+        else:
+            nodo = {
+                "nombre": marca,
+                "productos": fabrica_productos(productos_marca),
+            }
+        marcas[marca] = (firma_marca, nodo)
+        subcategorias[str(idx_marca)] = nodo
+
+    return subcategorias, marcas
+
+
+def marcas_de_categoria(items_categoria, nodo, firma=None):
+    """{marca: (firma, nodo_marca)} de un nodo construido en otro proceso o por columnas."""
+    firma = firma or (lambda articulos: articulos)
+    subcategorias = nodo["subcategorias"]
+    return {
+        marca: (firma(productos_marca), subcategorias[str(idx_marca)])
+        for idx_marca, (marca, productos_marca) in enumerate(_agrupar_por_marca(items_categoria), start=1)
+    }
+
+
+def construir_categoria(nombre_categoria, items_categoria, marcas_previas=None, fabrica_productos=None, firma=None):
+    """Construye el nodo de una categoría. Devuelve (nodo sin clave, marcas)."""
+    subcategorias, marcas = _construir_subcategorias(items_categoria, marcas_previas, fabrica_productos, firma)
+    return _nodo_categoria(nombre_categoria, subcategorias), marcas
+
+
+def _nodo_categoria(nombre_categoria, subcategorias):
+    clave_base = _slugify(nombre_categoria)
+    alias = {
+        clave_base,
+        nombre_categoria.lower(),
+        clave_base.replace("_", " "),
+    }
+    alias.update(p.lower() for p in nombre_categoria.split() if len(p) > 2)
+
+    return {
+        "nombre": nombre_categoria,
+        "emoji": _emoji_para_categoria(nombre_categoria),
+        "alias": sorted(alias),
+        "subcategorias": subcategorias,
+    }
+
+
+def ensamblar_catalogo(nodos_por_categoria):
+    """
+    Ordena las categorías y asigna sus claves. `nodos_por_categoria` es
+    {nombre_categoria: nodo}; las claves repetidas se desambiguan con un sufijo.
+    """
+    catalogo = {}
+    for nombre_categoria, nodo in sorted(nodos_por_categoria.items(), key=lambda x: x[0].lower()):
         clave_categoria = _slugify(nombre_categoria)
         if clave_categoria in catalogo:
             clave_categoria = f"{clave_categoria}_{len(catalogo)}"
+            if clave_categoria not in nodo["alias"]:
+                nodo = dict(nodo, alias=sorted(set(nodo["alias"]) | {clave_categoria}))
+        catalogo[clave_categoria] = nodo
+    return catalogo or None
 
-        por_marca = defaultdict(list)
-        for articulo in sorted(items_categoria, key=lambda a: (a.get("nombre") or "").lower()):
-            marca = (articulo.get("marca") or "Varios").strip()
-            por_marca[marca].append(articulo)
 
-        subcategorias = {}
-        for idx_marca, (marca, productos_marca) in enumerate(sorted(por_marca.items(), key=lambda x: x[0].lower()), start=1):
-            productos = {}
-            for idx_prod, articulo in enumerate(productos_marca, start=1):
-                productos[str(idx_prod)] = _articulo_a_producto(articulo)
+def construir_catalogo_desde_articulos(articulos, fabrica_productos=None, procesos=None, vectorizado=False):
+    """
+    Agrupa artículos por categoría y marca para el flujo conversacional del bot.
+    Con `procesos` > 1 y un inventario grande, las categorías se construyen en
+    paralelo (ver construir_catalogo_paralelo); con `vectorizado` y pandas
+    instalado, por columnas (ver construir_catalogo_vectorizado). Retorna None
+    si no hay artículos.
+    """
+    if not articulos:
+        return None
 
-            subcategorias[str(idx_marca)] = {
-                "nombre": marca,
-                "productos": productos,
-            }
+    if procesos and procesos > 1 and len(articulos) >= MIN_ARTICULOS_PARALELO:
+        return construir_catalogo_paralelo(articulos, procesos, fabrica_productos)
+    if vectorizado and _pandas():
+        return construir_catalogo_vectorizado(articulos, fabrica_productos)
+
+    nodos = {}
+    for nombre_categoria, items_categoria in agrupar_por_categoria(articulos).items():
+        nodos[nombre_categoria], _ = construir_categoria(nombre_categoria, items_categoria,
+                                                         fabrica_productos=fabrica_productos)
+
+    return ensamblar_catalogo(nodos)
+
+
+def _por_valor(valores, funcion):
+    """
+    Aplica `funcion` una sola vez por valor distinto de la columna y reparte el
+    resultado con los códigos de `pd.factorize` (None/NaN -> funcion(None)).
+    Así se conserva exactamente la semántica de los helpers fila a fila.
+    """
+    codigos, unicos = pd.factorize(pd.Series(valores, dtype=object))
+    resultados = np.empty(len(unicos) + 1, dtype=object)
+    resultados[:-1] = [funcion(v) for v in unicos]
+    resultados[-1] = funcion(None)
+    return resultados[codigos]
 
-        alias = {
-            clave_categoria,
-            nombre_categoria.lower(),
-            _slugify(nombre_categoria).replace("_", " "),
-        }
-        alias.update(p.lower() for p in nombre_categoria.split() if len(p) > 2)
 
-        catalogo[clave_categoria] = {
-            "nombre": nombre_categoria,
-            "emoji": _emoji_para_categoria(nombre_categoria),
-            "alias": sorted(alias),
-            "subcategorias": subcategorias,
+def _rango(valores):
+    """Posición de cada valor en el orden de sorted() de sus valores distintos."""
+    return pd.factorize(pd.Series(valores, dtype=object), sort=True)[0]
+
+
+def construir_catalogo_vectorizado(articulos, fabrica_productos=None):
+    """
+    Misma salida que la construcción fila a fila, pero por columnas con pandas/NumPy:
+    categoría, marca, disponibilidad y precio se calculan una vez por valor
+    distinto y el orden del menú sale de un `np.lexsort`. Con una fábrica que
+    ofrezca `desde_columnas` (motor compacto) las columnas pasan directo a cada
+    tabla; con dicts solo la creación de cada producto sigue siendo por fila.
+
+    No es más rápida que la construcción fila a fila (los nombres y marcas se
+    siguen normalizando en Python): por eso solo se usa si se pide explícitamente.
+    """
+    if not articulos:
+        return None
+    if not _pandas():
+        raise RuntimeError("La construcción vectorizada del catálogo requiere pandas")
+
+    columnas = {c: [a.get(c) for a in articulos] for c in ("nombre", "marca", "categoria", "estado", "precio")}
+    categorias = _por_valor(columnas["categoria"], lambda v: (v or "General").strip())
+    marcas = _por_valor(columnas["marca"], lambda v: (v or "Varios").strip())
+    disponibles = _por_valor(columnas["estado"], _producto_disponible)
+    precios = _por_valor(columnas["precio"], _formato_precio)
+
+    # Orden del menú: categorías por primera aparición (ensamblar_catalogo las ordena
+    # después), productos por nombre y marcas por nombre; marcas que solo difieren en
+    # mayúsculas quedan en el orden en que aparecen.
+    orden_cat = pd.factorize(categorias)[0]
+    marca_codigo = pd.factorize(marcas)[0]
+    posicion = np.arange(len(articulos))
+    por_nombre = np.lexsort((posicion, _rango([(n or "").lower() for n in columnas["nombre"]]), orden_cat))
+    rango_nombre = np.empty_like(posicion)
+    rango_nombre[por_nombre] = posicion
+    aparicion_marca = (
+        pd.Series(rango_nombre).groupby([orden_cat, marca_codigo]).transform("min").to_numpy()
+    )
+    orden = np.lexsort((rango_nombre, aparicion_marca, _rango([m.lower() for m in marcas]), orden_cat))
+
+    # Cortes donde cambia la categoría o la marca
+    cat_ordenada = orden_cat[orden]
+    marca_ordenada = marca_codigo[orden]
+    cortes = np.flatnonzero((np.diff(cat_ordenada) != 0) | (np.diff(marca_ordenada) != 0)) + 1
+    desde_columnas = getattr(fabrica_productos, "desde_columnas", None)
+    if desde_columnas:
+        por_columna = {
+            "id_articulo": np.array([a.get("id_articulo") for a in articulos], dtype=object),
+            "nombre": np.array(columnas["nombre"], dtype=object),
+            "referencia": np.array([a.get("referencia") for a in articulos], dtype=object),
+            "marca": _por_valor(columnas["marca"], _internar),
+            "categoria": _por_valor(columnas["categoria"], _internar),
+            "estado": _por_valor(columnas["estado"], _internar),
+            "precio_num": np.fromiter((p[1] for p in precios), dtype=float, count=len(precios)),
         }
 
-    return catalogo or None
+    nodos = {}
+    for bloque in np.split(orden, cortes):
+        filas = bloque.tolist()
+        primera = filas[0]
+        subcategorias = nodos.setdefault(categorias[primera], {})
+        if desde_columnas:
+            productos = desde_columnas({c: valores[bloque] for c, valores in por_columna.items()})
+        elif fabrica_productos:
+            productos = fabrica_productos([articulos[i] for i in filas])
+        else:
+            productos = {
+                str(idx_prod): _producto(articulos[i], *precios[i], disponibles[i])
+                for idx_prod, i in enumerate(filas, start=1)
+            }
+        subcategorias[str(len(subcategorias) + 1)] = {"nombre": marcas[primera], "productos": productos}
+
+    return ensamblar_catalogo(
+        {nombre: _nodo_categoria(nombre, subcategorias) for nombre, subcategorias in nodos.items()}
+    )
+
+
+# Datos de la construcción en curso dentro de cada proceso hijo
+_grupos_proceso = {}
+_fabrica_proceso = None
+
+
+def _inicializar_proceso(grupos, fabrica_productos):
+    # Con "fork" los argumentos se heredan en memoria: no se serializan los artículos
+    global _grupos_proceso, _fabrica_proceso
+    _grupos_proceso = grupos
+    _fabrica_proceso = fabrica_productos
+
+
+def _construir_nodo(nombre_categoria):
+    nodo, _ = construir_categoria(nombre_categoria, _grupos_proceso[nombre_categoria],
+                                  fabrica_productos=_fabrica_proceso)
+    return nodo
+
+
+def construir_categorias_en_paralelo(grupos, procesos=None, fabrica_productos=None):
+    """
+    {nombre_categoria: nodo} construyendo cada categoría de `grupos` en un proceso aparte.
+
+    Donde existe se usa "fork": con "spawn" cada proceso reimportaría app.py y
+    crearía otro Brain. Los hijos solo ejecutan código de construcción (sin
+    locks, prints ni BD), así que heredar hilos del padre no los afecta.
+    Los nodos vuelven serializados: con el motor compacto eso es barato; con
+    dicts la serialización cuesta casi lo mismo que construir.
+    """
+    # Solo se usan con CATALOGO_PROCESOS > 1: no se cargan al arrancar
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    metodo = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(
+        max_workers=procesos,
+        mp_context=multiprocessing.get_context(metodo),
+        initializer=_inicializar_proceso,
+        initargs=(grupos, fabrica_productos),
+    ) as pool:
+        return dict(zip(grupos, pool.map(_construir_nodo, grupos)))
+
+
+def construir_catalogo_paralelo(articulos, procesos=None, fabrica_productos=None):
+    """
+    Como construir_catalogo_desde_articulos, pero con las categorías en paralelo.
+    `ensamblar_catalogo` ordena por nombre, así que el orden y la numeración son
+    los mismos que en la construcción secuencial.
+    """
+    if not articulos:
+        return None
+    grupos = dict(agrupar_por_categoria(articulos))
+    return ensamblar_catalogo(construir_categorias_en_paralelo(grupos, procesos, fabrica_productos))
+
+
+class IndiceAlias:
+    """
+    Índice de alias de categorías, construido una vez por versión del catálogo.
+
+    - Coincidencia exacta por clave/alias en un dict (también sin tildes).
+    - Coincidencia parcial (`termino in nombre` o `nombre in termino`) con un
+      mapa de todas las subcadenas de los nombres y un barrido del término
+      por cada longitud de nombre distinta.
+    Ante varias coincidencias gana la categoría que aparece primero, igual que
+    el recorrido lineal original.
+    """
+
+    def __init__(self, catalogo):
+        self._claves = list((catalogo or {}).keys())
+        self._items = catalogo or {}
+        self._exactos = {}
+        self._exactos_sin_acentos = {}
+        self._parciales = (_IndiceParcial(), _IndiceParcial())
+
+        for posicion, (clave, item) in enumerate(self._items.items()):
+            for termino in [clave, *item.get("alias", [])]:
+                self._exactos.setdefault(termino, clave)
+                self._exactos_sin_acentos.setdefault(sin_acentos(termino), clave)
+
+            nombre = item.get("nombre", "").lower()
+            self._parciales[0].agregar(nombre, posicion)
+            self._parciales[1].agregar(sin_acentos(nombre), posicion)
+
+    def buscar(self, termino):
+        """Devuelve (clave, item) de la categoría o (None, None)."""
+        t = termino.lower().strip()
+        t_plano = sin_acentos(t)
+
+        clave = self._exactos.get(t) or self._exactos_sin_acentos.get(t_plano)
+        if clave is None:
+            posicion = self._parciales[0].buscar(t)
+            if posicion is None:
+                posicion = self._parciales[1].buscar(t_plano)
+            if posicion is not None:
+                clave = self._claves[posicion]
+
+        if clave is None:
+            return None, None
+        return clave, self._items[clave]
+
+
+class _IndiceParcial:
+    """Subcadenas de nombres -> posición, y nombres agrupados por longitud."""
+
+    def __init__(self):
+        self._subcadenas = {}
+        self._por_longitud = defaultdict(dict)
+
+    def agregar(self, nombre, posicion):
+        for inicio in range(len(nombre) + 1):
+            for fin in range(inicio, len(nombre) + 1):
+                self._subcadenas.setdefault(nombre[inicio:fin], posicion)
+        self._por_longitud[len(nombre)].setdefault(nombre, posicion)
+
+    def buscar(self, termino):
+        # termino in nombre
+        mejor = self._subcadenas.get(termino)
+        # nombre in termino
+        for longitud, nombres in self._por_longitud.items():
+            for inicio in range(len(termino) - longitud + 1):
+                posicion = nombres.get(termino[inicio:inicio + longitud])
+                if posicion is not None and (mejor is None or posicion < mejor):
+                    mejor = posicion
+        return mejor
+
+
+# Último índice construido: (catálogo, índice). Un catálogo publicado no se modifica.
+_ultimo_indice_alias = (None, None)
+
+
+def indice_alias(catalogo):
+    """IndiceAlias del catálogo, reutilizado mientras se consulte el mismo catálogo."""
+    global _ultimo_indice_alias
+    catalogo_previo, indice = _ultimo_indice_alias
+    if catalogo_previo is not catalogo:
+        indice = IndiceAlias(catalogo)
+        _ultimo_indice_alias = (catalogo, indice)
+    return indice
 
 
 def obtener_categoria_por_alias(termino, catalogo):
     """Busca categoría por clave, alias o coincidencia parcial."""
     if not catalogo:
         return None, None
-
-    t = termino.lower().strip()
-    for clave, item in catalogo.items():
-        if t == clave or t in item.get("alias", []):
-            return clave, item
-
-    for clave, item in catalogo.items():
-        nombre = item.get("nombre", "").lower()
-        if t in nombre or nombre in t:
-            return clave, item
-
-    return None, None
+    return indice_alias(catalogo).buscar(termino)
@@ -0,0 +1,180 @@
+"""
+Motor compacto del catálogo (CATALOGO_MOTOR=compacto).
+
+En lugar de un dict por producto, los productos de cada marca se guardan por
+columnas: ids y precios en `array`, marca/categoría/estado como cadenas
+internadas compartidas por todo el proceso. `TablaProductos` se comporta como
+el dict {"1": producto, "2": ...} del motor normal y entrega vistas
+`ProductoCompacto` de solo lectura, así que `Brain`, los menús y los índices
+no distinguen un motor del otro.
+
+Como en el motor de dicts, las descripciones se generan la primera vez que se
+leen y quedan guardadas en la tabla (solo las de las filas leídas), salvo con
+la caché LRU de CATALOGO_DESCRIPCIONES_MAX activa.
+"""
+from array import array
+from collections.abc import Mapping
+
+from src import catalogo_builder
+from src.catalogo_builder import _formato_precio, _internar, _producto_disponible, descripcion_producto
+
+_SIN_ID = -1
+
+
+def _columna_ids(valores):
+    """array('q') si todos los ids son enteros; si no (p. ej. CSV), una tupla."""
+    if all(v is None or (isinstance(v, int) and not isinstance(v, bool) and v >= 0) for v in valores):
+        return array("q", (_SIN_ID if v is None else v for v in valores))
+    return tuple(valores)
+
+
+class TablaProductos(Mapping):
+    """Productos de una marca por columnas, indexados por "1".."n" como el dict original."""
+
+    __slots__ = ("_ids", "_centavos", "_nombres", "_referencias", "_marcas", "_categorias", "_estados",
+                 "_descripciones")
+
+    def __init__(self, articulos):
+        self._ids = _columna_ids([a.get("id_articulo") for a in articulos])
+        # Precio en centavos: exacto para DECIMAL(…, 2) y sin un float por fila
+        self._centavos = array("q", (int(round(_formato_precio(a.get("precio"))[1] * 100)) for a in articulos))
+        self._nombres = tuple(a.get("nombre") for a in articulos)
+        self._referencias = tuple(a.get("referencia") for a in articulos)
+        self._marcas = tuple(_internar(a.get("marca")) for a in articulos)
+        self._categorias = tuple(_internar(a.get("categoria")) for a in articulos)
+        self._estados = tuple(_internar(a.get("estado")) for a in articulos)
+        self._descripciones = None
+
+    @classmethod
+    def desde_columnas(cls, columnas):
+        """
+        Para la construcción vectorizada: `columnas` trae un ndarray por campo
+        (cadenas ya internadas y `precio_num` ya calculado) con las filas de la marca.
+        """
+        tabla = cls.__new__(cls)
+        tabla._ids = _columna_ids(columnas["id_articulo"].tolist())
+        tabla._centavos = array("q")
+        tabla._centavos.frombytes((columnas["precio_num"] * 100).round().astype("int64").tobytes())
+        tabla._nombres = tuple(columnas["nombre"].tolist())
+        tabla._referencias = tuple(columnas["referencia"].tolist())
+        tabla._marcas = tuple(columnas["marca"].tolist())
+        tabla._categorias = tuple(columnas["categoria"].tolist())
+        tabla._estados = tuple(columnas["estado"].tolist())
+        tabla._descripciones = None
+        return tabla
+
+    @classmethod
+    def desde_vistas(cls, ids, centavos, nombre, referencia, marca, categoria, estado):
+        """
+        Sobre columnas ya existentes sin copiarlas (p. ej. memoryview de un
+        snapshot mapeado en disco): cualquier secuencia indexable por fila.
+        """
+        tabla = cls.__new__(cls)
+        tabla._ids = ids
+        tabla._centavos = centavos
+        tabla._nombres = nombre
+        tabla._referencias = referencia
+        tabla._marcas = marca
+        tabla._categorias = categoria
+        tabla._estados = estado
+        tabla._descripciones = None
+        return tabla
+
+    def __len__(self):
+        return len(self._nombres)
+
+    def __iter__(self):
+        return (str(i) for i in range(1, len(self._nombres) + 1))
+
+    def __getitem__(self, pid):
+        fila = int(pid) - 1 if isinstance(pid, str) and pid.isdecimal() else -1
+        if not 0 <= fila < len(self._nombres) or str(fila + 1) != pid:
+            raise KeyError(pid)
+        return ProductoCompacto(self, fila)
+
+    # --- columnas de una fila ---------------------------------------------
+
+    def id_articulo(self, fila):
+        valor = self._ids[fila]
+        return None if valor == _SIN_ID and not isinstance(self._ids, tuple) else valor
+
+    def articulo(self, fila):
+        """La fila como el dict de `articulos` del que salió (sin el precio original)."""
+        return {
+            "id_articulo": self.id_articulo(fila),
+            "nombre": self._nombres[fila],
+            "referencia": self._referencias[fila],
+            "marca": self._marcas[fila],
+            "categoria": self._categorias[fila],
+            "estado": self._estados[fila],
+        }
+
+    def precio(self, fila):
+        """(texto, número) como los devuelve _formato_precio."""
+        return _formato_precio(self._centavos[fila] / 100)
+
+    def descripcion(self, campo, fila):
+        """'descripcion_corta' o 'descripcion_amplia' de la fila, memorizada tras la primera lectura."""
+        clave = (campo, fila)
+        if self._descripciones and clave in self._descripciones:
+            return self._descripciones[clave]
+        texto = descripcion_producto(
+            campo, self.articulo(fila), self.precio(fila)[0], _producto_disponible(self._estados[fila])
+        )
+        if catalogo_builder._cache_descripciones is None:
+            if self._descripciones is None:
+                self._descripciones = {}
+            self._descripciones[clave] = texto
+        return texto
+
+
+def _campo(nombre):
+    return lambda tabla, fila: getattr(tabla, nombre)[fila]
+
+
+def _descripcion(campo):
+    return lambda tabla, fila: tabla.descripcion(campo, fila)
+
+
+# Mismas claves y en el mismo orden que _articulo_a_producto
+_CAMPOS = {
+    "id_articulo": lambda tabla, fila: tabla.id_articulo(fila),
+    "nombre": lambda tabla, fila: tabla._nombres[fila] or "Producto sin nombre",
+    "referencia": _campo("_referencias"),
+    "marca": _campo("_marcas"),
+    "categoria": _campo("_categorias"),
+    "estado": _campo("_estados"),
+    "disponible": lambda tabla, fila: _producto_disponible(tabla._estados[fila]),
+    "precio": lambda tabla, fila: tabla.precio(fila)[0],
+    "precio_num": lambda tabla, fila: tabla.precio(fila)[1],
+    "imagenes": lambda tabla, fila: [],
+    "descripcion_corta": _descripcion("descripcion_corta"),
+    "descripcion_amplia": _descripcion("descripcion_amplia"),
+}
+
+
+class ProductoCompacto(Mapping):
+    """Vista de solo lectura de una fila de TablaProductos con la interfaz del dict de producto."""
+
+    __slots__ = ("_tabla", "_fila")
+
+    def __init__(self, tabla, fila):
+        self._tabla = tabla
+        self._fila = fila
+
+    def __getitem__(self, campo):
+        return _CAMPOS[campo](self._tabla, self._fila)
+
+    def __iter__(self):
+        return iter(_CAMPOS)
+
+    def __len__(self):
+        return len(_CAMPOS)
+
+    @property
+    def articulo(self):
+        """Fila original de `articulos` (sin el precio)."""
+        return self._tabla.articulo(self._fila)
+
+    def __repr__(self):
+        return f"ProductoCompacto({dict(self)!r})"
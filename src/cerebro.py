@@ -1,92 +1,284 @@
+import atexit
 import os
 from dotenv import load_dotenv
 from src.inventario import InventarioService
+from src.archivo_catalogo import ArchivoCatalogo
 from src.catalogo import CATALOGO
-from src.catalogo_builder import obtener_categoria_por_alias
+from src.catalogo_builder import IndiceAlias
+from src.coincidencia_difusa import IndiceDifuso
+from src.gestor_catalogo import GestorCatalogo
+from src.indice_busqueda import iterar_productos
+from src.intenciones import DetectorIntenciones
+from src.precios import IndicePrecios, describir_rango, interpretar_rango_precio
+from src.sesiones import ConflictoVersion, Sesion, crear_almacen_sesiones
+from src.texto import referencia_normalizada, sin_acentos
 
 # Cargar variables de entorno
 load_dotenv()
 
+PALABRAS_REINICIO = {"inicio", "reiniciar", "menu", "reset", "hola", "hi"}
+
+ESTADOS_CON_FILTRO_FUERA_DE_FLUJO = {
+    'SELECCIONANDO_CATEGORIA', 'SELECCIONANDO_SUBCATEGORIA', 'SELECCIONANDO_PRODUCTO',
+    'MOSTRANDO_PRODUCTO', 'SELECCIONANDO_FINANCIERA', 'SOLICITANDO_CEDULA_CORREO',
+}
+
+# Estados donde el mensaje es un dato del cliente (cédula, correo): no se
+# interpreta como referencia de producto ni como consulta de precio
+ESTADOS_CON_DATOS_DEL_CLIENTE = {'SOLICITANDO_CEDULA_CORREO'}
+
+# Productos por respuesta a "neveras de menos de 2 millones"
+MAX_RESULTADOS_PRECIO = 5
+
+# Una referencia reconocible tiene al menos 4 caracteres, con letras y dígitos
+# (así no se confunde con números de menú, cédulas ni palabras sueltas)
+MIN_LARGO_REFERENCIA = 4
+
+# Palabras clave por intención. Se comparan sin tildes, como subcadenas del mensaje.
+INTENCIONES = {
+    'fuera_flujo': [
+        "precio", "cuanto", "cost", "costo", "iva", "garantia",
+        "entrega", "envio", "descuento", "oferta", "stock",
+        "disponibilidad", "pregunta", "ayuda", "informacion",
+        "duda", "cuando", "horario", "direccion", "ubicacion",
+    ],
+    'mas_info': ["mas info", "mas informacion", "detalles", "informacion", "amplia"],
+    'volver': ["volver", "atras", "regresar", "otro"],
+    'contado': ["contado"],
+    'financiado': ["financia", "credito", "cuotas"],
+    'addi': ["1", "addi"],
+    'sistecredito': ["2", "sistecredito"],
+    'sumaspay': ["3", "sumaspay", "sumas pay"],
+    'banco_bogota': ["4", "banco", "bogota"],
+    'siguiente': ["ver mas", "siguiente", "mas opciones", "mas modelos", "mas marcas"],
+    'anterior': ["anterior"],
+}
+
+ENTIDADES_FINANCIERAS = [
+    ('addi', "Addi"),
+    ('sistecredito', "Sistecrédito"),
+    ('sumaspay', "Sumaspay"),
+    ('banco_bogota', "Banco de Bogotá"),
+]
+
+# Se compila una sola vez: cada mensaje se recorre en una única pasada
+DETECTOR_INTENCIONES = DetectorIntenciones(INTENCIONES)
+
 
 class Brain:
     def __init__(self):
         self.inventario = InventarioService()
-        self.sesiones = {}
-        self.catalogo = self._cargar_catalogo()
-        origen = "MySQL (articulos)" if self._catalogo_desde_bd else "respaldo local"
+        self.sesiones = crear_almacen_sesiones(Sesion.a_dict, Sesion.desde_dict)
+        # Opciones por mensaje en los menús de marcas y productos (0 = sin paginar)
+        self.tamano_pagina = int(os.getenv("MENU_TAMANO_PAGINA", 20))
+        # CATALOGO_SNAPSHOT_RUTA: arranque con el último catálogo guardado en disco
+        ruta_snapshot = os.getenv("CATALOGO_SNAPSHOT_RUTA")
+        self.catalogos = GestorCatalogo(
+            self._cargar_catalogo,
+            firma=self.inventario.firma_catalogo,
+            ttl=float(os.getenv("CATALOGO_TTL", 300)),
+            intervalo_cambios=float(os.getenv("CATALOGO_INTERVALO_CAMBIOS", 30)),
+            archivo=ArchivoCatalogo(ruta_snapshot) if ruta_snapshot else None,
+            intervalo_archivo=float(os.getenv("CATALOGO_SNAPSHOT_INTERVALO", 300)),
+        )
+        self.catalogos.iniciar()
+        atexit.register(self.catalogos.detener)
+        self.inventario.usar_catalogo(self.catalogos)
+        if self.catalogos.desde_archivo:
+            origen = f"snapshot en disco {ruta_snapshot} (recargando desde MySQL en segundo plano)"
+        else:
+            origen = "MySQL (articulos)" if self._catalogo_desde_bd else "respaldo local"
         print(f"Cerebro del Bot inicializado. Catalogo cargado desde {origen}.")
 
-    def _cargar_catalogo(self):
+    @property
+    def catalogo(self):
+        return self.catalogos.actual().catalogo
+
+    @property
+    def _catalogo_desde_bd(self):
+        return self.catalogos.actual().origen == "bd"
+
+    def _cargar_catalogo(self, actual=None):
         catalogo_bd = self.inventario.construir_catalogo_desde_bd()
         if catalogo_bd:
-            self._catalogo_desde_bd = True
-            return catalogo_bd
+            if actual is not None and catalogo_bd is actual.catalogo:
+                return None  # sin cambios en articulos
+            return catalogo_bd, "bd"
+
+        if actual is not None:
+            # BD caída o vacía momentáneamente: conservar el snapshot vigente
+            return None
 
-        self._catalogo_desde_bd = False
         print("BD sin articulos: usando catalogo de respaldo en src/catalogo.py")
-        return CATALOGO
+        return CATALOGO, "respaldo"
 
     def recargar_catalogo(self):
-        """Recarga el catalogo desde MySQL (util al actualizar articulos)."""
-        self.catalogo = self._cargar_catalogo()
-        return self.catalogo
+        """Fuerza la reconstrucción del catalogo desde MySQL (util al actualizar articulos)."""
+        return self.catalogos.refrescar(forzar=True).catalogo
+
+    def estado(self):
+        """Resumen para monitoreo: catálogo vigente, sesiones y capa de datos."""
+        snapshot = self.catalogos.actual()
+        return {
+            "catalogo": {"version": snapshot.version, "origen": snapshot.origen},
+            "sesiones": self.sesiones.estadisticas(),
+            "datos": self.inventario.estadisticas(),
+        }
 
     def _get_session(self, telefono):
-        if telefono not in self.sesiones:
-            self.sesiones[telefono] = self._nueva_sesion()
-        return self.sesiones[telefono]
+        session = self.sesiones.obtener(telefono)
+        if session is None:
+            session = self._nueva_sesion()
+        return session
 
     def _nueva_sesion(self):
-        return {
-            'estado': 'INICIO',
-            'categoria_clave': None,
-            'categoria_datos': None,
-            'subcategoria_id': None,
-            'subcategoria_datos': None,
-            'producto_id': None,
-            'producto_datos': None,
-            'metodo_pago': None,
-            'financiera': None,
-            'cedula_correo': None
-        }
+        return Sesion()
 
     def reset_session(self, telefono):
-        self.recargar_catalogo()
-        self.sesiones[telefono] = self._nueva_sesion()
-        return self.sesiones[telefono]
+        """Sesión nueva para `telefono`; se guarda al final del turno, en una sola escritura."""
+        return self._nueva_sesion()
+
+    # -------------------------------------------------------------------------
+    # Resolución de la sesión contra el snapshot vigente del catálogo
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _categoria_de(session, catalogo):
+        return catalogo.get(session.categoria_clave) if session.categoria_clave else None
+
+    def _subcategoria_de(self, session, catalogo):
+        categoria = self._categoria_de(session, catalogo)
+        if not categoria or session.subcategoria_id is None:
+            return None
+        return categoria['subcategorias'].get(session.subcategoria_id)
+
+    def _producto_de(self, session, snapshot):
+        """
+        Producto de la sesión en el snapshot vigente. Si tras una recarga la
+        posición ya no corresponde al mismo id_articulo, se relocaliza por id.
+        """
+        subcat = self._subcategoria_de(session, snapshot.catalogo)
+        producto = subcat['productos'].get(session.producto_id) if subcat else None
+        if session.id_articulo is None or (producto and producto.get('id_articulo') == session.id_articulo):
+            return producto
+
+        ubicacion = snapshot.derivado("ubicacion_articulos", _ubicar_articulos).get(session.id_articulo)
+        if ubicacion is None:
+            return None
+        session.categoria_clave, session.subcategoria_id, session.producto_id = ubicacion
+        return self._subcategoria_de(session, snapshot.catalogo)['productos'][session.producto_id]
+
+    def _respuesta_catalogo_actualizado(self, turno):
+        """La opción elegida ya no existe en el catálogo vigente: se vuelve al menú."""
+        turno.session.reiniciar()
+        turno.session.estado = 'SELECCIONANDO_CATEGORIA'
+        texto = (
+            "🔄 Nuestro catálogo se acaba de actualizar y esa opción ya no está disponible.\n\n"
+            + self._menu_bienvenida(turno.snapshot)
+        )
+        return {"texto": texto, "imagenes": []}
 
     # -------------------------------------------------------------------------
     # Helpers para construir mensajes de menú
     # -------------------------------------------------------------------------
 
-    def _menu_bienvenida(self):
+    @staticmethod
+    def _por_nodo(snapshot, tipo, nodo, fabrica):
+        """
+        Cachea lo calculado a partir de un nodo del catálogo (texto de un menú,
+        índice de búsqueda...) por versión y nodo. La caché vive en el snapshot,
+        así que se descarta sola al publicar otra versión.
+        """
+        cache = snapshot.derivado("por_nodo", lambda snap: {})
+        clave = (tipo, id(nodo))
+        entrada = cache.get(clave)
+        if entrada is None or entrada[0] is not nodo:
+            # Se guarda el nodo junto al resultado para que su id no pueda reutilizarse
+            entrada = (nodo, fabrica(nodo))
+            cache[clave] = entrada
+        return entrada[1]
+
+    # Los menús se arman con el snapshot del turno (nunca con el vigente): si una
+    # recarga llega a mitad del turno, la respuesta no mezcla dos versiones
+
+    def _menu_bienvenida(self, snapshot):
         """Genera el menú principal de categorías."""
+        return self._por_nodo(snapshot, "bienvenida", snapshot.catalogo, self._render_bienvenida)
+
+    def _paginas_subcategorias(self, snapshot, categoria_datos):
+        return self._por_nodo(snapshot, "subcategorias", categoria_datos, self._render_subcategorias)
+
+    def _paginas_productos(self, snapshot, subcategoria_datos):
+        return self._por_nodo(snapshot, "productos", subcategoria_datos, self._render_productos)
+
+    def _menu_subcategorias(self, snapshot, categoria_datos):
+        """Genera el menú de subcategorías de una categoría (primera página)."""
+        return self._paginas_subcategorias(snapshot, categoria_datos)[0]
+
+    def _menu_productos(self, snapshot, subcategoria_datos):
+        """Genera el menú de productos específicos dentro de una subcategoría (primera página)."""
+        return self._paginas_productos(snapshot, subcategoria_datos)[0]
+
+    def _pasar_pagina(self, turno, paginas):
+        """Página siguiente o anterior del menú en curso, según la intención del mensaje."""
+        session = turno.session
+        paso = 1 if 'siguiente' in turno.intenciones else -1
+        session.pagina = min(max((session.pagina or 1) + paso, 1), len(paginas))
+        return {"texto": paginas[session.pagina - 1], "imagenes": []}
+
+    @staticmethod
+    def _render_bienvenida(catalogo):
         lineas = [
             "👋 ¡Hola! Bienvenido a *Almacén Oportunidades* 🏠\n",
             "¿En qué electrodoméstico estás interesado hoy?\n"
         ]
-        for i, (clave, item) in enumerate(self.catalogo.items(), start=1):
+        for i, (clave, item) in enumerate(catalogo.items(), start=1):
             lineas.append(f"{i}. {item['emoji']} {item['nombre']}")
         lineas.append("\n📝 Responde con el *número* o el *nombre* del artículo que deseas.")
         return "\n".join(lineas)
 
-    def _menu_subcategorias(self, categoria_datos):
-        """Genera el menú de subcategorías de una categoría."""
+    def _render_subcategorias(self, categoria_datos):
         nombre = categoria_datos['nombre']
-        subcats = categoria_datos['subcategorias']
-        lineas = [f"Excelente elección. 👍 ¿Qué tipo de *{nombre}* estás buscando?\n"]
-        for sid, scat in subcats.items():
-            lineas.append(f"{sid}. {scat['nombre']}")
-        lineas.append("\n📝 Responde con el *número* de la opción que prefieres.")
-        return "\n".join(lineas)
-
-    def _menu_productos(self, subcategoria_datos, categoria_nombre):
-        """Genera el menú de productos específicos dentro de una subcategoría."""
-        lineas = [f"🛍️ Estos son los modelos disponibles en *{subcategoria_datos['nombre']}*:\n"]
-        for pid, prod in subcategoria_datos['productos'].items():
-            lineas.append(f"{pid}. {prod['nombre']} — *{prod['precio']}*")
-        lineas.append("\n📝 Responde con el *número* del modelo que te interesa.")
-        return "\n".join(lineas)
+        opciones = [f"{sid}. {scat['nombre']}" for sid, scat in categoria_datos['subcategorias'].items()]
+        return self._paginar(
+            f"Excelente elección. 👍 ¿Qué tipo de *{nombre}* estás buscando?\n",
+            opciones,
+            "\n📝 Responde con el *número* de la opción que prefieres.",
+        )
+
+    def _render_productos(self, subcategoria_datos):
+        opciones = [
+            f"{pid}. {prod['nombre']} — *{prod['precio']}*"
+            for pid, prod in subcategoria_datos['productos'].items()
+        ]
+        return self._paginar(
+            f"🛍️ Estos son los modelos disponibles en *{subcategoria_datos['nombre']}*:\n",
+            opciones,
+            "\n📝 Responde con el *número* del modelo que te interesa.",
+        )
+
+    def _paginar(self, encabezado, opciones, pie):
+        """
+        Textos de cada página del menú. Las opciones conservan su número global,
+        así que elegir "37" funciona desde cualquier página.
+        """
+        tamano = self.tamano_pagina
+        bloques = [opciones[i:i + tamano] for i in range(0, len(opciones), tamano)] if tamano > 0 else []
+        if len(bloques) <= 1:
+            return ["\n".join([encabezado, *opciones, pie])]
+
+        paginas = []
+        for numero, bloque in enumerate(bloques, start=1):
+            if numero == 1:
+                navegacion = "Escribe *ver más* para ver más opciones."
+            elif numero == len(bloques):
+                navegacion = "Escribe *anterior* para regresar."
+            else:
+                navegacion = "Escribe *siguiente* para ver más o *anterior* para regresar."
+            paginas.append("\n".join([
+                encabezado, *bloque, f"\n📄 Página {numero} de {len(bloques)}. {navegacion}", pie,
+            ]))
+        return paginas
 
     def _respuesta_no_puedo_resolver(self):
         """Respuesta programada para consultas fuera del flujo establecido."""
@@ -103,289 +295,434 @@ class Brain:
     # -------------------------------------------------------------------------
 
     def procesar_mensaje(self, mensaje_usuario, telefono):
-        session = self._get_session(telefono)
-        mensaje = mensaje_usuario.lower().strip()
-        estado = session.get('estado', 'INICIO')
-
-        # Permite reiniciar el flujo en cualquier momento
-        if mensaje in ["inicio", "reiniciar", "menu", "menú", "reset", "hola", "hi"]:
-            session = self.reset_session(telefono)
-            estado = 'INICIO'
+        # Con un almacén compartido otro worker pudo avanzar la sesión mientras
+        # procesábamos: se reintenta una vez con la versión más reciente. Los
+        # efectos del turno (intereses, orden) se ejecutan solo tras guardar la
+        # sesión, así que el intento descartado no los repite.
+        for intento in range(2):
+            try:
+                session = self._get_session(telefono)
+                turno = Turno(mensaje_usuario, telefono, session, self.catalogos.actual())
+
+                # Permite reiniciar el flujo en cualquier momento
+                if turno.mensaje_plano in PALABRAS_REINICIO:
+                    turno.session = self.reset_session(telefono)
+
+                respuesta = self._despachar(turno)
+                self.sesiones.guardar(telefono, turno.session)
+            except ConflictoVersion:
+                print(f"⚠️ Sesión de {telefono} modificada por otro proceso; reintentando")
+                continue
+            turno.ejecutar_efectos()
+            return respuesta
+        return self._respuesta_no_puedo_resolver()
+
+    def _despachar(self, turno):
+        estado = turno.session.estado
+
+        if estado not in ESTADOS_CON_DATOS_DEL_CLIENTE:
+            # Una referencia conocida ("55NU855BPSA") lleva directo al producto; un
+            # monto ("de menos de 2 millones") se responde aunque lleve "precio" o "cuanto"
+            respuesta = self._saltar_a_referencia(turno)
+            if respuesta is None:
+                respuesta = self._consulta_por_precio(turno)
+            if respuesta is not None:
+                return respuesta
 
         # Respuesta programada para consultas fuera del flujo esperado
-        mensajes_fuera_flujo = [
-            "precio", "cuanto", "cuánto", "cost", "costo", "iva", "garantia",
-            "entrega", "envio", "envío", "descuento", "oferta", "stock",
-            "disponibilidad", "pregunta", "ayuda", "información", "informacion",
-            "duda", "cuando", "horario", "direccion", "ubicacion", "ubicación"
-        ]
+        if estado in ESTADOS_CON_FILTRO_FUERA_DE_FLUJO and 'fuera_flujo' in turno.intenciones:
+            return self._respuesta_no_puedo_resolver()
+
+        manejador = self._manejadores.get(estado)
+        if manejador is None:
+            # Fallback por defecto
+            return {
+                "texto": "👋 Hola, bienvenido a *Almacén Oportunidades*. Escribe *'inicio'* para comenzar.",
+                "imagenes": []
+            }
+        return manejador(self, turno)
+
+    # =====================================================================
+    # 1. INICIO: Mostrar menú de categorías
+    # =====================================================================
+    def _estado_inicio(self, turno):
+        turno.session.estado = 'SELECCIONANDO_CATEGORIA'
+        return {"texto": self._menu_bienvenida(turno.snapshot), "imagenes": []}
+
+    # =====================================================================
+    # 2. SELECCIONANDO_CATEGORIA
+    # =====================================================================
+    def _estado_seleccionando_categoria(self, turno):
+        session, mensaje, catalogo = turno.session, turno.mensaje, turno.snapshot.catalogo
+
+        # Intentar detectar la categoría por alias o por número de posición
+        indice = turno.snapshot.derivado("alias", lambda snap: IndiceAlias(snap.catalogo))
+        clave, item = indice.buscar(mensaje)
+
+        # Si no encontró por alias, intenta por número de posición
+        if not clave:
+            try:
+                idx = int(mensaje)
+                claves = list(catalogo.keys())
+                if 1 <= idx <= len(claves):
+                    clave = claves[idx - 1]
+                    item = catalogo[clave]
+            except ValueError:
+                pass
+
+        if not (clave and item):
+            return self._respuesta_no_puedo_resolver()
+
+        session.categoria_clave = clave
+        session.estado = 'SELECCIONANDO_SUBCATEGORIA'
+        session.pagina = None
+        self._registrar_interes(turno, f"Categoría: {item['nombre']}")
+        return {"texto": self._menu_subcategorias(turno.snapshot, item), "imagenes": []}
+
+    # =====================================================================
+    # 3. SELECCIONANDO_SUBCATEGORIA (tipo/tamaño)
+    # =====================================================================
+    def _estado_seleccionando_subcategoria(self, turno):
+        session, mensaje = turno.session, turno.mensaje
+        categoria_datos = self._categoria_de(session, turno.snapshot.catalogo)
+        if categoria_datos is None:
+            return self._respuesta_catalogo_actualizado(turno)
+        subcats = categoria_datos['subcategorias']
 
-        if estado in ['SELECCIONANDO_CATEGORIA', 'SELECCIONANDO_SUBCATEGORIA', 'SELECCIONANDO_PRODUCTO', 'MOSTRANDO_PRODUCTO', 'SELECCIONANDO_FINANCIERA', 'SOLICITANDO_CEDULA_CORREO']:
-            if any(palabra in mensaje for palabra in mensajes_fuera_flujo):
-                texto = (
-                    "Lo siento, no puedo resolver tu duda en este momento. 😔\n\n"
-                    "Un asesor pronto se comunicará contigo para ayudarte de forma personalizada."
-                )
-                return {"texto": texto, "imagenes": []}
-
-        # =====================================================================
-        # 1. INICIO: Mostrar menú de categorías
-        # =====================================================================
-        if estado == 'INICIO':
-            session['estado'] = 'SELECCIONANDO_CATEGORIA'
-            return {"texto": self._menu_bienvenida(), "imagenes": []}
-
-        # =====================================================================
-        # 2. SELECCIONANDO_CATEGORIA
-        # =====================================================================
-        elif estado == 'SELECCIONANDO_CATEGORIA':
-            # Intentar detectar la categoría por alias o por número de posición
-            clave, item = obtener_categoria_por_alias(mensaje, self.catalogo)
-
-            # Si no encontró por alias, intenta por número de posición
-            if not clave:
-                try:
-                    idx = int(mensaje)
-                    claves = list(self.catalogo.keys())
-                    if 1 <= idx <= len(claves):
-                        clave = claves[idx - 1]
-                        item = self.catalogo[clave]
-                except ValueError:
-                    pass
-
-            if clave and item:
-                session['categoria_clave'] = clave
-                session['categoria_datos'] = item
-                session['estado'] = 'SELECCIONANDO_SUBCATEGORIA'
-
-                # Registrar interés en MySQL
-                try:
-                    self.inventario.registrar_interes(telefono, f"Categoría: {item['nombre']}")
-                except Exception as e:
-                    print(f"⚠️ Error registrando interés: {e}")
-
-                texto = self._menu_subcategorias(item)
-                return {"texto": texto, "imagenes": []}
-            else:
-                return self._respuesta_no_puedo_resolver()
-
-        # =====================================================================
-        # 3. SELECCIONANDO_SUBCATEGORIA (tipo/tamaño)
-        # =====================================================================
-        elif estado == 'SELECCIONANDO_SUBCATEGORIA':
-            categoria_datos = session['categoria_datos']
-            subcats = categoria_datos['subcategorias']
-
-            subcat_id = None
-            # Primero intentar por número directo
-            if mensaje in subcats:
-                subcat_id = mensaje
-            else:
-                # Intentar búsqueda parcial por nombre
-                for sid, scat in subcats.items():
-                    if mensaje in scat['nombre'].lower():
-                        subcat_id = sid
-                        break
-
-            if subcat_id and subcat_id in subcats:
-                subcat = subcats[subcat_id]
-                session['subcategoria_id'] = subcat_id
-                session['subcategoria_datos'] = subcat
-                session['estado'] = 'SELECCIONANDO_PRODUCTO'
-
-                try:
-                    self.inventario.registrar_interes(
-                        telefono, f"Subcategoría: {subcat['nombre']}"
-                    )
-                except Exception as e:
-                    print(f"⚠️ Error registrando interés: {e}")
-
-                texto = self._menu_productos(subcat, categoria_datos['nombre'])
-                return {"texto": texto, "imagenes": []}
-            else:
-                return self._respuesta_no_puedo_resolver()
-
-        # =====================================================================
-        # 4. SELECCIONANDO_PRODUCTO (modelo específico)
-        # =====================================================================
-        elif estado == 'SELECCIONANDO_PRODUCTO':
-            subcat = session['subcategoria_datos']
-            productos = subcat['productos']
-
-            prod_id = None
-            if mensaje in productos:
-                prod_id = mensaje
-            else:
-                # Búsqueda parcial por nombre del producto
-                for pid, prod in productos.items():
-                    if mensaje in prod['nombre'].lower():
-                        prod_id = pid
-                        break
-
-            if prod_id and prod_id in productos:
-                producto = productos[prod_id]
-                if producto.get("disponible") is False:
-                    return {
-                        "texto": (
-                            f"El producto *{producto['nombre']}* no está disponible en este momento.\n\n"
-                            "Elige otro modelo de la lista o escribe *inicio* para volver al menú principal."
-                        ),
-                        "imagenes": [],
-                    }
-
-                session['producto_id'] = prod_id
-                session['producto_datos'] = producto
-                session['estado'] = 'MOSTRANDO_PRODUCTO'
-
-                try:
-                    self.inventario.registrar_interes(
-                        telefono, f"Producto: {producto['nombre']}"
-                    )
-                except Exception as e:
-                    print(f"⚠️ Error registrando interés: {e}")
-
-                texto = (
-                    f"✨ Has seleccionado: *{producto['nombre']}*\n\n"
-                    f"{producto['descripcion_corta']}\n\n"
-                    f"ℹ️ Escribe *'más información'* para ver todos los detalles.\n\n"
-                    f"💳 ¿Deseas adquirirlo de *Contado* o *Financiado*?"
-                )
-                imagenes = producto.get('imagenes', [])
-                return {"texto": texto, "imagenes": imagenes}
-            else:
-                return self._respuesta_no_puedo_resolver()
-
-        # =====================================================================
-        # 5. MOSTRANDO_PRODUCTO (más info, contado o financiado)
-        # =====================================================================
-        elif estado == 'MOSTRANDO_PRODUCTO':
-            producto = session['producto_datos']
-
-            # Pide más información
-            if any(x in mensaje for x in [
-                "mas info", "más info", "mas informacion", "más información",
-                "detalles", "informacion", "amplia", "información"
-            ]):
-                texto = (
-                    f"ℹ️ {producto['descripcion_amplia']}\n\n"
-                    f"💳 ¿Deseas adquirirlo de *Contado* o *Financiado*?"
-                )
-                return {"texto": texto, "imagenes": []}
-
-            # Volver al menú principal o a subcategorías
-            elif any(x in mensaje for x in ["volver", "atras", "atrás", "regresar", "otro"]):
-                session['estado'] = 'SELECCIONANDO_SUBCATEGORIA'
-                texto = self._menu_subcategorias(session['categoria_datos'])
-                return {"texto": texto, "imagenes": []}
-
-            # Contado
-            elif "contado" in mensaje or mensaje == "1":
-                session['metodo_pago'] = 'Contado'
-                session['estado'] = 'SOLICITANDO_CEDULA_CORREO'
-                texto = (
-                    f"💰 Precio de contado para *{producto['nombre']}*: *{producto['precio']}*\n\n"
-                    f"📄 Para proceder con tu compra, por favor envíanos:\n"
-                    f"1. *Foto de tu cédula de ciudadanía* (legible por ambos lados).\n"
-                    f"2. Tu *correo electrónico*."
-                )
-                return {"texto": texto, "imagenes": []}
-
-            # Financiado
-            elif any(x in mensaje for x in ["financia", "credito", "crédito", "cuotas"]) or mensaje == "2":
-                session['estado'] = 'SELECCIONANDO_FINANCIERA'
-                texto = (
-                    f"🏦 Opciones de financiación para *{producto['nombre']}*:\n\n"
-                    f"1. 🟦 Addi\n"
-                    f"2. 🟩 Sistecrédito\n"
-                    f"3. 🟨 Sumaspay\n"
-                    f"4. 🟥 Banco de Bogotá\n\n"
-                    f"Responde con el número o nombre de la entidad financiera de tu preferencia."
-                )
-                return {"texto": texto, "imagenes": []}
+        if turno.intenciones & {'siguiente', 'anterior'}:
+            return self._pasar_pagina(turno, self._paginas_subcategorias(turno.snapshot, categoria_datos))
+
+        # Primero intentar por número directo; si no, por nombre (tolera tildes y errores)
+        if mensaje in subcats:
+            subcat_id = mensaje
+        else:
+            subcat_id = self._por_nodo(
+                turno.snapshot, "difuso_subcategorias", subcats, _indice_subcategorias
+            ).buscar(mensaje)
+
+        if not (subcat_id and subcat_id in subcats):
+            return self._respuesta_no_puedo_resolver()
+
+        subcat = subcats[subcat_id]
+        session.subcategoria_id = subcat_id
+        session.estado = 'SELECCIONANDO_PRODUCTO'
+        session.pagina = None
+        self._registrar_interes(turno, f"Subcategoría: {subcat['nombre']}")
+        return {"texto": self._menu_productos(turno.snapshot, subcat), "imagenes": []}
+
+    # =====================================================================
+    # 4. SELECCIONANDO_PRODUCTO (modelo específico)
+    # =====================================================================
+    def _estado_seleccionando_producto(self, turno):
+        session, mensaje = turno.session, turno.mensaje
+        subcat = self._subcategoria_de(session, turno.snapshot.catalogo)
+        if subcat is None:
+            return self._respuesta_catalogo_actualizado(turno)
+        productos = subcat['productos']
+
+        if turno.intenciones & {'siguiente', 'anterior'}:
+            return self._pasar_pagina(turno, self._paginas_productos(turno.snapshot, subcat))
+
+        if mensaje in productos:
+            prod_id = mensaje
+        else:
+            # Por nombre, marca o referencia (tolera tildes y errores de digitación)
+            prod_id = self._por_nodo(turno.snapshot, "difuso_productos", productos, _indice_productos).buscar(mensaje)
+
+        if not (prod_id and prod_id in productos):
+            return self._respuesta_no_puedo_resolver()
+        return self._seleccionar_producto(turno, prod_id, productos[prod_id])
+
+    def _seleccionar_producto(self, turno, prod_id, producto):
+        """Deja el producto en la sesión (si está disponible) y muestra su ficha."""
+        session = turno.session
+        if producto.get("disponible") is False:
+            return {
+                "texto": (
+                    f"El producto *{producto['nombre']}* no está disponible en este momento.\n\n"
+                    "Elige otro modelo de la lista o escribe *inicio* para volver al menú principal."
+                ),
+                "imagenes": [],
+            }
+
+        session.producto_id = prod_id
+        session.id_articulo = producto.get('id_articulo')
+        session.estado = 'MOSTRANDO_PRODUCTO'
+        self._registrar_interes(turno, f"Producto: {producto['nombre']}")
+
+        texto = (
+            f"✨ Has seleccionado: *{producto['nombre']}*\n\n"
+            f"{producto['descripcion_corta']}\n\n"
+            f"ℹ️ Escribe *'más información'* para ver todos los detalles.\n\n"
+            f"💳 ¿Deseas adquirirlo de *Contado* o *Financiado*?"
+        )
+        imagenes = producto.get('imagenes', [])
+        return {"texto": texto, "imagenes": imagenes}
+
+    def _saltar_a_referencia(self, turno):
+        """Ficha del producto cuya referencia trae el mensaje, o None si no hay ninguna."""
+        indice = turno.snapshot.derivado("referencias", _ubicar_referencias)
+        ubicacion = next((indice[r] for r in _referencias_en(turno.mensaje) if r in indice), None)
+        if ubicacion is None:
+            return None
+
+        session = turno.session
+        session.reiniciar()
+        session.categoria_clave, session.subcategoria_id, prod_id = ubicacion
+        session.estado = 'SELECCIONANDO_PRODUCTO'
+        producto = self._subcategoria_de(session, turno.snapshot.catalogo)['productos'][prod_id]
+        return self._seleccionar_producto(turno, prod_id, producto)
+
+    def _consulta_por_precio(self, turno):
+        """Productos en el rango de precio que pide el mensaje, o None si no trae un monto."""
+        rango = interpretar_rango_precio(turno.mensaje_plano)
+        if rango is None:
+            return None
+
+        # Categoría nombrada en el mensaje ("neveras", "lavadora"); si no, la que se está viendo
+        alias = turno.snapshot.derivado("alias", lambda snap: IndiceAlias(snap.catalogo))
+        clave = alias.buscar(turno.mensaje)[0] or next(
+            (c for c in (alias.buscar(p)[0] for p in turno.mensaje_plano.split() if len(p) >= 4) if c), None
+        )
+        clave = clave or turno.session.categoria_clave
+        categoria = turno.snapshot.catalogo.get(clave) if clave else None
+        nombre = categoria['nombre'] if categoria else "productos"
+
+        indice = turno.snapshot.derivado("precios", IndicePrecios.desde_snapshot)
+        resultados = indice.en_rango(*rango, categoria=clave if categoria else None, limite=MAX_RESULTADOS_PRECIO)
+        if not resultados:
+            texto = (
+                f"😕 No encontramos *{nombre}* {describir_rango(*rango)} en este momento.\n\n"
+                "Escribe *inicio* para ver todo el catálogo."
+            )
+            return {"texto": texto, "imagenes": []}
 
-            else:
-                return self._respuesta_no_puedo_resolver()
-
-        # =====================================================================
-        # 6. SELECCIONANDO_FINANCIERA
-        # =====================================================================
-        elif estado == 'SELECCIONANDO_FINANCIERA':
-            producto = session['producto_datos']
-            entidad = None
-
-            if "1" in mensaje or "addi" in mensaje:
-                entidad = "Addi"
-            elif "2" in mensaje or "sistecredito" in mensaje or "sistecrédito" in mensaje:
-                entidad = "Sistecrédito"
-            elif "3" in mensaje or "sumaspay" in mensaje or "sumas pay" in mensaje:
-                entidad = "Sumaspay"
-            elif "4" in mensaje or "banco" in mensaje or "bogota" in mensaje or "bogotá" in mensaje:
-                entidad = "Banco de Bogotá"
-
-            if entidad:
-                session['financiera'] = entidad
-                session['metodo_pago'] = f"Financiado ({entidad})"
-                session['estado'] = 'SOLICITANDO_CEDULA_CORREO'
-                texto = (
-                    f"✅ Has seleccionado financiación con *{entidad}* para *{producto['nombre']}*.\n\n"
-                    f"📄 Para gestionar la aprobación de tu crédito, por favor envíanos:\n"
-                    f"1. *Foto de tu cédula de ciudadanía* (legible por ambos lados).\n"
-                    f"2. Tu *correo electrónico*."
-                )
-                return {"texto": texto, "imagenes": []}
-            else:
-                return self._respuesta_no_puedo_resolver()
-
-        # =====================================================================
-        # 7. SOLICITANDO_CEDULA_CORREO
-        # =====================================================================
-        elif estado == 'SOLICITANDO_CEDULA_CORREO':
-            session['cedula_correo'] = mensaje_usuario
-            producto = session.get('producto_datos', {})
-            metodo = session.get('metodo_pago', 'No especificado')
-            prod_nombre = producto.get('nombre', 'Electrodoméstico')
-            monto_total = producto.get('precio_num', 0)
-
-            # Registrar orden en MySQL
-            try:
-                self.inventario.crear_orden(
-                    telefono=telefono,
-                    cliente=f"WA-{telefono}",
-                    direccion=mensaje_usuario,
-                    producto_info=f"{prod_nombre} | Metodo: {metodo}",
-                    total=monto_total,
-                    nombre_producto=prod_nombre,
-                    id_articulo=producto.get("id_articulo"),
-                )
-            except Exception as e:
-                print(f"⚠️ Error al registrar venta: {e}")
-
-            session['estado'] = 'FINALIZADO'
+        lineas = [f"💰 *{nombre.capitalize()}* {describir_rango(*rango)}:\n"]
+        for _, _, _, producto in resultados:
+            lineas.append(f"• {producto['nombre']} (ref. {producto['referencia']}) — *{producto['precio']}*")
+        lineas.append("\n📝 Escribe la *referencia* del modelo que te interesa para verlo.")
+        lineas.append("Escribe *inicio* para ver todo el catálogo.")
+        return {"texto": "\n".join(lineas), "imagenes": []}
+
+    # =====================================================================
+    # 5. MOSTRANDO_PRODUCTO (más info, contado o financiado)
+    # =====================================================================
+    def _estado_mostrando_producto(self, turno):
+        session, mensaje, intenciones = turno.session, turno.mensaje, turno.intenciones
+        producto = self._producto_de(session, turno.snapshot)
+        if producto is None:
+            return self._respuesta_catalogo_actualizado(turno)
+
+        # Pide más información
+        if 'mas_info' in intenciones:
             texto = (
-                f"✅ *¡Pedido registrado exitosamente!*\n\n"
-                f"📋 *Resumen de tu solicitud:*\n"
-                f"• Producto: *{prod_nombre}*\n"
-                f"• Precio: *{producto.get('precio', 'N/A')}*\n"
-                f"• Método de pago: *{metodo}*\n\n"
-                f"👨‍💼 *Un asesor comercial se comunicará contigo a la brevedad* "
-                f"para verificar tu documento de identidad, correo electrónico y coordinar la entrega.\n\n"
-                f"¡Gracias por preferir *Almacén Oportunidades*! 🌟\n\n"
-                f"Si deseas hacer otra consulta, escribe *'inicio'*."
+                f"ℹ️ {producto['descripcion_amplia']}\n\n"
+                f"💳 ¿Deseas adquirirlo de *Contado* o *Financiado*?"
             )
             return {"texto": texto, "imagenes": []}
 
-        # =====================================================================
-        # 8. FINALIZADO
-        # =====================================================================
-        elif estado == 'FINALIZADO':
+        # Volver al menú principal o a subcategorías
+        if 'volver' in intenciones:
+            session.estado = 'SELECCIONANDO_SUBCATEGORIA'
+            session.pagina = None
+            texto = self._menu_subcategorias(turno.snapshot, self._categoria_de(session, turno.snapshot.catalogo))
+            return {"texto": texto, "imagenes": []}
+
+        # Contado
+        if 'contado' in intenciones or mensaje == "1":
+            session.metodo_pago = 'Contado'
+            session.estado = 'SOLICITANDO_CEDULA_CORREO'
             texto = (
-                f"👨‍💼 Tu solicitud ya está registrada y en proceso con uno de nuestros asesores.\n\n"
-                f"Si deseas realizar otra cotización o ver más productos, escribe *'inicio'*."
+                f"💰 Precio de contado para *{producto['nombre']}*: *{producto['precio']}*\n\n"
+                f"📄 Para proceder con tu compra, por favor envíanos:\n"
+                f"1. *Foto de tu cédula de ciudadanía* (legible por ambos lados).\n"
+                f"2. Tu *correo electrónico*."
             )
             return {"texto": texto, "imagenes": []}
 
-        # Fallback por defecto
-        return {
-            "texto": "👋 Hola, bienvenido a *Almacén Oportunidades*. Escribe *'inicio'* para comenzar.",
-            "imagenes": []
-        }
+        # Financiado
+        if 'financiado' in intenciones or mensaje == "2":
+            session.estado = 'SELECCIONANDO_FINANCIERA'
+            texto = (
+                f"🏦 Opciones de financiación para *{producto['nombre']}*:\n\n"
+                f"1. 🟦 Addi\n"
+                f"2. 🟩 Sistecrédito\n"
+                f"3. 🟨 Sumaspay\n"
+                f"4. 🟥 Banco de Bogotá\n\n"
+                f"Responde con el número o nombre de la entidad financiera de tu preferencia."
+            )
+            return {"texto": texto, "imagenes": []}
+
+        return self._respuesta_no_puedo_resolver()
+
+    # =====================================================================
+    # 6. SELECCIONANDO_FINANCIERA
+    # =====================================================================
+    def _estado_seleccionando_financiera(self, turno):
+        session = turno.session
+        producto = self._producto_de(session, turno.snapshot)
+        if producto is None:
+            return self._respuesta_catalogo_actualizado(turno)
+
+        # Mismo orden de prioridad que las opciones del menú
+        entidad = next((nombre for intencion, nombre in ENTIDADES_FINANCIERAS if intencion in turno.intenciones), None)
+        if not entidad:
+            return self._respuesta_no_puedo_resolver()
+
+        session.financiera = entidad
+        session.metodo_pago = f"Financiado ({entidad})"
+        session.estado = 'SOLICITANDO_CEDULA_CORREO'
+        texto = (
+            f"✅ Has seleccionado financiación con *{entidad}* para *{producto['nombre']}*.\n\n"
+            f"📄 Para gestionar la aprobación de tu crédito, por favor envíanos:\n"
+            f"1. *Foto de tu cédula de ciudadanía* (legible por ambos lados).\n"
+            f"2. Tu *correo electrónico*."
+        )
+        return {"texto": texto, "imagenes": []}
+
+    # =====================================================================
+    # 7. SOLICITANDO_CEDULA_CORREO
+    # =====================================================================
+    def _estado_solicitando_cedula_correo(self, turno):
+        session, telefono, mensaje_usuario = turno.session, turno.telefono, turno.mensaje_usuario
+        session.cedula_correo = mensaje_usuario
+        producto = self._producto_de(session, turno.snapshot)
+        if producto is None:
+            return self._respuesta_catalogo_actualizado(turno)
+        metodo = session.metodo_pago or 'No especificado'
+        prod_nombre = producto.get('nombre', 'Electrodoméstico')
+        monto_total = producto.get('precio_num', 0)
+
+        # Registrar orden en MySQL (una vez guardada la sesión)
+        turno.diferir(
+            self._crear_orden,
+            telefono=telefono,
+            cliente=f"WA-{telefono}",
+            direccion=mensaje_usuario,
+            producto_info=f"{prod_nombre} | Metodo: {metodo}",
+            total=monto_total,
+            nombre_producto=prod_nombre,
+            id_articulo=producto.get("id_articulo"),
+        )
+
+        session.estado = 'FINALIZADO'
+        texto = (
+            f"✅ *¡Pedido registrado exitosamente!*\n\n"
+            f"📋 *Resumen de tu solicitud:*\n"
+            f"• Producto: *{prod_nombre}*\n"
+            f"• Precio: *{producto.get('precio', 'N/A')}*\n"
+            f"• Método de pago: *{metodo}*\n\n"
+            f"👨‍💼 *Un asesor comercial se comunicará contigo a la brevedad* "
+            f"para verificar tu documento de identidad, correo electrónico y coordinar la entrega.\n\n"
+            f"¡Gracias por preferir *Almacén Oportunidades*! 🌟\n\n"
+            f"Si deseas hacer otra consulta, escribe *'inicio'*."
+        )
+        return {"texto": texto, "imagenes": []}
+
+    # =====================================================================
+    # 8. FINALIZADO
+    # =====================================================================
+    def _estado_finalizado(self, turno):
+        texto = (
+            f"👨‍💼 Tu solicitud ya está registrada y en proceso con uno de nuestros asesores.\n\n"
+            f"Si deseas realizar otra cotización o ver más productos, escribe *'inicio'*."
+        )
+        return {"texto": texto, "imagenes": []}
+
+    def _registrar_interes(self, turno, termino):
+        turno.diferir(self._registrar_interes_ahora, turno.telefono, termino)
+
+    def _registrar_interes_ahora(self, telefono, termino):
+        try:
+            self.inventario.registrar_interes(telefono, termino)
+        except Exception as e:
+            print(f"⚠️ Error registrando interés: {e}")
+
+    def _crear_orden(self, **datos):
+        try:
+            self.inventario.crear_orden(**datos)
+        except Exception as e:
+            print(f"⚠️ Error al registrar venta: {e}")
+
+    # Tabla de despacho: estado de la sesión -> manejador
+    _manejadores = {
+        'INICIO': _estado_inicio,
+        'SELECCIONANDO_CATEGORIA': _estado_seleccionando_categoria,
+        'SELECCIONANDO_SUBCATEGORIA': _estado_seleccionando_subcategoria,
+        'SELECCIONANDO_PRODUCTO': _estado_seleccionando_producto,
+        'MOSTRANDO_PRODUCTO': _estado_mostrando_producto,
+        'SELECCIONANDO_FINANCIERA': _estado_seleccionando_financiera,
+        'SOLICITANDO_CEDULA_CORREO': _estado_solicitando_cedula_correo,
+        'FINALIZADO': _estado_finalizado,
+    }
+
+
+class Turno:
+    """Un mensaje en proceso: texto normalizado e intenciones detectadas una sola vez."""
+
+    __slots__ = (
+        "mensaje_usuario", "mensaje", "mensaje_plano", "telefono", "session", "snapshot", "intenciones", "efectos",
+    )
+
+    def __init__(self, mensaje_usuario, telefono, session, snapshot):
+        self.mensaje_usuario = mensaje_usuario
+        self.mensaje = mensaje_usuario.lower().strip()
+        self.mensaje_plano = sin_acentos(self.mensaje)
+        self.telefono = telefono
+        self.session = session
+        self.snapshot = snapshot
+        self.intenciones = DETECTOR_INTENCIONES.detectar(self.mensaje_plano)
+        self.efectos = []
+
+    def diferir(self, funcion, *args, **kwargs):
+        """Efecto (registrar interés, crear orden) que se ejecuta al confirmar el turno."""
+        self.efectos.append((funcion, args, kwargs))
+
+    def ejecutar_efectos(self):
+        for funcion, args, kwargs in self.efectos:
+            funcion(*args, **kwargs)
+
+
+def _indice_subcategorias(subcategorias):
+    return IndiceDifuso((sid, scat['nombre'], ()) for sid, scat in subcategorias.items())
+
+
+def _indice_productos(productos):
+    return IndiceDifuso(
+        (pid, prod['nombre'], (prod.get('marca'), prod.get('referencia'))) for pid, prod in productos.items()
+    )
+
+
+def _es_referencia(texto):
+    return len(texto) >= MIN_LARGO_REFERENCIA and not texto.isdigit() and not texto.isalpha()
+
+
+def _ubicar_referencias(snapshot):
+    """{referencia normalizada: (clave_categoria, id_subcategoria, id_producto)}; gana la primera."""
+    indice = {}
+    for clave, sid, pid, producto in iterar_productos(snapshot.catalogo):
+        referencia = referencia_normalizada(producto.get('referencia'))
+        if _es_referencia(referencia):
+            indice.setdefault(referencia, (clave, sid, pid))
+    return indice
+
+
+def _referencias_en(mensaje):
+    """
+    Referencias candidatas del mensaje: completo y cada grupo de hasta tres
+    palabras seguidas ("tienen el 55NU 855BPSA?").
+    """
+    yield referencia_normalizada(mensaje)
+    palabras = mensaje.split()
+    for largo in range(1, 4):
+        for inicio in range(len(palabras) - largo + 1):
+            yield referencia_normalizada("".join(palabras[inicio:inicio + largo]))
+
+
+def _ubicar_articulos(snapshot):
+    """{id_articulo: (clave_categoria, id_subcategoria, id_producto)} del snapshot."""
+    return {
+        producto['id_articulo']: (clave, sid, pid)
+        for clave, sid, pid, producto in iterar_productos(snapshot.catalogo)
+        if producto.get('id_articulo') is not None
+    }
@@ -0,0 +1,90 @@
+"""
+Circuit breaker para la conexión a MySQL.
+
+- cerrado: las llamadas pasan normalmente.
+- abierto: tras `umbral_fallos` fallos seguidos se falla de inmediato,
+  sin esperar el timeout de conexión, durante `tiempo_apertura` segundos.
+- semi_abierto: vencido ese tiempo se deja pasar una sola llamada de prueba;
+  si funciona el circuito se cierra, si falla se vuelve a abrir.
+"""
+import threading
+import time
+
+CERRADO = "cerrado"
+ABIERTO = "abierto"
+SEMI_ABIERTO = "semi_abierto"
+
+
+class CircuitBreaker:
+    def __init__(self, umbral_fallos=3, tiempo_apertura=30, al_cerrar=None):
+        self.umbral_fallos = max(1, int(umbral_fallos))
+        self.tiempo_apertura = tiempo_apertura
+        self._al_cerrar = al_cerrar
+        self._lock = threading.Lock()
+        self._estado = CERRADO
+        self._fallos_seguidos = 0
+        self._abierto_desde = 0.0
+        self._prueba_en_curso = False
+        self._stats = {"rechazadas": 0, "aperturas": 0, "fallos": 0, "exitos": 0}
+
+    @property
+    def estado(self):
+        return self._estado
+
+    def permitir(self):
+        """True si la llamada puede intentarse; False para fallar rápido."""
+        with self._lock:
+            if self._estado == ABIERTO:
+                if time.monotonic() - self._abierto_desde < self.tiempo_apertura:
+                    self._stats["rechazadas"] += 1
+                    return False
+                self._estado = SEMI_ABIERTO
+                self._prueba_en_curso = False
+
+            if self._estado == SEMI_ABIERTO:
+                if self._prueba_en_curso:
+                    self._stats["rechazadas"] += 1
+                    return False
+                self._prueba_en_curso = True
+            return True
+
+    def registrar_exito(self):
+        with self._lock:
+            self._stats["exitos"] += 1
+            self._fallos_seguidos = 0
+            cerrado_ahora = self._estado != CERRADO
+            self._estado = CERRADO
+            self._prueba_en_curso = False
+
+        if cerrado_ahora:
+            print("✅ Conexión con MySQL restablecida (circuito cerrado)")
+            if self._al_cerrar:
+                self._al_cerrar()
+
+    def liberar_prueba(self):
+        """La llamada permitida no llegó a intentarse (p. ej. pool agotado): otra puede probar."""
+        with self._lock:
+            if self._estado == SEMI_ABIERTO:
+                self._prueba_en_curso = False
+
+    def registrar_fallo(self):
+        with self._lock:
+            self._stats["fallos"] += 1
+            self._fallos_seguidos += 1
+            if self._estado == SEMI_ABIERTO or self._fallos_seguidos >= self.umbral_fallos:
+                if self._estado != ABIERTO:
+                    self._stats["aperturas"] += 1
+                    print(f"⚠️ MySQL no responde: circuito abierto por {self.tiempo_apertura}s")
+                self._estado = ABIERTO
+                self._abierto_desde = time.monotonic()
+                self._prueba_en_curso = False
+
+    def estadisticas(self):
+        with self._lock:
+            datos = dict(self._stats)
+            datos["estado"] = self._estado
+            datos["fallos_seguidos"] = self._fallos_seguidos
+            if self._estado == ABIERTO:
+                restante = self.tiempo_apertura - (time.monotonic() - self._abierto_desde)
+                datos["reintento_en_s"] = max(0.0, restante)
+        return datos
@@ -0,0 +1,189 @@
+"""
+Selección de opciones de menú (marcas, productos) por texto libre.
+
+Los textos de cada opción se pliegan (minúsculas, sin tildes) una sola vez y
+sus palabras forman un vocabulario indexado por trigramas. Buscar un mensaje
+recorre ese vocabulario, no las opciones: el costo depende de las palabras
+distintas del menú y no de cuántos productos tenga.
+
+1. Subcadena: la primera opción cuyo nombre contiene el mensaje (como el
+   `mensaje in nombre.lower()` original, ahora también sin tildes).
+2. Aproximada: cada palabra del mensaje se compara con las del vocabulario
+   que comparten trigramas, con una distancia de edición acotada
+   ("neveraa" -> "nevera", "samsumg" -> "samsung").
+"""
+import heapq
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import islice
+
+from src.texto import sin_acentos, tokens
+
+# En la búsqueda aproximada se ignoran palabras más cortas ("la", "de", "2")
+MIN_LARGO_PALABRA = 3
+# y las más cortas que esto solo cuentan si coinciden exactas
+MIN_LARGO_APROXIMADO = 4
+# Opciones que se puntúan como máximo por palabra del mensaje: una palabra que
+# aparece en todo el menú ("nevera", "modelo") no vuelve lineal la búsqueda
+MAX_CANDIDATAS = 500
+
+
+def errores_permitidos(palabra):
+    """
+    Distancia de edición tolerada según el largo de la palabra. Las que llevan
+    dígitos (modelos, capacidades) solo se aceptan exactas: "300l" no es "500l".
+    """
+    if len(palabra) < MIN_LARGO_APROXIMADO or any(c.isdigit() for c in palabra):
+        return 0
+    return 1 if len(palabra) < 7 else 2
+
+
+def _trigramas(palabra):
+    relleno = f" {palabra} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+def distancia_acotada(a, b, maximo):
+    """
+    Distancia de edición con transposiciones (OSA) entre `a` y `b`, o
+    `maximo + 1` en cuanto se sabe que la supera.
+    """
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    anterior2 = None
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        actual = [i] + [0] * len(b)
+        for j, cb in enumerate(b, start=1):
+            costo = 0 if ca == cb else 1
+            valor = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + costo)
+            if anterior2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                valor = min(valor, anterior2[j - 2] + 1)
+            actual[j] = valor
+        if min(actual) > maximo:
+            return maximo + 1
+        anterior2, anterior = anterior, actual
+    return min(anterior[-1], maximo + 1)
+
+
+class IndiceDifuso:
+    def __init__(self, opciones):
+        """
+        `opciones`: [(id, nombre, [otros textos])] en el orden del menú. El
+        nombre se usa para la subcadena; nombre y otros textos (marca,
+        referencia) para la búsqueda aproximada.
+        """
+        self._ids = []
+        self._nombres = []
+        self._palabras = []
+        self._posiciones = []  # por palabra: posiciones de las opciones que la contienen (ordenadas)
+        self._trigramas = defaultdict(list)  # trigrama -> palabras que lo contienen
+        vocabulario = {}
+        for posicion, (id_opcion, nombre, otros) in enumerate(opciones):
+            self._ids.append(id_opcion)
+            self._nombres.append(sin_acentos(nombre))
+            for texto in (nombre, *otros):
+                for palabra in tokens(texto):
+                    indice = vocabulario.get(palabra)
+                    if indice is None:
+                        indice = vocabulario[palabra] = len(self._palabras)
+                        self._palabras.append(palabra)
+                        self._posiciones.append([])
+                        for trigrama in _trigramas(palabra):
+                            self._trigramas[trigrama].append(indice)
+                    if not self._posiciones[indice] or self._posiciones[indice][-1] != posicion:
+                        self._posiciones[indice].append(posicion)
+        self._vocabulario = vocabulario
+        self._trigramas = dict(self._trigramas)
+        # Fragmentos de una o dos letras no tienen trigrama: se resuelven una vez
+        self._fragmentos_cortos = {}
+
+    def buscar(self, mensaje):
+        """Id de la opción que mejor corresponde al mensaje, o None."""
+        consulta = sin_acentos(mensaje).strip()
+        posicion = self._por_subcadena(consulta)
+        if posicion is None:
+            posicion = self._aproximada(consulta)
+        return None if posicion is None else self._ids[posicion]
+
+    # --- subcadena ------------------------------------------------------------
+
+    def _palabras_que_contienen(self, fragmento):
+        if len(fragmento) < 3:
+            indices = self._fragmentos_cortos.get(fragmento)
+            if indices is None:
+                indices = [i for i, palabra in enumerate(self._palabras) if fragmento in palabra]
+                self._fragmentos_cortos[fragmento] = indices
+            return indices
+        listas = [self._trigramas.get(t, ()) for t in _trigramas(fragmento) if " " not in t]
+        candidatas = set(min(listas, key=len))
+        return [i for i in candidatas if fragmento in self._palabras[i]]
+
+    def _por_subcadena(self, consulta):
+        palabras = tokens(consulta)
+        if not palabras:
+            # Sin letras ni números no hay palabra que indexar: recorrido directo
+            return next((p for p, nombre in enumerate(self._nombres) if consulta in nombre), None)
+        # Cada palabra de la consulta está dentro de alguna palabra del nombre: se
+        # recorren, en orden del menú, las opciones de la palabra más escasa
+        candidatas = min(
+            (self._palabras_que_contienen(palabra) for palabra in set(palabras)),
+            key=lambda indices: sum(len(self._posiciones[i]) for i in indices),
+        )
+        for posicion in heapq.merge(*(self._posiciones[i] for i in candidatas)):
+            if consulta in self._nombres[posicion]:
+                return posicion
+        return None
+
+    # --- aproximada -----------------------------------------------------------
+
+    def _parecidas(self, palabra):
+        """{índice de palabra del vocabulario: distancia} dentro del margen permitido."""
+        exacta = self._vocabulario.get(palabra)
+        maximo = errores_permitidos(palabra)
+        if maximo == 0:
+            return {} if exacta is None else {exacta: 0}
+
+        compartidos = defaultdict(int)
+        for trigrama in _trigramas(palabra):
+            for indice in self._trigramas.get(trigrama, ()):
+                compartidos[indice] += 1
+        # Cada edición destruye a lo sumo tres trigramas
+        minimo = max(1, len(palabra) - 3 * maximo)
+        parecidas = {}
+        for indice, cantidad in compartidos.items():
+            if cantidad >= minimo:
+                distancia = distancia_acotada(palabra, self._palabras[indice], maximo)
+                if distancia <= maximo:
+                    parecidas[indice] = distancia
+        return parecidas
+
+    def _distancia_en(self, parecidas, posicion):
+        """Menor distancia entre las palabras `parecidas` que contiene la opción, o None."""
+        mejor = None
+        for indice, distancia in parecidas.items():
+            lista = self._posiciones[indice]
+            i = bisect_left(lista, posicion)
+            if i < len(lista) and lista[i] == posicion and (mejor is None or distancia < mejor):
+                mejor = distancia
+        return mejor
+
+    def _aproximada(self, consulta):
+        grupos = [
+            parecidas
+            for parecidas in (self._parecidas(p) for p in {p for p in tokens(consulta) if len(p) >= MIN_LARGO_PALABRA})
+            if parecidas
+        ]
+        candidatas = set()
+        for parecidas in grupos:
+            posiciones = heapq.merge(*(self._posiciones[i] for i in parecidas))
+            candidatas.update(islice(posiciones, MAX_CANDIDATAS))
+        if not candidatas:
+            return None
+
+        def puntaje(posicion):
+            distancias = [d for d in (self._distancia_en(g, posicion) for g in grupos) if d is not None]
+            # Más palabras reconocidas, luego menos errores, luego la primera del menú
+            return -len(distancias), sum(distancias), posicion
+
+        return min(candidatas, key=puntaje)
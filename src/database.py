@@ -1,6 +1,16 @@
 import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
 from dotenv import load_dotenv
 
+from src.cache import CacheLRU
+from src.circuito import CircuitBreaker
+from src.spool import SpoolEscrituras
+
 load_dotenv()
 
 # Intentar importar conectores MySQL
@@ -16,6 +26,175 @@ except ImportError:
         mysql_driver = None
 
 
+# Huella por fila de 'articulos', calculada en el servidor, para la sincronización incremental
+CRC_ARTICULO = (
+    "CRC32(CONCAT_WS('|', COALESCE(referencia, ''), COALESCE(nombre, ''), COALESCE(marca, ''), "
+    "COALESCE(categoria, ''), COALESCE(estado, ''), COALESCE(precio, '')))"
+)
+
+# Sin la tabla ventas_idempotencia, cada cuánto se vuelve a comprobar si ya la crearon
+REVISION_TABLA_IDEMPOTENCIA = 300
+# Cada cuánto se borran las claves de idempotencia vencidas
+INTERVALO_PURGA_IDEMPOTENCIA = 3600
+
+
+class PoolConexiones:
+    """
+    Pool acotado y thread-safe de conexiones MySQL.
+
+    - Nunca mantiene más de `tamano_max` conexiones (prestadas + libres).
+    - Valida con ping las conexiones que llevan más de `intervalo_ping`
+      segundos sin usarse antes de prestarlas.
+    - Cierra las conexiones libres que superan `max_inactividad` segundos.
+    """
+
+    def __init__(self, fabrica, tamano_max=5, max_inactividad=300, timeout_espera=5.0,
+                 intervalo_ping=30, validar=None):
+        self._fabrica = fabrica
+        self._validar = validar
+        self.tamano_max = max(1, int(tamano_max))
+        self.max_inactividad = max_inactividad
+        self.timeout_espera = timeout_espera
+        self.intervalo_ping = intervalo_ping
+        self._libres = deque()  # (conexion, ultimo_uso); la derecha es la más reciente
+        self._en_uso = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "prestamos": 0,
+            "creadas": 0,
+            "recicladas": 0,
+            "descartadas": 0,
+            "fallos_creacion": 0,
+            "timeouts": 0,
+            "esperas": 0,
+            "espera_total_s": 0.0,
+            "espera_max_s": 0.0,
+        }
+
+    def _reciclar_inactivas(self, ahora):
+        """Cierra las conexiones libres más antiguas que superan max_inactividad (con lock)."""
+        cerrar = []
+        while self._libres and ahora - self._libres[0][1] > self.max_inactividad:
+            cerrar.append(self._libres.popleft()[0])
+            self._stats["recicladas"] += 1
+        return cerrar
+
+    def obtener(self):
+        """Presta una conexión sana del pool o None si no fue posible obtenerla."""
+        inicio = time.monotonic()
+        limite = inicio + self.timeout_espera
+        espero = False
+
+        while True:
+            conn = None
+            crear = False
+            with self._cond:
+                while True:
+                    ahora = time.monotonic()
+                    cerrar = self._reciclar_inactivas(ahora)
+                    if cerrar:
+                        break
+                    if self._libres:
+                        conn, ultimo_uso = self._libres.pop()
+                        self._en_uso += 1
+                        break
+                    if self._en_uso < self.tamano_max:
+                        self._en_uso += 1
+                        crear = True
+                        break
+                    restante = limite - ahora
+                    if restante <= 0:
+                        self._stats["timeouts"] += 1
+                        self._registrar_espera(inicio, espero)
+                        return None
+                    espero = True
+                    self._cond.wait(restante)
+
+            if cerrar:
+                for vieja in cerrar:
+                    self._cerrar(vieja)
+                continue
+
+            if crear:
+                try:
+                    conn = self._fabrica()
+                except Exception:
+                    conn = None
+                if conn is None:
+                    with self._cond:
+                        self._en_uso -= 1
+                        self._stats["fallos_creacion"] += 1
+                        self._registrar_espera(inicio, espero)
+                        self._cond.notify()
+                    return None
+                with self._cond:
+                    self._stats["creadas"] += 1
+                    self._stats["prestamos"] += 1
+                    self._registrar_espera(inicio, espero)
+                return conn
+
+            if self._validar and time.monotonic() - ultimo_uso > self.intervalo_ping:
+                if not self._validar(conn):
+                    self._cerrar(conn)
+                    with self._cond:
+                        self._en_uso -= 1
+                        self._stats["descartadas"] += 1
+                        self._cond.notify()
+                    continue
+
+            with self._cond:
+                self._stats["prestamos"] += 1
+                self._registrar_espera(inicio, espero)
+            return conn
+
+    def devolver(self, conn, descartar=False):
+        """Devuelve una conexión prestada; si está dañada se cierra y libera su cupo."""
+        if descartar:
+            self._cerrar(conn)
+        with self._cond:
+            self._en_uso -= 1
+            if descartar:
+                self._stats["descartadas"] += 1
+            else:
+                self._libres.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def cerrar_todas(self):
+        """Cierra las conexiones libres (las prestadas se cierran al devolverse)."""
+        with self._cond:
+            libres = [conn for conn, _ in self._libres]
+            self._libres.clear()
+        for conn in libres:
+            self._cerrar(conn)
+
+    def estadisticas(self):
+        with self._cond:
+            datos = dict(self._stats)
+            datos["en_uso"] = self._en_uso
+            datos["libres"] = len(self._libres)
+            datos["tamano_max"] = self.tamano_max
+        datos["espera_promedio_s"] = (
+            datos["espera_total_s"] / datos["esperas"] if datos["esperas"] else 0.0
+        )
+        return datos
+
+    def _registrar_espera(self, inicio, espero):
+        """Acumula el tiempo de espera de un préstamo (con lock)."""
+        if not espero:
+            return
+        espera = time.monotonic() - inicio
+        self._stats["esperas"] += 1
+        self._stats["espera_total_s"] += espera
+        self._stats["espera_max_s"] = max(self._stats["espera_max_s"], espera)
+
+    @staticmethod
+    def _cerrar(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
 class DatabaseService:
     def __init__(self):
         self.host = os.getenv("DB_HOST", "localhost")
@@ -24,8 +203,51 @@ class DatabaseService:
         self.database = os.getenv("DB_NAME", "almacen_oportunidades")
         self.port = int(os.getenv("DB_PORT", 3306))
         self.driver = mysql_driver
+        self.connect_timeout = float(os.getenv("DB_CONNECT_TIMEOUT", 3))
+        self.read_timeout = float(os.getenv("DB_READ_TIMEOUT", 10))
+        self.write_timeout = float(os.getenv("DB_WRITE_TIMEOUT", 10))
+        self._local = threading.local()
+        self.circuito = CircuitBreaker(
+            umbral_fallos=int(os.getenv("DB_CIRCUITO_FALLOS", 3)),
+            tiempo_apertura=float(os.getenv("DB_CIRCUITO_APERTURA", 30)),
+            al_cerrar=self._reproducir_spool_en_segundo_plano,
+        )
+        self.spool = SpoolEscrituras(os.getenv("DB_SPOOL_RUTA", "data/spool_escrituras.jsonl"))
+        # Columna opcional tipo "updated_at" de articulos para detectar modificaciones
+        self.columna_actualizacion = os.getenv("DB_ARTICULOS_COLUMNA_ACTUALIZACION") or None
+        if self.columna_actualizacion and not self.columna_actualizacion.isidentifier():
+            print(f"⚠️ DB_ARTICULOS_COLUMNA_ACTUALIZACION inválida: '{self.columna_actualizacion}'")
+            self.columna_actualizacion = None
+        self.pool = PoolConexiones(
+            self._conectar,
+            tamano_max=int(os.getenv("DB_POOL_SIZE", 5)),
+            max_inactividad=float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+            timeout_espera=float(os.getenv("DB_POOL_TIMEOUT", 5)),
+            intervalo_ping=float(os.getenv("DB_POOL_PING", 30)),
+            validar=self._conexion_sana,
+        )
+        # telefono -> id_cliente: los clientes recurrentes no consultan la BD
+        self._clientes = CacheLRU(
+            max_entradas=int(os.getenv("CLIENTES_CACHE_MAX", 10000)),
+            ttl=float(os.getenv("CLIENTES_CACHE_TTL", 3600)),
+        )
+        self._tabla_idempotencia_lista = False
+        self._tabla_idempotencia_revisada = float("-inf")
+        self._idempotencia_purgada = float("-inf")
+        # Las claves solo importan mientras la bandeja puede reintentar la orden
+        self.dias_idempotencia = float(os.getenv("VENTAS_IDEMPOTENCIA_DIAS", 30))
+        # Escrituras que fueron al spool con el circuito cerrado (pool agotado)
+        self._spool_pendiente = False
 
-    def _get_connection(self):
+    def _conectar(self):
+        """Fábrica del pool: solo un intento de conexión fallido cuenta para el circuito."""
+        conn = self._crear_conexion()
+        if conn is None:
+            self._local.fallo_al_conectar = True
+            self.circuito.registrar_fallo()
+        return conn
+
+    def _crear_conexion(self):
         if not self.driver:
             return None
 
@@ -39,7 +261,10 @@ class DatabaseService:
                     database=self.database,
                     port=self.port,
                     autocommit=True,
-                    cursorclass=pymysql.cursors.DictCursor
+                    cursorclass=pymysql.cursors.DictCursor,
+                    connect_timeout=self.connect_timeout,
+                    read_timeout=self.read_timeout,
+                    write_timeout=self.write_timeout,
                 )
                 return conn
             elif self.driver == 'mysql.connector':
@@ -51,131 +276,444 @@ class DatabaseService:
                     database=self.database,
                     port=self.port,
                     autocommit=True,
+                    # mysql.connector usa un solo timeout para conectar y para el socket
+                    connection_timeout=int(max(self.connect_timeout, self.read_timeout)),
                 )
                 return conn
         except Exception as e:
             # print(f"⚠️ Error conectando a MySQL: {e}")
             return None
 
-    def _cursor(self, conn):
-        if self.driver == 'mysql.connector':
-            return conn.cursor(dictionary=True)
-        return conn.cursor()
+    def _conexion_sana(self, conn):
+        """Health check al prestar una conexión que llevaba tiempo inactiva."""
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
 
-    def obtener_o_crear_cliente(self, telefono, nombre=None, direccion=None):
-        """Busca un cliente por teléfono o lo crea en la tabla 'clientes'."""
-        conn = self._get_connection()
-        if not conn:
-            return None
+    @staticmethod
+    def _conexion_abierta(conn):
+        # pymysql marca `open = False` cuando el socket se cae tras un error
+        return getattr(conn, "open", True) is not False
+
+    @contextmanager
+    def _conexion(self):
+        """
+        Presta una conexión del pool durante el bloque `with`.
+        Las llamadas anidadas en el mismo hilo (p. ej. registrar_interes →
+        obtener_o_crear_cliente) reutilizan la misma conexión.
+        Con el circuito abierto entrega None de inmediato, sin tocar la red.
+        Un pool agotado también entrega None, pero no cuenta como fallo: la BD
+        está ocupada, no caída.
+        """
+        actual = getattr(self._local, "conn", None)
+        if actual is not None:
+            yield actual
+            return
+
+        if not self.circuito.permitir():
+            yield None
+            return
+
+        self._local.fallo_al_conectar = False
+        conn = self.pool.obtener()
+        if conn is None:
+            # Un fallo al conectar ya lo registró _conectar (corre en este mismo hilo)
+            if not self._local.fallo_al_conectar:
+                print("⚠️ Pool de MySQL agotado: sin conexión libre tras DB_POOL_TIMEOUT")
+                self.circuito.liberar_prueba()
+            yield None
+            return
 
+        self._local.conn = conn
         try:
-            with self._cursor(conn) as cursor:
-                # Buscar cliente por teléfono
-                cursor.execute("SELECT * FROM clientes WHERE telefono = %s", (telefono,))
-                cliente = cursor.fetchone()
-
-                if cliente:
-                    # Actualizar si se proveen nombre o dirección
-                    if nombre or direccion:
-                        nombre_final = nombre or cliente.get('nombre')
-                        direccion_final = direccion or cliente.get('direccion')
-                        cursor.execute(
-                            "UPDATE clientes SET nombre = %s, direccion = %s WHERE id_cliente = %s",
-                            (nombre_final, direccion_final, cliente['id_cliente'])
-                        )
-                    return cliente.get('id_cliente')
-                else:
-                    # Crear nuevo cliente
-                    nombre_val = nombre or f"Cliente WhatsApp {telefono}"
-                    direccion_val = direccion or "Por especificar"
-                    cursor.execute(
-                        "INSERT INTO clientes (telefono, nombre, direccion) VALUES (%s, %s, %s)",
-                        (telefono, nombre_val, direccion_val)
-                    )
-                    return cursor.lastrowid
-        except Exception as e:
-            print(f"❌ Error DB en obtener_o_crear_cliente: {e}")
-            return None
+            yield conn
         finally:
-            conn.close()
+            self._local.conn = None
+            sana = self._conexion_abierta(conn)
+            self.pool.devolver(conn, descartar=not sana)
+            if sana:
+                self.circuito.registrar_exito()
+                if self._spool_pendiente:
+                    # Lo apartado mientras el pool estaba agotado no espera a otra caída
+                    self._spool_pendiente = False
+                    self._reproducir_spool_en_segundo_plano()
+            else:
+                self.circuito.registrar_fallo()
 
-    def registrar_interes(self, telefono, termino_busqueda):
-        """Inserta la búsqueda de un cliente en la tabla 'intereses'."""
-        conn = self._get_connection()
-        if not conn:
+    def _a_spool(self, operacion, *args):
+        """Guarda una escritura para reproducirla cuando MySQL vuelva. False si no hay BD configurada."""
+        if not self.driver:
             return False
+        try:
+            self.spool.guardar(operacion, *args)
+            self._spool_pendiente = True
+            print(f"💾 MySQL no disponible: '{operacion}' guardada en spool local")
+            return True
+        except OSError as e:
+            print(f"❌ No se pudo escribir el spool: {e}")
+            return False
+
+    def reproducir_spool(self):
+        """Reintenta en MySQL las escrituras guardadas mientras la BD estuvo caída."""
+        operaciones = {
+            "registrar_intereses_lote": self.registrar_intereses_lote,
+            "crear_venta": self.crear_venta,
+        }
+
+        def ejecutar(operacion, args):
+            metodo = operaciones.get(operacion)
+            if metodo:
+                metodo(*args)
+
+        reproducidas = self.spool.reproducir(ejecutar)
+        if reproducidas:
+            print(f"✅ {reproducidas} escrituras del spool reproducidas en MySQL")
+        return reproducidas
 
+    def _reproducir_spool_en_segundo_plano(self):
+        threading.Thread(target=self.reproducir_spool, name="reproducir-spool", daemon=True).start()
+
+    def estadisticas(self):
+        """Métricas de la capa de datos para monitoreo."""
+        return {
+            "pool": self.pool.estadisticas(),
+            "circuito": self.circuito.estadisticas(),
+            "cache_clientes": self._clientes.estadisticas(),
+            "spool_pendientes": self.spool.pendientes(),
+        }
+
+    @contextmanager
+    def _transaccion(self, conn):
+        """Transacción explícita sobre una conexión en autocommit: commit al salir, rollback si falla."""
+        if self.driver == 'mysql.connector':
+            conn.start_transaction()
+        else:
+            conn.begin()
         try:
-            id_cliente = self.obtener_o_crear_cliente(telefono)
-            if not id_cliente:
-                return False
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
 
+    def _hay_tabla_idempotencia(self, conn):
+        """
+        True si existe la tabla ventas_idempotencia (se crea con el SQL del README;
+        el bot no ejecuta DDL). Si falta se avisa y se vuelve a mirar cada
+        REVISION_TABLA_IDEMPOTENCIA segundos.
+        """
+        if self._tabla_idempotencia_lista:
+            return True
+        ahora = time.monotonic()
+        if ahora - self._tabla_idempotencia_revisada < REVISION_TABLA_IDEMPOTENCIA:
+            return False
+        with self._cursor(conn) as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) AS total FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = 'ventas_idempotencia'"
+            )
+            fila = cursor.fetchone() or {}
+        self._tabla_idempotencia_revisada = ahora
+        self._tabla_idempotencia_lista = bool(fila.get("total"))
+        if not self._tabla_idempotencia_lista:
+            print(
+                "❌ Falta la tabla 'ventas_idempotencia' (ver README, Base de Datos). "
+                "Mientras no exista, las ventas se escriben sin protección contra duplicados."
+            )
+        return self._tabla_idempotencia_lista
+
+    def _purgar_idempotencia(self, conn):
+        """Borra, a lo sumo una vez por INTERVALO_PURGA_IDEMPOTENCIA, las claves más viejas que dias_idempotencia."""
+        ahora = time.monotonic()
+        if ahora - self._idempotencia_purgada < INTERVALO_PURGA_IDEMPOTENCIA:
+            return
+        self._idempotencia_purgada = ahora
+        try:
             with self._cursor(conn) as cursor:
                 cursor.execute(
-                    "INSERT INTO intereses (id_cliente, termino_busqueda, fecha_busqueda) VALUES (%s, %s, NOW())",
-                    (id_cliente, termino_busqueda)
+                    "DELETE FROM ventas_idempotencia WHERE creado_en < NOW() - INTERVAL %s DAY",
+                    (self.dias_idempotencia,)
                 )
-                print(f"✅ Interés registrado en MySQL para cliente ID {id_cliente}: '{termino_busqueda}'")
-                return True
+                if cursor.rowcount:
+                    print(f"🧹 {cursor.rowcount} claves de idempotencia de ventas vencidas borradas")
         except Exception as e:
-            print(f"❌ Error DB en registrar_interes: {e}")
-            return False
-        finally:
-            conn.close()
+            print(f"⚠️ No se pudieron purgar las claves de idempotencia: {e}")
+
+    def _cursor(self, conn):
+        if self.driver == 'mysql.connector':
+            return conn.cursor(dictionary=True)
+        return conn.cursor()
+
+    def _cursor_preparado(self, conn):
+        """
+        Cursor con sentencias preparadas en el servidor para las escrituras repetidas.
+        Solo mysql.connector las ofrece; pymysql interpola los parámetros en el cliente.
+        """
+        if self.driver == 'mysql.connector':
+            return conn.cursor(prepared=True)
+        return conn.cursor()
+
+    def obtener_o_crear_cliente(self, telefono, nombre=None, direccion=None):
+        """
+        Devuelve el id_cliente del teléfono, creándolo en 'clientes' si no existe.
+        Requiere un índice UNIQUE sobre clientes.telefono para el upsert.
+        """
+        id_cliente = self._clientes.obtener(telefono)
+        if id_cliente and not (nombre or direccion):
+            return id_cliente
+
+        with self._conexion() as conn:
+            if not conn:
+                return None
+
+            try:
+                with self._cursor(conn) as cursor:
+                    id_cliente = self._upsert_cliente(cursor, telefono, nombre, direccion, id_cliente)
+                if id_cliente:
+                    self._clientes.guardar(telefono, id_cliente)
+                return id_cliente
+            except Exception as e:
+                print(f"❌ Error DB en obtener_o_crear_cliente: {e}")
+                return None
+
+    @staticmethod
+    def _upsert_cliente(cursor, telefono, nombre, direccion, id_cliente=None):
+        """Crea o actualiza el cliente con el cursor recibido (no toca la caché)."""
+        if id_cliente:
+            # Cliente conocido: solo actualizar los datos que llegaron
+            cursor.execute(
+                "UPDATE clientes SET nombre = COALESCE(%s, nombre), direccion = COALESCE(%s, direccion) "
+                "WHERE id_cliente = %s",
+                (nombre, direccion, id_cliente)
+            )
+            return id_cliente
+
+        # Un solo viaje: crea el cliente o recupera el id del existente
+        cursor.execute(
+            "INSERT INTO clientes (telefono, nombre, direccion) VALUES (%s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE id_cliente = LAST_INSERT_ID(id_cliente), "
+            "nombre = COALESCE(%s, nombre), direccion = COALESCE(%s, direccion)",
+            (
+                telefono,
+                nombre or f"Cliente WhatsApp {telefono}",
+                direccion or "Por especificar",
+                nombre,
+                direccion,
+            )
+        )
+        return cursor.lastrowid
+
+    def registrar_interes(self, telefono, termino_busqueda):
+        """Inserta la búsqueda de un cliente en la tabla 'intereses'."""
+        with self._conexion() as conn:
+            if not conn:
+                fila = (telefono, termino_busqueda, datetime.now())
+                return self._a_spool("registrar_intereses_lote", [fila])
+
+            try:
+                id_cliente = self.obtener_o_crear_cliente(telefono)
+                if not id_cliente:
+                    return False
+
+                with self._cursor(conn) as cursor:
+                    cursor.execute(
+                        "INSERT INTO intereses (id_cliente, termino_busqueda, fecha_busqueda) VALUES (%s, %s, NOW())",
+                        (id_cliente, termino_busqueda)
+                    )
+                    print(f"✅ Interés registrado en MySQL para cliente ID {id_cliente}: '{termino_busqueda}'")
+                    return True
+            except Exception as e:
+                print(f"❌ Error DB en registrar_interes: {e}")
+                return False
+
+    def registrar_intereses_lote(self, filas):
+        """
+        Inserta varios intereses con un solo executemany.
+        `filas` es una lista de (telefono, termino_busqueda, fecha). Devuelve las filas
+        escritas (o guardadas en el spool si MySQL no está disponible).
+        """
+        with self._conexion() as conn:
+            if not conn:
+                return len(filas) if self._a_spool("registrar_intereses_lote", filas) else 0
+
+            try:
+                ids_cliente = {}
+                valores = []
+                for telefono, termino_busqueda, fecha in filas:
+                    if telefono not in ids_cliente:
+                        ids_cliente[telefono] = self.obtener_o_crear_cliente(telefono)
+                    if ids_cliente[telefono]:
+                        valores.append((ids_cliente[telefono], termino_busqueda, fecha))
+
+                if not valores:
+                    return 0
+
+                with self._cursor(conn) as cursor:
+                    cursor.executemany(
+                        "INSERT INTO intereses (id_cliente, termino_busqueda, fecha_busqueda) VALUES (%s, %s, %s)",
+                        valores
+                    )
+                print(f"✅ {len(valores)} intereses registrados en MySQL")
+                return len(valores)
+            except Exception as e:
+                print(f"❌ Error DB en registrar_intereses_lote: {e}")
+                return 0
 
     def obtener_articulos(self, termino=None):
         """Consulta productos de la tabla 'articulos'."""
-        conn = self._get_connection()
-        if not conn:
-            return []
+        with self._conexion() as conn:
+            if not conn:
+                return []
 
-        try:
-            with self._cursor(conn) as cursor:
-                if termino:
-                    query = "SELECT * FROM articulos WHERE LOWER(nombre) LIKE %s OR LOWER(categoria) LIKE %s OR LOWER(referencia) LIKE %s"
-                    param = f"%{termino.lower()}%"
-                    cursor.execute(query, (param, param, param))
-                else:
-                    cursor.execute("SELECT * FROM articulos")
-                
-                rows = cursor.fetchall()
-                return rows
-        except Exception as e:
-            print(f"❌ Error DB en obtener_articulos: {e}")
-            return []
-        finally:
-            conn.close()
+            try:
+                with self._cursor(conn) as cursor:
+                    if termino:
+                        query = "SELECT * FROM articulos WHERE LOWER(nombre) LIKE %s OR LOWER(categoria) LIKE %s OR LOWER(referencia) LIKE %s"
+                        param = f"%{termino.lower()}%"
+                        cursor.execute(query, (param, param, param))
+                    else:
+                        cursor.execute("SELECT * FROM articulos")
 
-    def crear_venta(self, telefono, datos_cliente, producto_nombre, total_monto, id_articulo=None):
-        """Crea un registro en la tabla 'ventas' y opcionalmente en 'detalle_ventas'."""
-        conn = self._get_connection()
-        if not conn:
-            return False
+                    rows = cursor.fetchall()
+                    return rows
+            except Exception as e:
+                print(f"❌ Error DB en obtener_articulos: {e}")
+                return []
 
-        try:
-            id_cliente = self.obtener_o_crear_cliente(telefono, direccion=datos_cliente)
-            if not id_cliente:
-                return False
+    def firma_articulos(self):
+        """Firma barata de la tabla 'articulos' para detectar cambios sin leerla completa."""
+        with self._conexion() as conn:
+            if not conn:
+                return None
 
-            with self._cursor(conn) as cursor:
-                # 1. Insertar en tabla 'ventas'
-                cursor.execute(
-                    "INSERT INTO ventas (id_cliente, fecha_venta, total) VALUES (%s, NOW(), %s)",
-                    (id_cliente, total_monto)
+            try:
+                with self._cursor(conn) as cursor:
+                    if self.columna_actualizacion:
+                        cursor.execute(
+                            f"SELECT COUNT(*) AS total, MAX(id_articulo) AS max_id, "
+                            f"MAX({self.columna_actualizacion}) AS actualizado FROM articulos"
+                        )
+                        fila = cursor.fetchone() or {}
+                        return (fila.get('total'), fila.get('max_id'), str(fila.get('actualizado')))
+
+                    cursor.execute("SELECT COUNT(*) AS total, MAX(id_articulo) AS max_id FROM articulos")
+                    fila = cursor.fetchone() or {}
+                    return (fila.get('total'), fila.get('max_id'))
+            except Exception as e:
+                print(f"❌ Error DB en firma_articulos: {e}")
+                return None
+
+    def obtener_articulos_sincronizacion(self, ids=None, modificados_desde=None):
+        """
+        Artículos con su huella `crc_sync` para la sincronización incremental.
+        Filtra por ids o por la columna de actualización. None si la consulta falla.
+        """
+        with self._conexion() as conn:
+            if not conn:
+                return None
+
+            try:
+                with self._cursor(conn) as cursor:
+                    query = f"SELECT *, {CRC_ARTICULO} AS crc_sync FROM articulos"
+                    if ids is not None:
+                        if not ids:
+                            return []
+                        marcadores = ", ".join(["%s"] * len(ids))
+                        cursor.execute(f"{query} WHERE id_articulo IN ({marcadores})", tuple(ids))
+                    elif modificados_desde is not None and self.columna_actualizacion:
+                        # >=: filas actualizadas en el mismo segundo que la marca de agua
+                        # llegan de nuevo; el sincronizador descarta las que no cambiaron
+                        cursor.execute(f"{query} WHERE {self.columna_actualizacion} >= %s", (modificados_desde,))
+                    else:
+                        cursor.execute(query)
+                    return list(cursor.fetchall())
+            except Exception as e:
+                print(f"❌ Error DB en obtener_articulos_sincronizacion: {e}")
+                return None
+
+    def obtener_huellas_articulos(self):
+        """{id_articulo: crc} de toda la tabla: solo dos columnas numéricas por fila."""
+        with self._conexion() as conn:
+            if not conn:
+                return None
+
+            try:
+                with self._cursor(conn) as cursor:
+                    cursor.execute(f"SELECT id_articulo, {CRC_ARTICULO} AS crc_sync FROM articulos")
+                    return {fila['id_articulo']: fila['crc_sync'] for fila in cursor.fetchall()}
+            except Exception as e:
+                print(f"❌ Error DB en obtener_huellas_articulos: {e}")
+                return None
+
+    def crear_venta(self, telefono, datos_cliente, producto_nombre, total_monto, id_articulo=None, clave=None):
+        """
+        Crea la venta completa (cliente, 'ventas' y 'detalle_ventas') en una sola
+        transacción sobre una sola conexión del pool.
+
+        Con `clave` (idempotencia) una venta ya escrita no se vuelve a insertar y, si
+        MySQL no está disponible, devuelve False para que el llamador reintente en
+        lugar de pasar por el spool.
+        """
+        with self._conexion() as conn:
+            if not conn:
+                if clave:
+                    return False
+                return self._a_spool(
+                    "crear_venta", telefono, datos_cliente, producto_nombre, total_monto, id_articulo
                 )
-                id_venta = cursor.lastrowid
 
-                # 2. Insertar en tabla 'detalle_ventas' si se tiene el id_articulo
-                if id_articulo:
+            try:
+                if clave and not self._hay_tabla_idempotencia(conn):
+                    clave = None
+
+                id_cliente = None
+                with self._cursor_preparado(conn) as cursor, self._transaccion(conn):
+                    if clave:
+                        # La clave primaria serializa reintentos concurrentes de la misma orden
+                        cursor.execute(
+                            "INSERT IGNORE INTO ventas_idempotencia (clave, creado_en) VALUES (%s, NOW())",
+                            (clave,)
+                        )
+                        if cursor.rowcount == 0:
+                            print(f"ℹ️ Venta {clave} ya estaba registrada en MySQL")
+                            return True
+
+                    id_cliente = self._upsert_cliente(
+                        cursor, telefono, None, datos_cliente, self._clientes.obtener(telefono)
+                    )
+                    if not id_cliente:
+                        raise RuntimeError(f"no se obtuvo id_cliente para {telefono}")
+
+                    # 1. Insertar en tabla 'ventas'
                     cursor.execute(
-                        "INSERT INTO detalle_ventas (id_venta, id_articulo, cantidad, precio_item) VALUES (%s, %s, %s, %s)",
-                        (id_venta, id_articulo, 1, total_monto)
+                        "INSERT INTO ventas (id_cliente, fecha_venta, total) VALUES (%s, NOW(), %s)",
+                        (id_cliente, total_monto)
                     )
+                    id_venta = cursor.lastrowid
 
+                    # 2. Insertar en tabla 'detalle_ventas' si se tiene el id_articulo
+                    if id_articulo:
+                        cursor.execute(
+                            "INSERT INTO detalle_ventas (id_venta, id_articulo, cantidad, precio_item) VALUES (%s, %s, %s, %s)",
+                            (id_venta, id_articulo, 1, total_monto)
+                        )
+
+                    if clave:
+                        cursor.execute(
+                            "UPDATE ventas_idempotencia SET id_venta = %s WHERE clave = %s",
+                            (id_venta, clave)
+                        )
+
+                # Solo tras el commit: un rollback no deja ids inexistentes en la caché
+                self._clientes.guardar(telefono, id_cliente)
                 print(f"✅ Venta ID {id_venta} creada exitosamente en MySQL para cliente ID {id_cliente}")
+                if clave:
+                    self._purgar_idempotencia(conn)
                 return True
-        except Exception as e:
-            print(f"❌ Error DB en crear_venta: {e}")
-            return False
-        finally:
-            conn.close()
+            except Exception as e:
+                # El id en caché pudo ser la causa (cliente borrado): el reintento lo vuelve a resolver
+                self._clientes.invalidar(telefono)
+                print(f"❌ Error DB en crear_venta: {e}")
+                return False
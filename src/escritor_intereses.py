@@ -0,0 +1,109 @@
+"""
+Escritor asíncrono por lotes para la tabla `intereses` (leads).
+
+El flujo de conversación solo encola; un hilo en segundo plano agrupa las
+filas y las inserta con `executemany` cuando el lote se llena o vence el
+intervalo de flush.
+"""
+import queue
+import threading
+import time
+from datetime import datetime
+
+_DESPERTAR = object()  # marca para despertar al hilo durante el apagado
+
+
+class EscritorIntereses:
+    def __init__(self, db, capacidad=1000, tamano_lote=50, intervalo_flush=1.0):
+        self.db = db
+        self.capacidad = capacidad
+        self.tamano_lote = max(1, int(tamano_lote))
+        self.intervalo_flush = intervalo_flush
+        self._cola = queue.Queue(maxsize=capacidad)
+        self._detener = threading.Event()
+        self._lock = threading.Lock()
+        self._metricas = {
+            "encolados": 0,
+            "escritos": 0,
+            "descartados": 0,
+            "fallidos": 0,
+            "lotes": 0,
+            "profundidad_max": 0,
+            "ultimo_flush_s": 0.0,
+        }
+        self._hilo = threading.Thread(target=self._bucle, name="escritor-intereses", daemon=True)
+        self._hilo.start()
+
+    def encolar(self, telefono, termino_busqueda):
+        """Encola un interés sin bloquear. Devuelve False si la cola está llena."""
+        fila = (telefono, termino_busqueda, datetime.now())
+        try:
+            self._cola.put_nowait(fila)
+        except queue.Full:
+            with self._lock:
+                self._metricas["descartados"] += 1
+            return False
+
+        with self._lock:
+            self._metricas["encolados"] += 1
+            profundidad = self._cola.qsize()
+            if profundidad > self._metricas["profundidad_max"]:
+                self._metricas["profundidad_max"] = profundidad
+        return True
+
+    def metricas(self):
+        with self._lock:
+            datos = dict(self._metricas)
+        datos["profundidad"] = self._cola.qsize()
+        datos["capacidad"] = self.capacidad
+        return datos
+
+    def detener(self, timeout=10):
+        """Escribe lo pendiente y detiene el hilo (apagado ordenado)."""
+        self._detener.set()
+        try:
+            self._cola.put_nowait(_DESPERTAR)
+        except queue.Full:
+            pass  # la cola tiene filas: el hilo no está bloqueado esperando
+        self._hilo.join(timeout=timeout)
+
+    def _bucle(self):
+        lote = []
+        limite = None
+        while True:
+            apagando = self._detener.is_set()
+            try:
+                if apagando:
+                    fila = self._cola.get_nowait()
+                else:
+                    espera = self.intervalo_flush if limite is None else max(0.0, limite - time.monotonic())
+                    fila = self._cola.get(timeout=espera)
+                if fila is _DESPERTAR:
+                    continue
+                lote.append(fila)
+                if limite is None:
+                    limite = time.monotonic() + self.intervalo_flush
+            except queue.Empty:
+                if apagando:
+                    if lote:
+                        self._escribir(lote)
+                    return
+
+            if lote and (len(lote) >= self.tamano_lote or time.monotonic() >= limite):
+                self._escribir(lote)
+                lote = []
+                limite = None
+
+    def _escribir(self, lote):
+        inicio = time.monotonic()
+        try:
+            escritos = self.db.registrar_intereses_lote(lote)
+        except Exception as e:
+            print(f"❌ Error escribiendo lote de intereses: {e}")
+            escritos = 0
+
+        with self._lock:
+            self._metricas["lotes"] += 1
+            self._metricas["escritos"] += escritos
+            self._metricas["fallidos"] += len(lote) - escritos
+            self._metricas["ultimo_flush_s"] = time.monotonic() - inicio
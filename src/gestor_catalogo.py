@@ -0,0 +1,179 @@
+"""
+Snapshot inmutable y versionado del catálogo, compartido por todas las sesiones.
+
+El catálogo se reconstruye en segundo plano (por TTL o al detectar cambios en
+`articulos`) y se publica con un intercambio atómico de referencia: los
+mensajes en curso siguen usando el snapshot que ya tenían.
+"""
+import threading
+import time
+
+
+class SnapshotCatalogo:
+    """Versión publicada del catálogo. No se modifica después de creada."""
+
+    __slots__ = ("version", "catalogo", "origen", "firma", "creado_en", "_derivados", "_lock")
+
+    def __init__(self, version, catalogo, origen, firma=None):
+        self.version = version
+        self.catalogo = catalogo
+        self.origen = origen
+        self.firma = firma
+        self.creado_en = time.time()
+        self._derivados = {}
+        self._lock = threading.Lock()
+
+    def derivado(self, nombre, fabrica):
+        """
+        Estructura calculada a partir de este snapshot (índices, menús...).
+        Se construye una sola vez y se descarta junto con el snapshot.
+        """
+        try:
+            return self._derivados[nombre]
+        except KeyError:
+            pass
+        with self._lock:
+            if nombre not in self._derivados:
+                self._derivados[nombre] = fabrica(self)
+            return self._derivados[nombre]
+
+
+class GestorCatalogo:
+    """
+    Mantiene el snapshot vigente del catálogo.
+
+    - `cargador(actual)` devuelve `(catalogo, origen)` o None para conservar
+      el snapshot actual (p. ej. si la BD no responde).
+    - `firma()` es una consulta barata que cambia cuando cambia `articulos`;
+      None significa "no se pudo consultar".
+    - `archivo` (ArchivoCatalogo, opcional) guarda los snapshots nuevos en
+      disco; si al crear el gestor ya hay uno válido, se publica tal cual y la
+      primera carga real se hace en segundo plano al llamar a `iniciar()`.
+      La escritura corre en otro hilo, fuera de `_lock_refresco`, y a lo sumo
+      una vez cada `intervalo_archivo` segundos (siempre el snapshot más
+      reciente); `detener()` escribe el que haya quedado pendiente.
+    """
+
+    def __init__(self, cargador, firma=None, ttl=300, intervalo_cambios=30, archivo=None, intervalo_archivo=300):
+        self._cargador = cargador
+        self._firma = firma
+        self._archivo = archivo
+        self.intervalo_archivo = intervalo_archivo
+        self._cond_archivo = threading.Condition()
+        self._por_archivar = None
+        self._ultimo_archivo = float("-inf")
+        self._hilo_archivo = None
+        self._cerrando = False
+        self.ttl = ttl
+        self.intervalo_cambios = intervalo_cambios
+        self._lock_refresco = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = None
+        self._ultimo_completo = 0.0
+        self._snapshot = archivo.cargar() if archivo else None
+        self.desde_archivo = self._snapshot is not None
+        if not self.desde_archivo:
+            self.refrescar(forzar=True)
+
+    def actual(self):
+        """Snapshot vigente (lectura atómica, sin bloqueo)."""
+        return self._snapshot
+
+    def refrescar(self, forzar=False):
+        """Reconstruye el catálogo si cambió (o siempre con forzar=True)."""
+        with self._lock_refresco:
+            actual = self._snapshot
+            firma = self._firma() if self._firma else None
+
+            if not forzar and actual is not None:
+                if firma is None or firma == actual.firma:
+                    return actual
+
+            resultado = self._cargador(actual)
+            self._ultimo_completo = time.monotonic()
+            if resultado is None:
+                return actual
+
+            catalogo, origen = resultado
+            version = actual.version + 1 if actual else 1
+            self._snapshot = SnapshotCatalogo(version, catalogo, origen, firma)
+            if self._archivo:
+                self._archivar(self._snapshot)
+            return self._snapshot
+
+    def iniciar(self):
+        """Arranca el hilo de refresco en segundo plano."""
+        if self._hilo:
+            return
+        if self.intervalo_cambios <= 0:
+            if self.desde_archivo:
+                # Sin hilo periódico: una única recarga desde la BD para no quedarse con el archivo
+                self._hilo = threading.Thread(
+                    target=self._refrescar_seguro, args=(True,), name="refresco-catalogo", daemon=True
+                )
+                self._hilo.start()
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="refresco-catalogo", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join(timeout=5)
+            self._hilo = None
+        with self._cond_archivo:
+            hilo, self._hilo_archivo = self._hilo_archivo, None
+            self._cerrando = True
+            self._cond_archivo.notify()
+        if hilo:
+            hilo.join()
+        with self._cond_archivo:
+            self._cerrando = False
+            pendiente, self._por_archivar = self._por_archivar, None
+        if pendiente is not None:
+            self._archivo.guardar(pendiente)
+
+    def _archivar(self, snapshot):
+        """Deja `snapshot` para el hilo que escribe el archivo (reemplaza al pendiente)."""
+        with self._cond_archivo:
+            self._por_archivar = snapshot
+            self._cond_archivo.notify()
+            if self._hilo_archivo is None and not self._cerrando:
+                self._hilo_archivo = threading.Thread(
+                    target=self._bucle_archivo, name="archivo-catalogo", daemon=True
+                )
+                self._hilo_archivo.start()
+
+    def _bucle_archivo(self):
+        while True:
+            with self._cond_archivo:
+                if self._cerrando:
+                    return
+                if self._por_archivar is None:
+                    self._cond_archivo.wait()
+                    continue
+                espera = self._ultimo_archivo + self.intervalo_archivo - time.monotonic()
+                if espera > 0:
+                    self._cond_archivo.wait(espera)
+                    continue
+                snapshot, self._por_archivar = self._por_archivar, None
+            try:
+                self._archivo.guardar(snapshot)
+            except Exception as e:
+                print(f"⚠️ Error guardando el snapshot del catálogo: {e}")
+            self._ultimo_archivo = time.monotonic()
+
+    def _refrescar_seguro(self, forzar):
+        try:
+            self.refrescar(forzar=forzar)
+        except Exception as e:
+            print(f"⚠️ Error refrescando catálogo: {e}")
+
+    def _bucle(self):
+        # Con el catálogo leído del archivo, la primera carga desde la BD no espera el intervalo
+        espera = 0 if self.desde_archivo else self.intervalo_cambios
+        while not self._detener.wait(espera):
+            espera = self.intervalo_cambios
+            vencido = self.ttl > 0 and time.monotonic() - self._ultimo_completo >= self.ttl
+            self._refrescar_seguro(vencido)
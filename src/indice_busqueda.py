@@ -0,0 +1,110 @@
+"""
+Índice invertido en memoria sobre los productos del catálogo.
+
+Se construye una vez por snapshot y responde búsquedas por término sin ir a
+MySQL (reemplaza el `LIKE '%termino%'` sobre nombre/categoria/referencia).
+"""
+from bisect import bisect_left
+from collections import defaultdict
+
+from src.texto import tokens
+
+# Peso de cada campo al rankear: una referencia coincide casi siempre con un único modelo
+PESOS_CAMPOS = (
+    ("referencia", 4.0),
+    ("nombre", 3.0),
+    ("marca", 2.0),
+    ("categoria", 1.0),
+)
+
+SINONIMOS = {
+    "televisor": "tv",
+    "televisores": "tv",
+    "tele": "tv",
+    "nevera": "refrigera",
+    "refrigerador": "refrigera",
+    "refri": "refrigera",
+}
+
+# Máximo de términos del índice que puede expandir un prefijo
+_MAX_EXPANSION_PREFIJO = 50
+
+
+def iterar_productos(catalogo):
+    """Recorre (clave_categoria, id_subcategoria, id_producto, producto) del catálogo."""
+    for clave, categoria in (catalogo or {}).items():
+        for sid, subcat in categoria.get("subcategorias", {}).items():
+            for pid, producto in subcat.get("productos", {}).items():
+                yield clave, sid, pid, producto
+
+
+class IndiceProductos:
+    def __init__(self, entradas):
+        # entradas: lista de (clave_categoria, id_subcategoria, id_producto, producto)
+        self.entradas = list(entradas)
+        postings = defaultdict(dict)
+        for idx, (_, _, _, producto) in enumerate(self.entradas):
+            for campo, peso in PESOS_CAMPOS:
+                for token in tokens(producto.get(campo)):
+                    actual = postings[token].get(idx, 0.0)
+                    postings[token][idx] = max(actual, peso)
+        self._postings = dict(postings)
+        self._terminos = sorted(self._postings)
+
+    @classmethod
+    def desde_catalogo(cls, catalogo):
+        return cls(iterar_productos(catalogo))
+
+    @classmethod
+    def desde_snapshot(cls, snapshot):
+        return cls.desde_catalogo(snapshot.catalogo)
+
+    def _coincidencias(self, termino):
+        """Postings del término exacto y de los términos que empiezan por él."""
+        encontrados = {}
+        inicio = bisect_left(self._terminos, termino)
+        for termino_indice in self._terminos[inicio:inicio + _MAX_EXPANSION_PREFIJO]:
+            if not termino_indice.startswith(termino):
+                break
+            # un prefijo puntúa un poco menos que la palabra completa
+            factor = 1.0 if termino_indice == termino else 0.8
+            for idx, peso in self._postings[termino_indice].items():
+                encontrados[idx] = max(encontrados.get(idx, 0.0), peso * factor)
+        return encontrados
+
+    def buscar(self, consulta, limite=10):
+        """Productos ordenados por relevancia: primero los que cubren más términos."""
+        cubiertos = defaultdict(int)
+        puntajes = defaultdict(float)
+        for termino in set(tokens(consulta)):
+            encontrados = self._coincidencias(termino)
+            sinonimo = SINONIMOS.get(termino)
+            if sinonimo:
+                for idx, peso in self._coincidencias(sinonimo).items():
+                    encontrados[idx] = max(encontrados.get(idx, 0.0), peso)
+            for idx, peso in encontrados.items():
+                cubiertos[idx] += 1
+                puntajes[idx] += peso
+
+        ranking = sorted(puntajes, key=lambda idx: (-cubiertos[idx], -puntajes[idx], idx))
+        return [self.entradas[idx][3] for idx in ranking[:limite]]
+
+    def por_nombre(self, nombre):
+        """
+        Productos cuyo nombre es exactamente `nombre` (sin tildes, mayúsculas ni
+        puntuación). A diferencia de buscar(), no acepta prefijos, sinónimos ni
+        coincidencias parciales.
+        """
+        buscados = tokens(nombre)
+        if not buscados:
+            return []
+        candidatos = None
+        for termino in set(buscados):
+            indices = self._postings.get(termino, {}).keys()
+            candidatos = set(indices) if candidatos is None else candidatos & indices
+            if not candidatos:
+                return []
+        return [
+            self.entradas[idx][3] for idx in sorted(candidatos)
+            if tokens(self.entradas[idx][3].get("nombre")) == buscados
+        ]
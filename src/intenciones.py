@@ -0,0 +1,60 @@
+"""
+Detección de intenciones por palabras clave en una sola pasada.
+
+Todas las listas de palabras se compilan una vez en un autómata Aho-Corasick
+sobre texto sin tildes. `detectar` recorre el mensaje una sola vez y devuelve
+todas las intenciones cuyas palabras aparecen como subcadena (misma semántica
+que `any(palabra in mensaje for palabra in lista)`).
+"""
+from collections import deque
+
+from src.texto import sin_acentos
+
+
+class DetectorIntenciones:
+    def __init__(self, intenciones):
+        # intenciones: {nombre: [palabras clave]}
+        self._transiciones = [{}]
+        self._fallo = [0]
+        salidas = [set()]
+        for nombre, palabras in intenciones.items():
+            for palabra in palabras:
+                nodo = 0
+                for caracter in sin_acentos(palabra):
+                    siguiente = self._transiciones[nodo].get(caracter)
+                    if siguiente is None:
+                        siguiente = len(self._transiciones)
+                        self._transiciones[nodo][caracter] = siguiente
+                        self._transiciones.append({})
+                        self._fallo.append(0)
+                        salidas.append(set())
+                    nodo = siguiente
+                salidas[nodo].add(nombre)
+
+        # Enlaces de fallo por BFS; cada nodo hereda las salidas de su enlace
+        cola = deque(self._transiciones[0].values())
+        while cola:
+            nodo = cola.popleft()
+            for caracter, hijo in self._transiciones[nodo].items():
+                cola.append(hijo)
+                fallo = self._fallo[nodo]
+                while fallo and caracter not in self._transiciones[fallo]:
+                    fallo = self._fallo[fallo]
+                destino = self._transiciones[fallo].get(caracter, 0)
+                self._fallo[hijo] = destino if destino != hijo else 0
+                salidas[hijo] |= salidas[self._fallo[hijo]]
+
+        self._salidas = [frozenset(s) for s in salidas]
+
+    def detectar(self, texto):
+        """Conjunto de intenciones presentes en el texto (ya sin tildes o no)."""
+        encontradas = set()
+        nodo = 0
+        transiciones = self._transiciones
+        for caracter in sin_acentos(texto):
+            while nodo and caracter not in transiciones[nodo]:
+                nodo = self._fallo[nodo]
+            nodo = transiciones[nodo].get(caracter, 0)
+            if self._salidas[nodo]:
+                encontradas |= self._salidas[nodo]
+        return encontradas
@@ -1,14 +1,59 @@
+import atexit
 import csv
 import os
+import sqlite3
 
-from src.catalogo_builder import construir_catalogo_desde_articulos
+from src.catalogo_builder import construir_catalogo_desde_articulos, usar_cache_descripciones
+from src.catalogo_compacto import TablaProductos
+from src.bandeja_ventas import BandejaVentas
 from src.database import DatabaseService
+from src.escritor_intereses import EscritorIntereses
+from src.indice_busqueda import SINONIMOS, IndiceProductos
+from src.sincronizacion import SincronizadorArticulos
+from src.texto import tokens
 
 
 class InventarioService:
     def __init__(self):
         self.db = DatabaseService()
         self.productos_backup = self._cargar_csv_respaldo()
+        # CATALOGO_MOTOR=compacto: productos por columnas en lugar de un dict por producto
+        self.fabrica_productos = TablaProductos if os.getenv("CATALOGO_MOTOR", "dict") == "compacto" else None
+        # CATALOGO_PROCESOS > 1: inventarios grandes se construyen con varios procesos
+        self.procesos_catalogo = int(os.getenv("CATALOGO_PROCESOS", 1))
+        # CATALOGO_VECTORIZADO=1: construcción por columnas con pandas (no es más rápida en general)
+        self.vectorizado_catalogo = os.getenv("CATALOGO_VECTORIZADO", "0") == "1"
+        self.sincronizador = SincronizadorArticulos(
+            self.db, self.fabrica_productos, self.procesos_catalogo, self.vectorizado_catalogo
+        )
+        # Descripciones: se generan al leerlas; con un máximo > 0 se guardan en una LRU acotada
+        usar_cache_descripciones(int(os.getenv("CATALOGO_DESCRIPCIONES_MAX", 0)))
+        self.escritor_intereses = EscritorIntereses(
+            self.db,
+            capacidad=int(os.getenv("INTERESES_COLA_MAX", 1000)),
+            tamano_lote=int(os.getenv("INTERESES_LOTE", 50)),
+            intervalo_flush=float(os.getenv("INTERESES_FLUSH_SEGUNDOS", 1.0)),
+        )
+        atexit.register(self.escritor_intereses.detener)
+        self.bandeja_ventas = BandejaVentas(
+            os.getenv("VENTAS_BANDEJA_RUTA", "data/ventas_pendientes.db"),
+            self._escribir_orden,
+            intervalo=float(os.getenv("VENTAS_REINTENTO_SEGUNDOS", 2.0)),
+            reintento_max=float(os.getenv("VENTAS_REINTENTO_MAX_SEGUNDOS", 300)),
+            max_intentos=int(os.getenv("VENTAS_MAX_INTENTOS", 50)),
+        )
+        atexit.register(self.bandeja_ventas.detener)
+        self.catalogos = None
+
+    def usar_catalogo(self, catalogos):
+        """Conecta el GestorCatalogo del bot para buscar en memoria antes que en MySQL."""
+        self.catalogos = catalogos
+
+    def _indice(self):
+        snapshot = self.catalogos.actual() if self.catalogos else None
+        if snapshot is None:
+            return None
+        return snapshot.derivado("indice_busqueda", IndiceProductos.desde_snapshot)
 
     def _cargar_csv_respaldo(self, filepath="data/inventario.csv"):
         productos = []
@@ -30,18 +75,34 @@ class InventarioService:
         return self.productos_backup
 
     def construir_catalogo_desde_bd(self):
-        """Genera el catálogo conversacional desde la tabla articulos."""
-        articulos = self.db.obtener_articulos()
-        if articulos:
-            return construir_catalogo_desde_articulos(articulos)
+        """
+        Genera el catálogo conversacional desde la tabla articulos.
+        Tras la primera carga solo se leen y reconstruyen los artículos que cambiaron.
+        """
+        catalogo = self.sincronizador.sincronizar()
+        if catalogo:
+            return catalogo
 
         if self.productos_backup:
-            return construir_catalogo_desde_articulos(self.productos_backup)
+            return construir_catalogo_desde_articulos(
+                self.productos_backup, self.fabrica_productos, self.procesos_catalogo,
+                self.vectorizado_catalogo,
+            )
 
         return None
 
-    def buscar_producto(self, consulta):
-        """Busca productos por nombre, referencia o categoría."""
+    def firma_catalogo(self):
+        """Firma de la tabla articulos; cambia cuando hay que reconstruir el catálogo."""
+        return self.db.firma_articulos()
+
+    def buscar_producto(self, consulta, limite=10):
+        """Busca productos por nombre, referencia, marca o categoría."""
+        indice = self._indice()
+        if indice:
+            resultados = indice.buscar(consulta, limite=limite)
+            if resultados:
+                return resultados
+
         db_resultados = self.db.obtener_articulos(consulta)
         if db_resultados:
             return db_resultados
@@ -50,16 +111,7 @@ class InventarioService:
         resultados = []
         consulta_lower = consulta.lower().strip()
 
-        sinonimos = {
-            "televisor": "tv",
-            "televisores": "tv",
-            "tele": "tv",
-            "nevera": "refrigera",
-            "refrigerador": "refrigera",
-            "refri": "refrigera",
-        }
-
-        for original, reemplazo in sinonimos.items():
+        for original, reemplazo in SINONIMOS.items():
             if original in consulta_lower:
                 consulta_lower = consulta_lower.replace(original, reemplazo)
 
@@ -76,9 +128,17 @@ class InventarioService:
 
         return resultados
 
+    def estadisticas(self):
+        """Métricas de MySQL (pool, circuito, spool), de la cola de intereses y de la bandeja de ventas."""
+        datos = self.db.estadisticas()
+        datos["intereses"] = self.escritor_intereses.metricas()
+        datos["ventas"] = self.bandeja_ventas.metricas()
+        return datos
+
     def registrar_interes(self, telefono, busqueda):
-        """Registra qué busca el cliente en MySQL."""
-        self.db.registrar_interes(telefono, busqueda)
+        """Encola qué busca el cliente; se escribe en MySQL por lotes en segundo plano."""
+        if not self.escritor_intereses.encolar(telefono, busqueda):
+            print(f"⚠️ Cola de intereses llena: se descarta '{busqueda}'")
 
     def crear_orden(
         self,
@@ -90,13 +150,49 @@ class InventarioService:
         nombre_producto=None,
         id_articulo=None,
     ):
-        """Crea una orden de venta en MySQL."""
+        """
+        Registra la orden en la bandeja local y responde sin esperar a MySQL;
+        la venta se escribe en segundo plano (ver _escribir_orden).
+        """
+        orden = {
+            "telefono": telefono,
+            "cliente": cliente,
+            "direccion": direccion,
+            "producto_info": producto_info,
+            "total": total,
+            "nombre_producto": nombre_producto,
+            "id_articulo": id_articulo,
+        }
+        try:
+            self.bandeja_ventas.registrar(orden)
+        except sqlite3.Error as e:
+            print(f"⚠️ Bandeja de ventas no disponible ({e}); se escribe directo en MySQL")
+            return self._escribir_orden(None, orden)
+        return True
+
+    def _escribir_orden(self, clave, orden):
+        """Resuelve el artículo y crea la venta en MySQL. Devuelve False si hay que reintentar."""
+        total = orden["total"]
+        nombre_producto = orden["nombre_producto"]
+        id_articulo = orden["id_articulo"]
+
         precio_monto = 0.0
         if isinstance(total, (int, float)):
             precio_monto = float(total)
 
         if id_articulo is None and nombre_producto:
-            resultados = self.db.obtener_articulos(nombre_producto)
+            # Solo un nombre idéntico (sin tildes ni mayúsculas): una búsqueda por
+            # relevancia podría asociar la venta a otro artículo con palabras en común
+            resultados = []
+            indice = self._indice()
+            if indice:
+                resultados = [p for p in indice.por_nombre(nombre_producto) if p.get("id_articulo")]
+            if not resultados:
+                buscados = tokens(nombre_producto)
+                resultados = [
+                    a for a in self.db.obtener_articulos(nombre_producto)
+                    if tokens(a.get("nombre")) == buscados
+                ]
             if resultados:
                 articulo = resultados[0]
                 id_articulo = articulo.get("id_articulo")
@@ -107,11 +203,11 @@ class InventarioService:
                     "detalle_ventas se registrará sin FK."
                 )
 
-        self.db.crear_venta(
-            telefono=telefono,
-            datos_cliente=f"Cliente: {cliente} - Dir/Datos: {direccion}",
-            producto_nombre=producto_info,
+        return self.db.crear_venta(
+            telefono=orden["telefono"],
+            datos_cliente=f"Cliente: {orden['cliente']} - Dir/Datos: {orden['direccion']}",
+            producto_nombre=orden["producto_info"],
             total_monto=precio_monto,
             id_articulo=id_articulo,
+            clave=clave,
         )
-        return True
@@ -0,0 +1,205 @@
+"""
+Consultas por rango de precio ("neveras de menos de 2 millones").
+
+- `interpretar_rango_precio` reconoce montos en pesos colombianos ("2 millones",
+  "1.500.000", "2M", "800 mil", "un millón y medio") y el rango que pide el
+  mensaje (menos de, más de, entre, alrededor de...).
+- `IndicePrecios` guarda, por categoría y para todo el catálogo, los precios
+  ordenados en un `array` y responde un rango con dos bisecciones. Solo entran
+  productos con referencia: es lo que el cliente escribe para elegir uno.
+"""
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from src.catalogo_builder import _formato_precio
+from src.indice_busqueda import iterar_productos
+
+# Montos sin unidad ni "$" más chicos que esto no se toman como precio ("2", "300")
+MIN_MONTO_SIN_UNIDAD = 10000
+
+_UNIDADES = {
+    "millones": 1_000_000, "millon": 1_000_000, "mill": 1_000_000, "palos": 1_000_000, "palo": 1_000_000,
+    "m": 1_000_000, "mil": 1_000, "k": 1_000, "cop": 1, "pesos": 1,
+}
+_PALABRAS_NUMERO = {"un": 1, "una": 1, "medio": 0.5}
+
+_MONTO = re.compile(
+    r"(?P<signo>\$\s*)?"
+    r"(?P<numero>\d+(?:[.,]\d+)*|\b(?:un|una|medio)\b)"
+    r"\s*(?P<unidad>millones|millon|mill|palos|palo|mil|cop|pesos|m|k)?\b"
+    r"(?P<medio>\s+y\s+medio\b)?"
+)
+
+# Expresiones de rango; decide la más cercana al monto
+_LIMITES = (
+    ("maximo", ("menos de", "por debajo de", "no mas de", "hasta", "maximo", "tope", "menor a", "menores a", "menor de",
+                "presupuesto")),
+    ("minimo", ("mas de", "desde", "minimo", "por encima de", "mayor a", "mayores a", "arriba de", "superior a")),
+    ("cerca", ("alrededor de", "cerca de", "aproximadamente", "aprox", "mas o menos")),
+)
+# "alrededor de 2 millones" -> entre 1,6 y 2,4 millones
+MARGEN_CERCA = 0.2
+# "entre 1 y 2 millones": el primer número queda sin unidad justo antes del segundo monto
+_DESDE_SIN_UNIDAD = re.compile(r"(?:entre|de)\s+(\d+(?:[.,]\d+)?)\s+(?:y|a)\s+$")
+# "de 800.000 a 1.200.000": dos montos unidos así ya son un rango explícito
+_ANTES_DE_PAR = re.compile(r"\b(?:entre|de|desde)\s*$")
+_ENTRE_PAR = re.compile(r"^\s*(?:y|a|al|hasta|-)\s*$")
+# "4k" es una resolución y "2m" pueden ser metros: estas unidades solo cuentan
+# tras "$", una expresión de rango ("hasta 2m") o el primer monto de un par
+_UNIDADES_AMBIGUAS = {"k", "m"}
+_ANTES_DE_UNIDAD_AMBIGUA = tuple(e for _, expresiones in _LIMITES for e in expresiones) + ("entre",)
+
+
+def _numero(texto):
+    """'1.500.000' -> 1500000, '1,5' -> 1.5, '2.5' -> 2.5."""
+    if texto in _PALABRAS_NUMERO:
+        return _PALABRAS_NUMERO[texto]
+    partes = re.split(r"[.,]", texto)
+    if len(partes) > 1 and all(len(p) == 3 for p in partes[1:]):
+        return int("".join(partes))  # separadores de miles
+    if len(partes) == 2:
+        return float(f"{partes[0]}.{partes[1]}")
+    return int(partes[0]) if len(partes) == 1 else None
+
+
+def montos_en(texto):
+    """
+    [(valor, inicio, fin, con_unidad, factor)] de los montos de dinero del texto
+    (sin tildes, minúsculas). `con_unidad`: trae "$" o una unidad ("mil",
+    "millones", "pesos"...); "1.500.000" solo no la trae. `factor`: valor de
+    esa unidad (1_000 para "mil"), 1 sin unidad.
+    """
+    montos = []
+    for m in _MONTO.finditer(texto):
+        valor = _numero(m.group("numero"))
+        unidad = m.group("unidad")
+        if unidad in _UNIDADES_AMBIGUAS and not _admite_unidad_ambigua(texto, m, montos):
+            unidad = None
+        if valor is None or (m.group("numero") in _PALABRAS_NUMERO and unidad not in ("millon", "millones", "mill")):
+            continue
+        con_unidad = bool(unidad or m.group("signo"))
+        factor = _UNIDADES[unidad] if unidad else 1
+        if unidad:
+            valor *= factor
+            if m.group("medio"):
+                valor += _UNIDADES[unidad] / 2
+        elif not con_unidad and valor < MIN_MONTO_SIN_UNIDAD:
+            continue
+        inicio = m.start()
+        # "1 millon 500 mil": el segundo monto completa al primero
+        if montos and montos[-1][0] >= 1_000_000 and valor < 1_000_000 and texto[montos[-1][2]:inicio].strip() in ("", "y"):
+            anterior = montos.pop()
+            valor, inicio, con_unidad, factor = anterior[0] + valor, anterior[1], True, anterior[4]
+        montos.append((valor, inicio, m.end(), con_unidad, factor))
+    return montos
+
+
+def _admite_unidad_ambigua(texto, m, montos):
+    """'$2m', 'hasta 2m' o el '2m' de 'entre 1m y 2m' son dinero; 'televisor 4k' no."""
+    if m.group("signo"):
+        return True
+    if texto[:m.start()].rstrip().endswith(_ANTES_DE_UNIDAD_AMBIGUA):
+        return True
+    return bool(montos) and montos[-1][3] and _ENTRE_PAR.match(texto[montos[-1][2]:m.start()]) is not None
+
+
+def _limite(antes):
+    """Tipo de la expresión de rango más cercana al monto ("no mas de" gana sobre "mas de"), o None."""
+    encontradas = [
+        (antes.rfind(e) + len(e), len(e), tipo)
+        for tipo, expresiones in _LIMITES for e in expresiones if e in antes
+    ]
+    return max(encontradas)[2] if encontradas else None
+
+
+def interpretar_rango_precio(texto):
+    """
+    (mínimo, máximo) en pesos que pide el mensaje, o None si no menciona un
+    monto. Un monto con unidad ("tengo 2 millones") se toma como presupuesto
+    máximo. Un número sin unidad (1500000, "1.500.000") cuenta solo junto a
+    "menos de", "entre"..., para no leer como precio un teléfono o una cédula.
+    """
+    montos = montos_en(texto)
+    if not montos:
+        return None
+    if len(montos) == 1:
+        desde = _DESDE_SIN_UNIDAD.search(texto[:montos[0][1]])
+        if desde and montos[0][3]:
+            # "entre 1 y 2 millones": el primero hereda la unidad del segundo
+            # ("entre 800 y 1200 mil" -> 800 mil); si así quedara por encima
+            # del segundo ("entre 800 y 1,2 millones"), se lee en miles
+            numero, segundo, factor = _numero(desde.group(1)), montos[0][0], montos[0][4]
+            for unidad in (factor, _UNIDADES["mil"]):
+                if numero * unidad <= segundo:
+                    montos.insert(0, (numero * unidad, desde.start(1), desde.end(1), True, unidad))
+                    break
+
+    if len(montos) >= 2:
+        antes = texto[:montos[0][1]]
+        par = _ANTES_DE_PAR.search(antes) and _ENTRE_PAR.match(texto[montos[0][2]:montos[1][1]])
+        if not (montos[0][3] or montos[1][3] or par or _limite(antes)):
+            return None
+        primero, segundo = montos[0][0], montos[1][0]
+        return min(primero, segundo), max(primero, segundo)
+
+    valor, inicio, _, con_unidad, _ = montos[0]
+    tipo = _limite(texto[:inicio])
+    if tipo is None and not con_unidad:
+        return None
+    if tipo == "minimo":
+        return valor, float("inf")
+    if tipo == "cerca":
+        return valor * (1 - MARGEN_CERCA), valor * (1 + MARGEN_CERCA)
+    return 0, valor
+
+
+def describir_rango(minimo, maximo):
+    """'hasta *$2.000.000 COP*', 'desde ...' o 'entre ... y ...'."""
+    if minimo <= 0:
+        return f"hasta *{_formato_precio(maximo)[0]}*"
+    if maximo == float("inf"):
+        return f"desde *{_formato_precio(minimo)[0]}*"
+    return f"entre *{_formato_precio(minimo)[0]}* y *{_formato_precio(maximo)[0]}*"
+
+
+class IndicePrecios:
+    """Productos disponibles, con precio y referencia, ordenados por precio por categoría y en total."""
+
+    def __init__(self, entradas):
+        # entradas: (clave_categoria, id_subcategoria, id_producto, producto)
+        por_categoria = defaultdict(list)
+        for clave, sid, pid, producto in entradas:
+            precio = producto.get("precio_num") or 0
+            # Sin referencia el cliente no podría elegirlo desde la respuesta
+            if precio > 0 and producto.get("disponible") is not False and producto.get("referencia"):
+                por_categoria[clave].append((precio, clave, sid, pid, producto))
+                por_categoria[None].append((precio, clave, sid, pid, producto))
+
+        self._precios = {}
+        self._productos = {}
+        for clave, lista in por_categoria.items():
+            lista.sort(key=lambda e: e[0])  # estable: a igual precio, el orden del catálogo
+            self._precios[clave] = array("d", (e[0] for e in lista))
+            self._productos[clave] = [e[1:] for e in lista]
+
+    @classmethod
+    def desde_snapshot(cls, snapshot):
+        return cls(iterar_productos(snapshot.catalogo))
+
+    def en_rango(self, minimo, maximo, categoria=None, limite=5):
+        """
+        Hasta `limite` productos con minimo <= precio <= maximo, como
+        (clave, sid, pid, producto). Con solo un tope (presupuesto) se
+        muestran los más cercanos a él; si no, desde el más barato.
+        """
+        precios = self._precios.get(categoria)
+        if not precios:
+            return []
+        inicio = bisect_left(precios, minimo)
+        fin = bisect_right(precios, maximo)
+        productos = self._productos[categoria]
+        if minimo <= 0:
+            return productos[max(inicio, fin - limite):fin][::-1]
+        return productos[inicio:min(fin, inicio + limite)]
@@ -0,0 +1,296 @@
+"""
+Almacenes de sesiones de conversación.
+
+- AlmacenSesionesMemoria (por defecto): OrderedDict ordenado por último
+  acceso; la más antigua siempre está al frente, así que expirar por
+  inactividad (TTL) y expulsar por tope (LRU) cuestan O(1) por sesión.
+- AlmacenSesionesSQLite: sesiones serializadas en un archivo SQLite
+  compartido por varios procesos (workers de gunicorn), con control de
+  concurrencia optimista por número de versión.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+class Sesion:
+    """
+    Estado compacto de una conversación. Solo guarda claves estables del
+    catálogo (nunca los nodos), así que no retiene versiones viejas del
+    catálogo y se serializa directamente.
+    """
+
+    __slots__ = (
+        "estado",
+        "categoria_clave",
+        "subcategoria_id",
+        "producto_id",
+        "id_articulo",
+        "metodo_pago",
+        "financiera",
+        "cedula_correo",
+        "pagina",
+    )
+
+    def __init__(self, **campos):
+        for campo in self.__slots__:
+            setattr(self, campo, campos.get(campo))
+        if self.estado is None:
+            self.estado = "INICIO"
+
+    def reiniciar(self):
+        self.__init__()
+
+    def a_dict(self):
+        """Dict compacto (sin campos vacíos) para almacenes externos."""
+        datos = {}
+        for campo in self.__slots__:
+            valor = getattr(self, campo)
+            if valor is not None:
+                datos[campo] = valor
+        return datos
+
+    @classmethod
+    def desde_dict(cls, datos):
+        return cls(**{k: v for k, v in datos.items() if k in cls.__slots__})
+
+    def __repr__(self):
+        return f"Sesion({self.a_dict()})"
+
+
+class ConflictoVersion(Exception):
+    """Otro proceso guardó la sesión después de que la leímos."""
+
+
+class AlmacenSesiones:
+    """
+    Interfaz de los almacenes de sesiones usados por Brain.
+    `guardar` se llama al terminar cada mensaje y puede lanzar ConflictoVersion.
+    """
+
+    def obtener(self, telefono):
+        raise NotImplementedError
+
+    def guardar(self, telefono, sesion):
+        raise NotImplementedError
+
+    def eliminar(self, telefono):
+        raise NotImplementedError
+
+    def estadisticas(self):
+        return {}
+
+    def __contains__(self, telefono):
+        return self.obtener(telefono) is not None
+
+
+class AlmacenSesionesMemoria(AlmacenSesiones):
+    def __init__(self, ttl=86400, max_sesiones=50000):
+        self.ttl = ttl
+        self.max_sesiones = max(1, int(max_sesiones))
+        self._datos = OrderedDict()  # telefono -> (sesion, ultimo_acceso)
+        self._lock = threading.Lock()
+        self._expiradas = 0
+        self._expulsadas = 0
+
+    def obtener(self, telefono):
+        """Sesión viva del teléfono (renovando su TTL) o None."""
+        ahora = time.monotonic()
+        with self._lock:
+            self._purgar(ahora)
+            entrada = self._datos.get(telefono)
+            if entrada is None:
+                return None
+            self._datos[telefono] = (entrada[0], ahora)
+            self._datos.move_to_end(telefono)
+            return entrada[0]
+
+    def guardar(self, telefono, sesion):
+        ahora = time.monotonic()
+        with self._lock:
+            self._datos[telefono] = (sesion, ahora)
+            self._datos.move_to_end(telefono)
+            self._purgar(ahora)
+            while len(self._datos) > self.max_sesiones:
+                self._datos.popitem(last=False)
+                self._expulsadas += 1
+
+    def eliminar(self, telefono):
+        with self._lock:
+            self._datos.pop(telefono, None)
+
+    def _purgar(self, ahora):
+        """Elimina desde el frente las sesiones inactivas por más del TTL (con lock)."""
+        if not self.ttl:
+            return
+        while self._datos:
+            ultimo_acceso = next(iter(self._datos.values()))[1]
+            if ahora - ultimo_acceso < self.ttl:
+                break
+            self._datos.popitem(last=False)
+            self._expiradas += 1
+
+    def __len__(self):
+        return len(self._datos)
+
+    def estadisticas(self):
+        with self._lock:
+            self._purgar(time.monotonic())
+            sesiones = [sesion for sesion, _ in self._datos.values()]
+            datos = {
+                "backend": "memoria",
+                "vivas": len(sesiones),
+                "max_sesiones": self.max_sesiones,
+                "ttl_s": self.ttl,
+                "expiradas": self._expiradas,
+                "expulsadas": self._expulsadas,
+            }
+        datos["memoria_bytes"] = sum(_tamano_sesion(sesion) for sesion in sesiones)
+        return datos
+
+
+class AlmacenSesionesSQLite(AlmacenSesiones):
+    """
+    Sesiones en SQLite (modo WAL) para compartirlas entre workers.
+
+    `serializar(sesion) -> dict` y `deserializar(dict) -> sesion` convierten la
+    sesión a un dict compacto apto para JSON. La versión leída en cada hilo se
+    recuerda para que `guardar` solo escriba si nadie más la modificó; se
+    olvida al guardar, así que cada `guardar` va precedido de su `obtener`
+    (un turno) y el dict no crece con cada teléfono atendido.
+    """
+
+    # Cada cuántas escrituras se borran las sesiones vencidas
+    _PURGAR_CADA = 500
+
+    def __init__(self, ruta, ttl=86400, serializar=None, deserializar=None):
+        self.ruta = ruta
+        self.ttl = ttl
+        self._serializar = serializar or (lambda sesion: sesion)
+        self._deserializar = deserializar or (lambda datos: datos)
+        self._local = threading.local()
+        self._escrituras = 0
+        self._conflictos = 0
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with self._conexion() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sesiones ("
+                "telefono TEXT PRIMARY KEY, datos TEXT NOT NULL, "
+                "version INTEGER NOT NULL, actualizado REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_sesiones_actualizado ON sesiones (actualizado)")
+
+    def _conexion(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.ruta, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.versiones = {}
+        return conn
+
+    def _versiones(self):
+        self._conexion()
+        return self._local.versiones
+
+    def obtener(self, telefono):
+        conn = self._conexion()
+        fila = conn.execute(
+            "SELECT datos, version FROM sesiones WHERE telefono = ? AND actualizado >= ?",
+            (telefono, self._vigentes_desde()),
+        ).fetchone()
+        if fila is None:
+            self._versiones().pop(telefono, None)
+            return None
+        self._versiones()[telefono] = fila[1]
+        return self._deserializar(json.loads(fila[0]))
+
+    def guardar(self, telefono, sesion):
+        datos = json.dumps(self._serializar(sesion), ensure_ascii=False, separators=(",", ":"))
+        versiones = self._versiones()
+        leida = versiones.pop(telefono, None)
+        ahora = time.time()
+        conn = self._conexion()
+        with conn:
+            if leida is None:
+                # Sesión nueva (o vencida): se crea o se pisa solo si estaba vencida
+                cursor = conn.execute(
+                    "INSERT INTO sesiones (telefono, datos, version, actualizado) VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT(telefono) DO UPDATE SET datos = excluded.datos, version = version + 1, "
+                    "actualizado = excluded.actualizado WHERE actualizado < ?",
+                    (telefono, datos, ahora, self._vigentes_desde()),
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE sesiones SET datos = ?, version = version + 1, actualizado = ? "
+                    "WHERE telefono = ? AND version = ?",
+                    (datos, ahora, telefono, leida),
+                )
+            if cursor.rowcount == 0:
+                self._conflictos += 1
+                raise ConflictoVersion(telefono)
+
+        self._escrituras += 1
+        if self.ttl and self._escrituras % self._PURGAR_CADA == 0:
+            with conn:
+                conn.execute("DELETE FROM sesiones WHERE actualizado < ?", (self._vigentes_desde(),))
+
+    def eliminar(self, telefono):
+        conn = self._conexion()
+        with conn:
+            conn.execute("DELETE FROM sesiones WHERE telefono = ?", (telefono,))
+        self._versiones().pop(telefono, None)
+
+    def _vigentes_desde(self):
+        return time.time() - self.ttl if self.ttl else 0
+
+    def estadisticas(self):
+        conn = self._conexion()
+        vivas, memoria = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(datos)), 0) FROM sesiones WHERE actualizado >= ?",
+            (self._vigentes_desde(),),
+        ).fetchone()
+        return {
+            "backend": "sqlite",
+            "vivas": vivas,
+            "ttl_s": self.ttl,
+            "memoria_bytes": memoria,
+            "conflictos": self._conflictos,
+        }
+
+
+def crear_almacen_sesiones(serializar=None, deserializar=None):
+    """Almacén según SESIONES_BACKEND (memoria | sqlite)."""
+    ttl = float(os.getenv("SESIONES_TTL", 86400))
+    backend = os.getenv("SESIONES_BACKEND", "memoria").lower()
+    if backend == "sqlite":
+        return AlmacenSesionesSQLite(
+            os.getenv("SESIONES_SQLITE_RUTA", "data/sesiones.db"),
+            ttl=ttl,
+            serializar=serializar,
+            deserializar=deserializar,
+        )
+    return AlmacenSesionesMemoria(ttl=ttl, max_sesiones=int(os.getenv("SESIONES_MAX", 50000)))
+
+
+def _tamano_sesion(sesion):
+    """
+    Bytes aproximados de una sesión: el contenedor y sus valores propios.
+    Los nodos del catálogo a los que pudiera apuntar son compartidos y no se cuentan.
+    """
+    if isinstance(sesion, Sesion):
+        valores = [getattr(sesion, campo) for campo in Sesion.__slots__]
+    elif isinstance(sesion, dict):
+        valores = sesion.values()
+    else:
+        valores = ()
+    return sys.getsizeof(sesion) + sum(
+        sys.getsizeof(v) for v in valores if isinstance(v, (str, int, float, type(None)))
+    )
@@ -0,0 +1,218 @@
+"""
+Sincronización incremental de la tabla `articulos` con el catálogo del bot.
+
+La primera carga lee la tabla completa. Después solo se traen las filas que
+cambiaron y se reconstruyen únicamente las categorías afectadas; los nodos de
+las demás categorías (y de las marcas sin cambios) se reutilizan tal cual.
+
+Detección de cambios:
+- con DB_ARTICULOS_COLUMNA_ACTUALIZACION: filas con esa columna mayor o igual
+  que la última marca de agua vista (más un conteo para detectar borrados).
+  Con DATETIME de resolución de segundos, una fila modificada en el mismo
+  segundo que la marca de agua no se pierde; las que vuelven sin cambios se
+  descartan por su crc;
+- sin ella: huella CRC32 por fila calculada en el servidor (id + crc).
+
+Entre sincronizaciones solo se guarda id -> (crc, categoría): las filas viven
+únicamente dentro de los productos del catálogo (con el motor compacto, por
+columnas). Una categoría afectada se rearma con las filas de sus productos
+actuales más las filas nuevas leídas de la BD.
+"""
+from array import array
+from collections import defaultdict
+
+from src.catalogo_builder import (
+    MIN_ARTICULOS_PARALELO,
+    _pandas,
+    construir_catalogo_vectorizado,
+    construir_categoria,
+    construir_categorias_en_paralelo,
+    ensamblar_catalogo,
+    marcas_de_categoria,
+    nombre_categoria,
+)
+
+# Tamaño máximo de cada `WHERE id_articulo IN (...)`
+LOTE_IDS = 500
+
+
+class SincronizadorArticulos:
+    def __init__(self, db, fabrica_productos=None, procesos=None, vectorizado=False):
+        self.db = db
+        self.fabrica_productos = fabrica_productos
+        self.procesos = procesos
+        self.vectorizado = vectorizado
+        self.catalogo = None
+        self._articulos = {}        # id_articulo -> (crc, nombre_categoria)
+        self._nodos = {}            # nombre_categoria -> nodo de catálogo
+        self._marcas = {}           # nombre_categoria -> {marca: (array de ids y crc, nodo)}
+        self._marca_agua = None
+        self.estadisticas = {"completas": 0, "incrementales": 0, "filas_cambiadas": 0, "categorias_reconstruidas": 0}
+
+    def sincronizar(self):
+        """Catálogo al día, o None si la BD no tiene artículos (o no responde en la primera carga)."""
+        if self.catalogo is None:
+            return self._sincronizacion_completa()
+
+        cambios = self._detectar_cambios()
+        if cambios is None:
+            return self.catalogo  # BD no disponible: se conserva lo último sincronizado
+
+        modificadas, eliminadas = cambios
+        if modificadas or eliminadas:
+            self._aplicar(modificadas, eliminadas)
+        return self.catalogo
+
+    def _sincronizacion_completa(self):
+        filas = self.db.obtener_articulos_sincronizacion()
+        if not filas:
+            return None
+
+        self._articulos.clear()
+        self._nodos.clear()
+        self._marcas.clear()
+        self._marca_agua = None
+        grupos = defaultdict(list)
+        for fila in filas:
+            fila = self._registrar_fila(fila)
+            grupos[nombre_categoria(fila)].append(fila)
+        grupos = {categoria: _por_id(articulos) for categoria, articulos in grupos.items()}
+
+        if self.procesos and self.procesos > 1 and len(filas) >= MIN_ARTICULOS_PARALELO:
+            self._construir_en_paralelo(grupos)
+        elif self.vectorizado and _pandas():
+            self._construir_vectorizado(grupos)
+        else:
+            for categoria, articulos in grupos.items():
+                self._construir_categoria(categoria, articulos)
+        self.catalogo = ensamblar_catalogo(self._nodos)
+        self.estadisticas["completas"] += 1
+        return self.catalogo
+
+    def _detectar_cambios(self):
+        """(filas modificadas o nuevas, ids eliminados) o None si falló la consulta."""
+        if self.db.columna_actualizacion and self._marca_agua is not None:
+            modificadas = self.db.obtener_articulos_sincronizacion(modificados_desde=self._marca_agua)
+            if modificadas is None:
+                return None
+            # Las filas del segundo de la marca de agua ya vistas vuelven con el mismo crc
+            modificadas = [
+                fila for fila in modificadas
+                if self._articulos.get(fila["id_articulo"], (None,))[0] != fila.get("crc_sync")
+            ]
+            firma = self.db.firma_articulos()
+            nuevos = sum(1 for fila in modificadas if fila["id_articulo"] not in self._articulos)
+            if firma is not None and firma[0] == len(self._articulos) + nuevos:
+                return modificadas, []
+            # El conteo no cuadra: hubo borrados, se ubican por huellas
+            huellas = self.db.obtener_huellas_articulos()
+            if huellas is None:
+                return None
+            return modificadas, [i for i in self._articulos if i not in huellas]
+
+        huellas = self.db.obtener_huellas_articulos()
+        if huellas is None:
+            return None
+
+        eliminadas = [i for i in self._articulos if i not in huellas]
+        cambiadas = [i for i, crc in huellas.items() if self._articulos.get(i, (None,))[0] != crc]
+        modificadas = []
+        for inicio in range(0, len(cambiadas), LOTE_IDS):
+            filas = self.db.obtener_articulos_sincronizacion(ids=cambiadas[inicio:inicio + LOTE_IDS])
+            if filas is None:
+                return None
+            modificadas.extend(filas)
+        return modificadas, eliminadas
+
+    def _registrar_fila(self, fila):
+        """Anota la huella y la categoría de la fila; devuelve la fila sin `crc_sync`."""
+        fila = dict(fila)
+        crc = fila.pop("crc_sync", None)
+        self._articulos[fila["id_articulo"]] = (crc, nombre_categoria(fila))
+
+        if self.db.columna_actualizacion:
+            valor = fila.get(self.db.columna_actualizacion)
+            if valor is not None and (self._marca_agua is None or valor > self._marca_agua):
+                self._marca_agua = valor
+        return fila
+
+    def _firma(self, articulos):
+        """Id y crc de cada artículo de una marca, en un solo array de enteros."""
+        firma = array("q")
+        for fila in articulos:
+            firma.append(fila["id_articulo"])
+            firma.append(self._articulos[fila["id_articulo"]][0] or 0)
+        return firma
+
+    def _aplicar(self, modificadas, eliminadas):
+        cambios = defaultdict(dict)  # nombre_categoria -> {id_articulo: fila nueva o None si sale}
+        for id_articulo in eliminadas:
+            previo = self._articulos.pop(id_articulo, None)
+            if previo is not None:
+                cambios[previo[1]][id_articulo] = None
+        for fila in modificadas:
+            previo = self._articulos.get(fila["id_articulo"])
+            fila = self._registrar_fila(fila)
+            if previo is not None and previo[1] != nombre_categoria(fila):
+                cambios[previo[1]][fila["id_articulo"]] = None
+            cambios[nombre_categoria(fila)][fila["id_articulo"]] = fila
+
+        for categoria, filas in cambios.items():
+            self._reconstruir_categoria(categoria, filas)
+
+        # Nuevo diccionario raíz: los snapshots anteriores no se modifican
+        self.catalogo = ensamblar_catalogo(self._nodos)
+        self.estadisticas["incrementales"] += 1
+        self.estadisticas["filas_cambiadas"] += len(modificadas) + len(eliminadas)
+        self.estadisticas["categorias_reconstruidas"] += len(cambios)
+
+    def _construir_en_paralelo(self, grupos):
+        nodos = construir_categorias_en_paralelo(grupos, self.procesos, self.fabrica_productos)
+        for categoria, nodo in nodos.items():
+            self._nodos[categoria] = nodo
+            self._marcas[categoria] = marcas_de_categoria(grupos[categoria], nodo, self._firma)
+
+    def _construir_vectorizado(self, grupos):
+        articulos = [fila for filas in grupos.values() for fila in filas]
+        for nodo in construir_catalogo_vectorizado(articulos, self.fabrica_productos).values():
+            categoria = nodo["nombre"]
+            self._nodos[categoria] = nodo
+            self._marcas[categoria] = marcas_de_categoria(grupos[categoria], nodo, self._firma)
+
+    def _construir_categoria(self, categoria, articulos):
+        nodo, marcas = construir_categoria(
+            categoria, articulos, self._marcas.get(categoria), self.fabrica_productos, self._firma
+        )
+        self._nodos[categoria] = nodo
+        self._marcas[categoria] = marcas
+
+    def _reconstruir_categoria(self, categoria, cambiadas):
+        """Rearma la categoría con las filas de sus productos vigentes y las `cambiadas`."""
+        filas = {
+            fila["id_articulo"]: fila
+            for fila in _filas_de_nodo(self._nodos.get(categoria))
+            if fila["id_articulo"] not in cambiadas
+        }
+        filas.update((i, fila) for i, fila in cambiadas.items() if fila is not None)
+        if not filas:
+            self._nodos.pop(categoria, None)
+            self._marcas.pop(categoria, None)
+            return
+        self._construir_categoria(categoria, _por_id(filas.values()))
+
+
+def _por_id(filas):
+    return sorted(filas, key=lambda fila: fila["id_articulo"])
+
+
+def _filas_de_nodo(nodo):
+    """
+    Filas de `articulos` de los productos de una categoría. El motor compacto
+    no guarda el precio original: se toma el ya normalizado del producto.
+    """
+    if nodo is None:
+        return
+    for subcategoria in nodo["subcategorias"].values():
+        for producto in subcategoria["productos"].values():
+            fila = producto.articulo
+            yield fila if "precio" in fila else dict(fila, precio=producto["precio_num"])
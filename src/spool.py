@@ -0,0 +1,142 @@
+"""
+Spool local y durable de escrituras pendientes para MySQL.
+
+Cuando la BD no está disponible, las escrituras se guardan como líneas JSON
+(una operación por línea, con fsync) y se reproducen cuando vuelve la conexión.
+
+Varios workers (gunicorn) comparten el archivo: escribir y apartarlo para
+reproducirlo se serializa con `flock` sobre `<ruta>.lock`, y la reproducción
+misma con `<ruta>.reproduciendo.lock`, así que un solo proceso la hace a la vez.
+
+Durante la reproducción, `<ruta>.reproduciendo.pos` guarda (con fsync) hasta qué
+byte del archivo apartado ya se ejecutó: si una operación falla a mitad de
+camino, la próxima reproducción sigue desde ahí y no repite las anteriores.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: solo el bloqueo entre hilos de un mismo proceso
+    fcntl = None
+
+
+@contextmanager
+def _bloqueo_archivo(ruta, esperar=True):
+    """flock exclusivo sobre `ruta`. Con esperar=False entrega False si otro proceso lo tiene."""
+    if fcntl is None:
+        yield True
+        return
+    with open(ruta, "a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | (0 if esperar else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _leer_progreso(ruta):
+    """Byte del archivo apartado hasta el que ya se reprodujo (0 si no hay registro)."""
+    try:
+        with open(ruta) as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _guardar_progreso(marca, posicion):
+    marca.seek(0)
+    marca.truncate()
+    marca.write(str(posicion))
+    marca.flush()
+    os.fsync(marca.fileno())
+
+
+class SpoolEscrituras:
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._lock_reproduccion = threading.Lock()
+
+    def guardar(self, operacion, *args):
+        linea = json.dumps({"op": operacion, "args": args}, ensure_ascii=False, default=str)
+        with self._lock:
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            with _bloqueo_archivo(self._ruta_bloqueo()), open(self.ruta, "a", encoding="utf-8") as f:
+                f.write(linea + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def pendientes(self):
+        total = 0
+        en_proceso = self._ruta_en_proceso()
+        for ruta, desde in ((self.ruta, 0), (en_proceso, _leer_progreso(en_proceso + ".pos"))):
+            if os.path.exists(ruta):
+                with open(ruta, "rb") as f:
+                    f.seek(desde)
+                    total += sum(1 for linea in f if linea.strip())
+        return total
+
+    def reproducir(self, ejecutar):
+        """
+        Ejecuta cada operación pendiente con `ejecutar(operacion, args)`.
+        El archivo se aparta antes de reproducirlo: si una operación vuelve a
+        fallar por falta de conexión, se guarda de nuevo en un spool limpio.
+        """
+        en_proceso = self._ruta_en_proceso()
+        if not (os.path.exists(self.ruta) or os.path.exists(en_proceso)):
+            return 0
+        if not self._lock_reproduccion.acquire(blocking=False):
+            return 0  # ya hay otra reproducción en curso en este proceso
+        try:
+            with _bloqueo_archivo(en_proceso + ".lock", esperar=False) as propio:
+                if not propio:
+                    return 0  # otro worker la está haciendo
+                return self._reproducir(ejecutar, en_proceso)
+        finally:
+            self._lock_reproduccion.release()
+
+    def _reproducir(self, ejecutar, en_proceso):
+        progreso = en_proceso + ".pos"
+        with self._lock, _bloqueo_archivo(self._ruta_bloqueo()):
+            if not os.path.exists(en_proceso):
+                if not os.path.exists(self.ruta):
+                    return 0
+                if os.path.exists(progreso):
+                    os.remove(progreso)  # de una reproducción anterior ya terminada
+                os.replace(self.ruta, en_proceso)
+
+        reproducidas = 0
+        posicion = _leer_progreso(progreso)
+        with open(en_proceso, "rb") as f, open(progreso, "a+") as marca:
+            f.seek(posicion)
+            for linea in f:
+                posicion += len(linea)
+                if linea.strip():
+                    try:
+                        registro = json.loads(linea)
+                    except ValueError:
+                        print(f"⚠️ Línea inválida en spool descartada: {linea.strip()[:80]!r}")
+                    else:
+                        ejecutar(registro["op"], registro["args"])
+                        reproducidas += 1
+                _guardar_progreso(marca, posicion)
+
+        # Primero el archivo: sin él, un .pos que quede se descarta en la próxima
+        os.remove(en_proceso)
+        os.remove(progreso)
+        return reproducidas
+
+    def _ruta_en_proceso(self):
+        return self.ruta + ".reproduciendo"
+
+    def _ruta_bloqueo(self):
+        return self.ruta + ".lock"
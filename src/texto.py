@@ -0,0 +1,25 @@
+"""
+Normalización de texto compartida por los índices del catálogo.
+"""
+import re
+import unicodedata
+
+_NO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+
+def sin_acentos(texto):
+    """Minúsculas y sin tildes: 'Televisión' -> 'television'."""
+    if not texto:
+        return ""
+    normalizado = unicodedata.normalize("NFKD", str(texto).lower())
+    return "".join(c for c in normalizado if not unicodedata.combining(c))
+
+
+def tokens(texto):
+    """Palabras alfanuméricas sin tildes de un texto."""
+    return [t for t in _NO_ALFANUMERICO.split(sin_acentos(texto)) if t]
+
+
+def referencia_normalizada(texto):
+    """Referencia comparable sin mayúsculas, espacios ni guiones: '55NU-855 bpsa' -> '55nu855bpsa'."""
+    return "".join(tokens(texto))
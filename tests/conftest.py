@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def archivos_locales_en_tmp(monkeypatch, tmp_path):
+    """Brain()/InventarioService() no escriben la bandeja de ventas ni el spool dentro del repo."""
+    monkeypatch.setenv("VENTAS_BANDEJA_RUTA", str(tmp_path / "ventas_pendientes.db"))
+    monkeypatch.setenv("DB_SPOOL_RUTA", str(tmp_path / "spool_escrituras.jsonl"))
@@ -0,0 +1,87 @@
+import threading
+
+from src.archivo_catalogo import ArchivoCatalogo
+from src.catalogo_builder import construir_catalogo_desde_articulos
+from src.catalogo_compacto import TablaProductos
+from src.gestor_catalogo import GestorCatalogo, SnapshotCatalogo
+from src.indice_busqueda import iterar_productos
+
+ARTICULOS = [
+    {"id_articulo": 1, "nombre": "Nevera 300L", "marca": "LG", "categoria": "Neveras",
+     "referencia": "GT32", "precio": 1899900.5, "estado": "Disponible"},
+    {"id_articulo": 2, "nombre": None, "marca": None, "categoria": "Neveras",
+     "referencia": "", "precio": None, "estado": "Agotado"},
+    {"id_articulo": None, "nombre": "Televisor 50\" ñandú", "marca": "Samsung", "categoria": "Televisores",
+     "referencia": "UN50", "precio": 2500000, "estado": None},
+]
+
+
+def test_snapshot_en_disco_conserva_el_catalogo(tmp_path):
+    archivo = ArchivoCatalogo(str(tmp_path / "catalogo.snap"))
+    for fabrica in (None, TablaProductos):
+        catalogo = construir_catalogo_desde_articulos(ARTICULOS, fabrica_productos=fabrica)
+        assert archivo.guardar(SnapshotCatalogo(7, catalogo, "bd", firma=(3, 2)))
+
+        leido = archivo.cargar()
+        assert (leido.version, leido.origen, leido.firma) == (7, "bd", (3, 2))
+        assert leido.catalogo == catalogo
+        for (_, _, _, esperado), (_, _, _, producto) in zip(iterar_productos(catalogo), iterar_productos(leido.catalogo)):
+            assert dict(producto) == dict(esperado)
+
+
+def test_snapshot_corrupto_o_de_respaldo_se_descarta(tmp_path):
+    ruta = tmp_path / "catalogo.snap"
+    archivo = ArchivoCatalogo(str(ruta))
+    catalogo = construir_catalogo_desde_articulos(ARTICULOS)
+
+    assert not archivo.guardar(SnapshotCatalogo(1, catalogo, "respaldo"))
+    assert archivo.cargar() is None
+
+    archivo.guardar(SnapshotCatalogo(1, catalogo, "bd"))
+    datos = bytearray(ruta.read_bytes())
+    datos[-3] ^= 0xFF
+    ruta.write_bytes(bytes(datos))
+    assert archivo.cargar() is None
+
+
+def test_gestor_arranca_desde_el_archivo_y_recarga_en_segundo_plano(tmp_path):
+    archivo = ArchivoCatalogo(str(tmp_path / "catalogo.snap"))
+    catalogo = construir_catalogo_desde_articulos(ARTICULOS)
+    # El archivo se escribe en segundo plano; detener() escribe lo pendiente
+    GestorCatalogo(lambda actual: (catalogo, "bd"), intervalo_cambios=0, archivo=archivo).detener()
+
+    cargas = []
+    gestor = GestorCatalogo(lambda actual: cargas.append(actual) or (catalogo, "bd"), intervalo_cambios=0, archivo=archivo)
+    assert gestor.desde_archivo and not cargas
+    assert gestor.actual().catalogo == catalogo
+
+    gestor.iniciar()
+    gestor.detener()
+    assert len(cargas) == 1
+    assert gestor.actual().version == 2
+    assert archivo.cargar().version == 2
+
+
+def test_refrescos_seguidos_escriben_el_archivo_fuera_del_lock_y_espaciados(tmp_path):
+    catalogo = construir_catalogo_desde_articulos(ARTICULOS)
+    escrituras = []
+    liberar = threading.Event()
+
+    class ArchivoLento(ArchivoCatalogo):
+        def guardar(self, snapshot):
+            liberar.wait(2)
+            escrituras.append(snapshot.version)
+            return True
+
+    gestor = GestorCatalogo(lambda actual: (dict(catalogo), "bd"), intervalo_cambios=0,
+                            archivo=ArchivoLento(str(tmp_path / "catalogo.snap")), intervalo_archivo=60)
+    # Mientras se escribe la versión 1, los refrescos no esperan al disco
+    for _ in range(3):
+        gestor.refrescar(forzar=True)
+    assert gestor.actual().version == 4 and escrituras == []
+
+    liberar.set()
+    gestor.detener()
+    # Los snapshots pendientes se reemplazan: dentro del intervalo se escribe a lo
+    # sumo la versión que el hilo ya había tomado y, al detener, la última
+    assert escrituras in ([1, 4], [4])
@@ -0,0 +1,66 @@
+import threading
+
+from src.bandeja_ventas import BandejaVentas
+
+
+def test_reintenta_con_la_misma_clave_hasta_escribir(tmp_path):
+    intentos = []
+    escrita = threading.Event()
+
+    def escribir(clave, orden):
+        intentos.append((clave, orden["producto"]))
+        if len(intentos) == 1:
+            raise ConnectionError("MySQL caído")
+        escrita.set()
+        return True
+
+    bandeja = BandejaVentas(str(tmp_path / "ventas.db"), escribir, intervalo=0.01, reintento_max=0.05)
+    clave = bandeja.registrar({"producto": "Nevera Haceb"})
+
+    assert escrita.wait(2)
+    bandeja.detener()
+    assert intentos == [(clave, "Nevera Haceb"), (clave, "Nevera Haceb")]
+    metricas = bandeja.metricas()
+    assert metricas["escritas"] == 1
+    assert metricas["reintentos"] == 1
+    assert metricas["pendientes"] == 0
+
+
+def test_ordenes_no_escritas_sobreviven_al_reinicio(tmp_path):
+    ruta = str(tmp_path / "ventas.db")
+    bandeja = BandejaVentas(ruta, lambda clave, orden: False, intervalo=60)
+    clave = bandeja.registrar({"producto": "TV 50"})
+    bandeja.detener()
+    assert bandeja.pendientes() == 1
+
+    escritas = []
+    reiniciada = BandejaVentas(ruta, lambda clave, orden: escritas.append(clave) or True, intervalo=60)
+    reiniciada.detener()
+    # La orden sigue en espera exponencial: se fuerza el vencimiento
+    with reiniciada._conexion() as conn:
+        conn.execute("UPDATE ventas_pendientes SET proximo_intento = 0")
+    assert reiniciada.procesar_pendientes() == 1
+    assert escritas == [clave]
+
+
+def test_orden_que_siempre_falla_pasa_a_fallidas_tras_max_intentos(tmp_path):
+    intentos = []
+
+    def escribir(clave, orden):
+        intentos.append(clave)
+        raise ValueError("id_articulo inválido")
+
+    bandeja = BandejaVentas(str(tmp_path / "ventas.db"), escribir, intervalo=60, max_intentos=3)
+    bandeja.detener()
+    clave = bandeja.registrar({"producto": "Nevera Haceb"})
+    for _ in range(5):
+        with bandeja._conexion() as conn:
+            conn.execute("UPDATE ventas_pendientes SET proximo_intento = 0")
+        bandeja.procesar_pendientes()
+
+    assert intentos == [clave] * 3
+    metricas = bandeja.metricas()
+    assert (metricas["pendientes"], metricas["fallidas"]) == (0, 1)
+    assert (metricas["reintentos"], metricas["descartadas"]) == (2, 1)
+    fila = bandeja._conexion().execute("SELECT clave, intentos, error FROM ventas_fallidas").fetchone()
+    assert fila == (clave, 3, "id_articulo inválido")
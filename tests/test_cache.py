@@ -0,0 +1,25 @@
+from src.cache import CacheLRU
+
+
+def test_expulsa_la_entrada_menos_usada():
+    cache = CacheLRU(max_entradas=2, ttl=0)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    cache.obtener("a")
+    cache.guardar("c", 3)
+
+    assert cache.obtener("b") is None
+    assert cache.obtener("a") == 1
+    assert cache.obtener("c") == 3
+
+
+def test_las_entradas_expiran_por_ttl(monkeypatch):
+    reloj = [100.0]
+    monkeypatch.setattr("src.cache.time.monotonic", lambda: reloj[0])
+    cache = CacheLRU(ttl=10)
+    cache.guardar("300", 42)
+
+    assert cache.obtener("300") == 42
+    reloj[0] += 11
+    assert cache.obtener("300") is None
+    assert len(cache) == 0
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from src import catalogo_builder
+from src.catalogo import CATALOGO
+from src.indice_busqueda import iterar_productos
+from src.catalogo_builder import IndiceAlias, construir_catalogo_desde_articulos, construir_catalogo_paralelo
+
+
+def test_indice_alias_exacto_sin_tildes_y_parcial():
+    indice = IndiceAlias(CATALOGO)
+
+    assert indice.buscar("tv")[0] == "televisor"
+    assert indice.buscar("  TELEVISIÓN ")[0] == "televisor"
+    assert indice.buscar("nevecon")[0] == indice.buscar("nevecón")[0]
+    # nombre de la categoría contenido en el mensaje
+    clave, item = indice.buscar("quiero ver " + CATALOGO["lavadora"]["nombre"].lower())
+    assert clave == "lavadora" and item is CATALOGO["lavadora"]
+    assert indice.buscar("zzzz") == (None, None)
+
+
+def test_descripciones_se_generan_al_leerlas_y_se_memorizan(monkeypatch):
+    generadas = []
+    original = catalogo_builder._descripcion_corta
+
+    def contar(*args):
+        generadas.append(args[0]["id_articulo"])
+        return original(*args)
+
+    monkeypatch.setitem(catalogo_builder._RENDERIZADORES, "descripcion_corta", contar)
+    articulos = [{"id_articulo": i, "nombre": f"Nevera {i}", "marca": "LG", "categoria": "Neveras",
+                  "referencia": f"R{i}", "precio": 1000000, "estado": None} for i in range(1, 4)]
+    catalogo = construir_catalogo_desde_articulos(articulos)
+    assert generadas == []
+
+    producto = catalogo["neveras"]["subcategorias"]["1"]["productos"]["2"]
+    texto = producto["descripcion_corta"]
+    assert producto.get("descripcion_corta") is texto
+    assert "*Nevera 2*" in texto and generadas == [2]
+
+
+def test_cache_lru_de_descripciones_se_comparte_entre_versiones(monkeypatch):
+    monkeypatch.setattr(catalogo_builder, "_cache_descripciones", None)
+    catalogo_builder.usar_cache_descripciones(10)
+    articulo = {"id_articulo": 1, "nombre": "TV", "marca": "LG", "categoria": "TV",
+                "referencia": "X", "precio": 10, "estado": None}
+    v1 = construir_catalogo_desde_articulos([articulo])
+    v2 = construir_catalogo_desde_articulos([dict(articulo)])
+
+    amplia = v1["tv"]["subcategorias"]["1"]["productos"]["1"]["descripcion_amplia"]
+    assert v2["tv"]["subcategorias"]["1"]["productos"]["1"]["descripcion_amplia"] is amplia
+
+    v3 = construir_catalogo_desde_articulos([dict(articulo, precio=20)])
+    assert "$20 COP" in v3["tv"]["subcategorias"]["1"]["productos"]["1"]["descripcion_amplia"]
+
+
+def test_construccion_en_paralelo_conserva_orden_y_numeracion():
+    articulos = [{"id_articulo": i, "nombre": f"Modelo {i % 7}-{i}", "marca": ["LG", "Haceb", None][i % 3],
+                  "categoria": ["Neveras", "TV", "Lavadoras", "Neveras "][i % 4], "referencia": f"R{i}",
+                  "precio": i * 1000, "estado": None} for i in range(60)]
+
+    assert construir_catalogo_paralelo(articulos, procesos=2) == construir_catalogo_desde_articulos(articulos)
+
+
+def test_construccion_vectorizada_equivale_a_la_de_filas():
+    pytest.importorskip("pandas")
+    rnd = random.Random(19)
+    articulos = [
+        {
+            "id_articulo": i,
+            "nombre": rnd.choice(["Nevera B", "nevera a", "TV 50", "", None, "Ñandú 3000"]),
+            "marca": rnd.choice(["LG", "lg", " Haceb", None, "", "Samsung"]),
+            "categoria": rnd.choice(["Neveras", "Neveras ", "televisores", None, "Línea blanca"]),
+            "referencia": f"R{i}",
+            "precio": rnd.choice([1899900.5, 0, -5, None, "no aplica", "1500000", 2500, 2500.5]),
+            "estado": rnd.choice([None, "", "Agotado", " SIN STOCK ", "Disponible"]),
+        }
+        for i in range(400)
+    ]
+    del articulos[3]["estado"], articulos[7]["precio"]
+
+    esperado = construir_catalogo_desde_articulos(articulos)
+    obtenido = catalogo_builder.construir_catalogo_vectorizado(articulos)
+    assert list(iterar_productos(obtenido)) == list(iterar_productos(esperado))
+    assert obtenido == esperado
@@ -0,0 +1,68 @@
+import pytest
+
+from src.catalogo_builder import construir_catalogo_desde_articulos, construir_catalogo_vectorizado
+from src.catalogo_compacto import ProductoCompacto, TablaProductos
+from src.indice_busqueda import IndiceProductos, iterar_productos
+
+ARTICULOS = [
+    {"id_articulo": 1, "nombre": "Nevera 300L", "marca": "LG", "categoria": "Neveras",
+     "referencia": "GT32", "precio": 1899900.5, "estado": "Disponible"},
+    {"id_articulo": 2, "nombre": None, "marca": None, "categoria": "Neveras",
+     "referencia": None, "precio": None, "estado": "Agotado"},
+    {"id_articulo": 3, "nombre": "TV 50 UHD", "marca": "Samsung", "categoria": "Televisores",
+     "referencia": "UN50", "precio": "no aplica", "estado": None},
+]
+
+
+def test_motor_compacto_equivale_al_motor_de_dicts():
+    normal = construir_catalogo_desde_articulos(ARTICULOS)
+    compacto = construir_catalogo_desde_articulos(ARTICULOS, fabrica_productos=TablaProductos)
+
+    entradas_normal = list(iterar_productos(normal))
+    entradas_compacto = list(iterar_productos(compacto))
+    assert [e[:3] for e in entradas_compacto] == [e[:3] for e in entradas_normal]
+    for (_, _, _, esperado), (_, _, _, producto) in zip(entradas_normal, entradas_compacto):
+        assert isinstance(producto, ProductoCompacto)
+        assert dict(producto) == esperado
+        assert list(producto) == list(esperado)
+
+
+def test_tabla_se_consulta_como_el_dict_de_productos():
+    productos = TablaProductos(ARTICULOS[:2])
+
+    assert list(productos) == ["1", "2"]
+    assert "1" in productos and "3" not in productos
+    assert "01" not in productos and 1 not in productos
+    assert productos.get("9") is None
+    assert productos["1"]["precio_num"] == 1899900.5
+    assert productos["2"]["id_articulo"] == 2
+    assert productos["2"].get("disponible") is False
+
+
+def test_indice_de_busqueda_sobre_catalogo_compacto():
+    compacto = construir_catalogo_desde_articulos(ARTICULOS, fabrica_productos=TablaProductos)
+    resultados = IndiceProductos.desde_catalogo(compacto).buscar("un50")
+    assert [p["id_articulo"] for p in resultados] == [3]
+
+
+def test_construccion_vectorizada_del_motor_compacto():
+    pytest.importorskip("pandas")
+    articulos = [dict(a, id_articulo=i) for i, a in enumerate(ARTICULOS * 40)]
+    esperado = construir_catalogo_desde_articulos(articulos, fabrica_productos=TablaProductos)
+    obtenido = construir_catalogo_vectorizado(articulos, fabrica_productos=TablaProductos)
+    assert obtenido == esperado
+
+
+def test_descripciones_se_generan_una_vez_por_fila(monkeypatch):
+    from src import catalogo_builder
+
+    generadas = []
+    original = catalogo_builder._RENDERIZADORES["descripcion_corta"]
+    monkeypatch.setitem(catalogo_builder._RENDERIZADORES, "descripcion_corta",
+                        lambda *args: generadas.append(args[0]["nombre"]) or original(*args))
+    productos = TablaProductos(ARTICULOS[:2])
+
+    texto = productos["1"]["descripcion_corta"]
+    assert productos["1"]["descripcion_corta"] is texto
+    assert productos["2"]["descripcion_corta"] != texto
+    assert generadas == ["Nevera 300L", None]
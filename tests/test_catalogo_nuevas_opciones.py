@@ -1,6 +1,6 @@
 import unittest
 
-from src.catalogo import CATALOGO
+from src.catalogo import CATALOGO, RUTA_CATALOGO_RESPALDO, CatalogoPerezoso, obtener_categoria_por_alias
 
 
 class CatalogoNuevasOpcionesTest(unittest.TestCase):
@@ -27,6 +27,15 @@ class CatalogoNuevasOpcionesTest(unittest.TestCase):
         self.assertIn("Congelador Horizontal Electrolux (EFH70S3CSAV)", nombres_congeladores)
         self.assertIn("Congelador Horizontal Inducol Industrial (CH-DPB350BL1)", nombres_congeladores)
 
+    def test_catalogo_de_respaldo_se_lee_en_el_primer_acceso(self):
+        catalogo = CatalogoPerezoso(RUTA_CATALOGO_RESPALDO)
+        self.assertIn("sin cargar", repr(catalogo))
+
+        self.assertEqual(list(catalogo), list(CATALOGO))
+        self.assertIs(catalogo["nevera"], catalogo["nevera"])
+        self.assertNotIn("sin cargar", repr(catalogo))
+        self.assertEqual(obtener_categoria_por_alias("nevecon")[0], "nevera")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -18,3 +18,198 @@ def test_respuesta_fija_para_consultas_fuera_del_flujo(monkeypatch):
     assert 'no puedo resolver tu duda' in respuesta['texto'].lower()
     assert 'asesor' in respuesta['texto'].lower()
     assert 'pronto se comunicará' in respuesta['texto'].lower()
+
+
+def test_menus_se_memorizan_por_version_de_catalogo(monkeypatch):
+    brain = Brain()
+
+    snapshot = brain.catalogos.actual()
+    menu = brain._menu_bienvenida(snapshot)
+    assert brain._menu_bienvenida(snapshot) is menu
+
+    catalogo_nuevo = dict(brain.catalogo)
+    monkeypatch.setattr(brain.inventario, 'construir_catalogo_desde_bd', lambda: catalogo_nuevo)
+    brain.recargar_catalogo()
+    assert brain._menu_bienvenida(brain.catalogos.actual()) is not menu
+    assert brain._menu_bienvenida(brain.catalogos.actual()) == menu
+    assert brain._menu_bienvenida(snapshot) is menu
+
+
+def test_recarga_a_mitad_del_turno_no_cambia_el_menu_de_la_respuesta(monkeypatch):
+    from src.catalogo_builder import construir_catalogo_desde_articulos
+
+    articulos = [{"id_articulo": 1, "nombre": "Nevera 300L", "marca": "LG", "categoria": "Neveras", "precio": 1000000}]
+    brain = Brain()
+    monkeypatch.setattr(brain.inventario, 'construir_catalogo_desde_bd',
+                        lambda: construir_catalogo_desde_articulos(articulos))
+    brain.recargar_catalogo()
+
+    # La recarga se publica mientras se procesa el saludo
+    saltar_a_referencia = brain._saltar_a_referencia
+
+    def recargar_y_seguir(turno):
+        articulos.append({"id_articulo": 2, "nombre": "Lavadora 18kg", "marca": "LG", "categoria": "Lavadoras",
+                          "precio": 1500000})
+        brain.recargar_catalogo()
+        return saltar_a_referencia(turno)
+
+    monkeypatch.setattr(brain, '_saltar_a_referencia', recargar_y_seguir)
+    respuesta = brain.procesar_mensaje('hola', '3000000007')
+
+    assert 'Neveras' in respuesta['texto'] and 'Lavadoras' not in respuesta['texto']
+    assert 'Lavadoras' in brain._menu_bienvenida(brain.catalogos.actual())
+
+
+def test_flujo_con_sesiones_en_sqlite(monkeypatch, tmp_path):
+    monkeypatch.setenv('SESIONES_BACKEND', 'sqlite')
+    monkeypatch.setenv('SESIONES_SQLITE_RUTA', str(tmp_path / 'sesiones.db'))
+    worker_a = Brain()
+    worker_b = Brain()
+    for brain in (worker_a, worker_b):
+        monkeypatch.setattr(brain.inventario, 'registrar_interes', lambda *args, **kwargs: None)
+
+    worker_a.procesar_mensaje('hola', '3000000000')
+    worker_b.procesar_mensaje('1', '3000000000')
+    respuesta = worker_a.procesar_mensaje('1', '3000000000')
+
+    assert 'modelos disponibles' in respuesta['texto']
+
+
+def test_conflicto_de_version_no_duplica_la_orden(monkeypatch, tmp_path):
+    from src.catalogo_builder import construir_catalogo_desde_articulos
+
+    monkeypatch.setenv('SESIONES_BACKEND', 'sqlite')
+    monkeypatch.setenv('SESIONES_SQLITE_RUTA', str(tmp_path / 'sesiones.db'))
+    articulos = [{"id_articulo": 1, "nombre": "Nevera 300L", "marca": "LG", "categoria": "Neveras", "precio": 1000000}]
+    ordenes, intereses = [], []
+    worker_a, worker_b = Brain(), Brain()
+    for brain in (worker_a, worker_b):
+        monkeypatch.setattr(brain.inventario, 'registrar_interes', lambda *args: intereses.append(args))
+        monkeypatch.setattr(brain.inventario, 'crear_orden', lambda **datos: ordenes.append(datos))
+        monkeypatch.setattr(brain.inventario, 'construir_catalogo_desde_bd',
+                            lambda: construir_catalogo_desde_articulos(articulos))
+        brain.recargar_catalogo()
+
+    for mensaje in ('hola', '1', '1', '1', 'contado'):
+        worker_a.procesar_mensaje(mensaje, '3000000005')
+    assert len(intereses) == 3
+
+    # Mientras B procesa la cédula y el correo, A recibe el mismo mensaje y guarda primero
+    guardar_b = worker_b.sesiones.guardar
+
+    def guardar_tras_a(telefono, sesion):
+        if not ordenes:
+            worker_a.procesar_mensaje('cliente@correo.com', telefono)
+        guardar_b(telefono, sesion)
+
+    monkeypatch.setattr(worker_b.sesiones, 'guardar', guardar_tras_a)
+    respuesta_b = worker_b.procesar_mensaje('cliente@correo.com', '3000000005')
+
+    assert len(ordenes) == 1
+    assert 'ya está registrada' in respuesta_b['texto']
+    assert len(intereses) == 3
+
+
+def test_sesion_se_relocaliza_por_id_articulo_tras_recargar(monkeypatch):
+    from src.catalogo_builder import construir_catalogo_desde_articulos
+
+    articulos = [
+        {"id_articulo": 10, "nombre": "Nevera B", "marca": "LG", "categoria": "Neveras", "precio": 1000000},
+        {"id_articulo": 11, "nombre": "Nevera C", "marca": "LG", "categoria": "Neveras", "precio": 1200000},
+    ]
+    brain = Brain()
+    monkeypatch.setattr(brain.inventario, 'registrar_interes', lambda *args, **kwargs: None)
+    monkeypatch.setattr(brain.inventario, 'construir_catalogo_desde_bd',
+                        lambda: construir_catalogo_desde_articulos(articulos))
+    brain.recargar_catalogo()
+
+    for mensaje in ('hola', 'neveras', '1', '2'):
+        brain.procesar_mensaje(mensaje, '3000000000')
+    assert brain.sesiones.obtener('3000000000').id_articulo == 11
+
+    # Un artículo nuevo corre la numeración de "Nevera C"
+    articulos.append({"id_articulo": 12, "nombre": "Nevera A", "marca": "LG", "categoria": "Neveras", "precio": 900000})
+    brain.recargar_catalogo()
+
+    respuesta = brain.procesar_mensaje('contado', '3000000000')
+    assert 'Nevera C' in respuesta['texto']
+    assert brain.sesiones.obtener('3000000000').producto_id == '3'
+
+
+def test_referencia_lleva_directo_al_producto(monkeypatch):
+    from src.catalogo_builder import construir_catalogo_desde_articulos
+
+    articulos = [
+        {"id_articulo": 20, "nombre": "TV 50 UHD", "marca": "LG", "categoria": "Televisores",
+         "referencia": "50UQ7500", "precio": 1800000},
+        {"id_articulo": 21, "nombre": "TV 55 NanoCell", "marca": "LG", "categoria": "Televisores",
+         "referencia": "55NU855BPSA", "precio": 2500000},
+    ]
+    brain = Brain()
+    monkeypatch.setattr(brain.inventario, 'registrar_interes', lambda *args, **kwargs: None)
+    monkeypatch.setattr(brain.inventario, 'crear_orden', lambda *args, **kwargs: True)
+    monkeypatch.setattr(brain.inventario, 'construir_catalogo_desde_bd',
+                        lambda: construir_catalogo_desde_articulos(articulos))
+    brain.recargar_catalogo()
+
+    respuesta = brain.procesar_mensaje('¿Tienen el 55nu-855 bpsa? cuánto cuesta', '3000000002')
+    assert 'Has seleccionado: *TV 55 NanoCell*' in respuesta['texto']
+    session = brain.sesiones.obtener('3000000002')
+    assert (session.estado, session.id_articulo) == ('MOSTRANDO_PRODUCTO', 21)
+
+    respuesta = brain.procesar_mensaje('contado', '3000000002')
+    assert 'TV 55 NanoCell' in respuesta['texto']
+    # En la cédula/correo el texto no se interpreta como referencia
+    respuesta = brain.procesar_mensaje('50UQ7500', '3000000002')
+    assert 'Pedido registrado' in respuesta['texto']
+
+
+def test_menu_de_productos_paginado(monkeypatch):
+    from src.catalogo_builder import construir_catalogo_desde_articulos
+
+    monkeypatch.setenv('MENU_TAMANO_PAGINA', '10')
+    articulos = [
+        {"id_articulo": i, "nombre": f"Nevera modelo {i:02d}", "marca": "LG", "categoria": "Neveras",
+         "precio": 1000000 + i}
+        for i in range(1, 26)
+    ]
+    brain = Brain()
+    monkeypatch.setattr(brain.inventario, 'registrar_interes', lambda *args, **kwargs: None)
+    monkeypatch.setattr(brain.inventario, 'construir_catalogo_desde_bd',
+                        lambda: construir_catalogo_desde_articulos(articulos))
+    brain.recargar_catalogo()
+
+    for mensaje in ('hola', 'neveras'):
+        brain.procesar_mensaje(mensaje, '3000000003')
+    primera = brain.procesar_mensaje('1', '3000000003')['texto']
+    assert '10. Nevera modelo 10' in primera and '11. ' not in primera
+    assert 'Página 1 de 3' in primera
+
+    segunda = brain.procesar_mensaje('ver más', '3000000003')['texto']
+    assert '11. Nevera modelo 11' in segunda and 'Página 2 de 3' in segunda
+    tercera = brain.procesar_mensaje('siguiente', '3000000003')['texto']
+    assert '25. Nevera modelo 25' in tercera
+    assert brain.procesar_mensaje('siguiente', '3000000003')['texto'] == tercera
+    assert brain.procesar_mensaje('anterior', '3000000003')['texto'] == segunda
+
+    # La numeración es global: se puede elegir un producto de otra página
+    respuesta = brain.procesar_mensaje('23', '3000000003')
+    assert 'Has seleccionado: *Nevera modelo 23*' in respuesta['texto']
+
+
+def test_reinicio_guarda_la_sesion_una_sola_vez(monkeypatch, tmp_path):
+    monkeypatch.setenv('SESIONES_BACKEND', 'sqlite')
+    monkeypatch.setenv('SESIONES_SQLITE_RUTA', str(tmp_path / 'sesiones.db'))
+    brain = Brain()
+    monkeypatch.setattr(brain.inventario, 'registrar_interes', lambda *args, **kwargs: None)
+    brain.procesar_mensaje('hola', '3000000006')
+    brain.procesar_mensaje('1', '3000000006')
+
+    escrituras = []
+    guardar = brain.sesiones.guardar
+    monkeypatch.setattr(brain.sesiones, 'guardar', lambda *args: escrituras.append(args) or guardar(*args))
+    respuesta = brain.procesar_mensaje('inicio', '3000000006')
+
+    assert 'Bienvenido' in respuesta['texto']
+    assert len(escrituras) == 1
+    assert brain.sesiones.obtener('3000000006').estado == 'SELECCIONANDO_CATEGORIA'
@@ -0,0 +1,119 @@
+import os
+
+import pytest
+
+from src import circuito
+from src.circuito import CircuitBreaker
+from src.spool import SpoolEscrituras
+
+
+def test_circuito_abre_falla_rapido_y_cierra_tras_prueba(monkeypatch):
+    reloj = [0.0]
+    monkeypatch.setattr(circuito.time, "monotonic", lambda: reloj[0])
+    cerrados = []
+    breaker = CircuitBreaker(umbral_fallos=2, tiempo_apertura=30, al_cerrar=lambda: cerrados.append(True))
+
+    for _ in range(2):
+        assert breaker.permitir()
+        breaker.registrar_fallo()
+    assert breaker.estado == circuito.ABIERTO
+    assert not breaker.permitir()
+
+    reloj[0] = 31
+    assert breaker.permitir()          # única llamada de prueba
+    assert breaker.estado == circuito.SEMI_ABIERTO
+    assert not breaker.permitir()
+
+    breaker.registrar_exito()
+    assert breaker.estado == circuito.CERRADO
+    assert cerrados == [True]
+    assert breaker.estadisticas()["rechazadas"] == 2
+
+
+def test_prueba_fallida_vuelve_a_abrir(monkeypatch):
+    reloj = [0.0]
+    monkeypatch.setattr(circuito.time, "monotonic", lambda: reloj[0])
+    breaker = CircuitBreaker(umbral_fallos=1, tiempo_apertura=10)
+    breaker.registrar_fallo()
+
+    reloj[0] = 11
+    assert breaker.permitir()
+    breaker.registrar_fallo()
+    assert breaker.estado == circuito.ABIERTO
+    assert not breaker.permitir()
+
+
+def test_spool_reproduce_y_reencola_lo_que_vuelve_a_fallar(tmp_path):
+    spool = SpoolEscrituras(str(tmp_path / "spool.jsonl"))
+    spool.guardar("crear_venta", "300", "datos", "Nevera", 1500000.0, 12)
+    spool.guardar("registrar_intereses_lote", [["300", "Categoría: TV", "2026-01-01 10:00:00"]])
+    assert spool.pendientes() == 2
+
+    ejecutadas = []
+
+    def ejecutar(operacion, args):
+        ejecutadas.append(operacion)
+        if operacion == "crear_venta":
+            spool.guardar(operacion, *args)  # la BD volvió a caerse
+
+    assert spool.reproducir(ejecutar) == 2
+    assert ejecutadas == ["crear_venta", "registrar_intereses_lote"]
+    assert spool.pendientes() == 1
+
+
+def test_spool_interrumpido_sigue_desde_la_ultima_operacion_escrita(tmp_path):
+    spool = SpoolEscrituras(str(tmp_path / "spool.jsonl"))
+    for i in range(4):
+        spool.guardar("crear_venta", i)
+
+    ejecutadas = []
+
+    def ejecutar_hasta_la_tercera(operacion, args):
+        if args[0] == 2:
+            raise ConnectionError("MySQL se cayó a mitad de la reproducción")
+        ejecutadas.append(args[0])
+
+    with pytest.raises(ConnectionError):
+        spool.reproducir(ejecutar_hasta_la_tercera)
+    assert ejecutadas == [0, 1]
+    assert spool.pendientes() == 2
+
+    spool.guardar("crear_venta", 4)  # llega mientras tanto a un spool nuevo
+    assert spool.reproducir(lambda operacion, args: ejecutadas.append(args[0])) == 2
+    assert spool.reproducir(lambda operacion, args: ejecutadas.append(args[0])) == 1
+    assert ejecutadas == [0, 1, 2, 3, 4]
+    assert spool.pendientes() == 0
+    assert sorted(os.listdir(tmp_path)) == ["spool.jsonl.lock", "spool.jsonl.reproduciendo.lock"]
+
+
+def _reproducir_en_otro_proceso(ruta, salida):
+    import time
+
+    def ejecutar(operacion, args):
+        time.sleep(0.01)
+        with open(salida, "a") as f:
+            f.write(f"{args[0]}\n")
+
+    SpoolEscrituras(ruta).reproducir(ejecutar)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requiere fork y flock")
+def test_spool_se_reproduce_una_sola_vez_entre_procesos(tmp_path):
+    import multiprocessing
+
+    ruta = str(tmp_path / "spool.jsonl")
+    salida = str(tmp_path / "escritas.txt")
+    spool = SpoolEscrituras(ruta)
+    for i in range(20):
+        spool.guardar("crear_venta", i)
+
+    contexto = multiprocessing.get_context("fork")
+    workers = [contexto.Process(target=_reproducir_en_otro_proceso, args=(ruta, salida)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=10)
+
+    with open(salida) as f:
+        assert sorted(int(linea) for linea in f) == list(range(20))
+    assert spool.pendientes() == 0
@@ -0,0 +1,54 @@
+from src.catalogo_builder import construir_catalogo_desde_articulos
+from src.cerebro import Brain
+from src.coincidencia_difusa import IndiceDifuso, distancia_acotada
+
+OPCIONES = [
+    ("1", "Nevera No Frost 300L", ("LG", "GT32BPP")),
+    ("2", "Nevecón Side by Side", ("Samsung", "RS27T5200")),
+    ("3", "Televisión 55\" UHD", ("Samsung", "UN55AU7000")),
+]
+
+
+def test_distancia_acotada_con_transposiciones():
+    assert distancia_acotada("samsumg", "samsung", 2) == 1
+    assert distancia_acotada("nevrea", "nevera", 1) == 1
+    assert distancia_acotada("neveraa", "nevera", 1) == 1
+    assert distancia_acotada("lavadora", "nevera", 2) == 3
+
+
+def test_subcadena_primero_y_luego_aproximada():
+    indice = IndiceDifuso(OPCIONES)
+
+    # subcadena sobre el nombre plegado: gana la primera opción del menú
+    assert indice.buscar("side by") == "2"
+    assert indice.buscar("NEVECON") == "2"
+    assert indice.buscar("television") == "3"
+    assert indice.buscar("ne") == "1"
+    # errores de digitación en nombre, marca o referencia
+    assert indice.buscar("neveraa") == "1"
+    assert indice.buscar("samsumg uhd") == "3"
+    assert indice.buscar("un55au7000") == "3"
+    # códigos con dígitos solo coinciden exactos
+    assert indice.buscar("un55au7001") is None
+    # palabras cortas no se aproximan
+    assert indice.buscar("la de") is None
+    assert indice.buscar("lavadora") is None
+
+
+def test_flujo_acepta_marca_con_errores(monkeypatch):
+    articulos = [
+        {"id_articulo": 1, "nombre": "Nevera 300L", "marca": "LG", "categoria": "Neveras", "precio": 1000000},
+        {"id_articulo": 2, "nombre": "Nevecón 600L", "marca": "Samsung", "categoria": "Neveras", "precio": 3000000},
+    ]
+    brain = Brain()
+    monkeypatch.setattr(brain.inventario, 'registrar_interes', lambda *args, **kwargs: None)
+    monkeypatch.setattr(brain.inventario, 'construir_catalogo_desde_bd',
+                        lambda: construir_catalogo_desde_articulos(articulos))
+    brain.recargar_catalogo()
+
+    for mensaje in ('hola', 'neveras'):
+        brain.procesar_mensaje(mensaje, '3000000001')
+    respuesta = brain.procesar_mensaje('samsumg', '3000000001')
+    assert 'Nevecón 600L' in respuesta['texto']
+    respuesta = brain.procesar_mensaje('nevecon 600', '3000000001')
+    assert 'Has seleccionado: *Nevecón 600L*' in respuesta['texto']
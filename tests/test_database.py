@@ -0,0 +1,248 @@
+import threading
+
+from src import circuito
+from src.database import DatabaseService, PoolConexiones
+from src.spool import SpoolEscrituras
+
+
+class CursorFalso:
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.lastrowid = None
+        self.rowcount = 1
+        self.fila = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql, params=None):
+        if self.conexion.fallar_en and sql.startswith(self.conexion.fallar_en):
+            raise RuntimeError("fallo simulado")
+        self.conexion.consultas.append(sql)
+        self.lastrowid = self.conexion.siguiente_id
+        self.rowcount = 1
+        if sql.startswith("INSERT IGNORE INTO ventas_idempotencia"):
+            self.rowcount = 0 if params[0] in self.conexion.claves else 1
+            self.conexion.claves.add(params[0])
+        if "information_schema.tables" in sql:
+            self.fila = {"total": int(self.conexion.hay_tabla_idempotencia)}
+
+    def fetchone(self):
+        return self.fila
+
+    def executemany(self, sql, filas):
+        self.conexion.consultas.append(sql)
+
+
+class ConexionFalsa:
+    def __init__(self):
+        self.cerrada = False
+        self.ping_ok = True
+        self.consultas = []
+        self.siguiente_id = 7
+        self.claves = set()
+        self.hay_tabla_idempotencia = True
+        self.transacciones = []
+        self.fallar_en = None
+
+    def cursor(self, *args, **kwargs):
+        return CursorFalso(self)
+
+    def begin(self):
+        self.transacciones.append("begin")
+
+    def commit(self):
+        self.transacciones.append("commit")
+
+    def rollback(self):
+        self.transacciones.append("rollback")
+
+    def ping(self, reconnect=False):
+        if not self.ping_ok:
+            raise ConnectionError("conexion caida")
+
+    def close(self):
+        self.cerrada = True
+
+
+def test_pool_reutiliza_conexiones_y_respeta_el_maximo():
+    creadas = []
+
+    def fabrica():
+        conn = ConexionFalsa()
+        creadas.append(conn)
+        return conn
+
+    pool = PoolConexiones(fabrica, tamano_max=2, timeout_espera=0.05)
+    a = pool.obtener()
+    b = pool.obtener()
+    assert a is not b
+    assert pool.obtener() is None  # pool agotado: espera y falla rápido
+
+    pool.devolver(a)
+    assert pool.obtener() is a
+    assert len(creadas) == 2
+
+    stats = pool.estadisticas()
+    assert stats["en_uso"] == 2
+    assert stats["timeouts"] == 1
+
+
+def test_pool_descarta_conexiones_que_fallan_el_health_check():
+    pool = PoolConexiones(ConexionFalsa, tamano_max=1, intervalo_ping=0,
+                          validar=lambda c: c.ping_ok)
+    conn = pool.obtener()
+    conn.ping_ok = False
+    pool.devolver(conn)
+
+    nueva = pool.obtener()
+    assert nueva is not conn
+    assert conn.cerrada
+    assert pool.estadisticas()["descartadas"] == 1
+
+
+def test_pool_recicla_conexiones_inactivas():
+    pool = PoolConexiones(ConexionFalsa, tamano_max=1, max_inactividad=0)
+    conn = pool.obtener()
+    pool.devolver(conn)
+
+    assert pool.obtener() is not conn
+    assert conn.cerrada
+    assert pool.estadisticas()["recicladas"] == 1
+
+
+def test_pool_despierta_a_hilos_en_espera():
+    pool = PoolConexiones(ConexionFalsa, tamano_max=1, timeout_espera=2)
+    conn = pool.obtener()
+    obtenida = []
+    hilo = threading.Thread(target=lambda: obtenida.append(pool.obtener()))
+    hilo.start()
+    pool.devolver(conn)
+    hilo.join(timeout=2)
+
+    assert obtenida == [conn]
+    assert pool.estadisticas()["esperas"] == 1
+
+
+def test_llamadas_anidadas_comparten_una_conexion(monkeypatch):
+    db = DatabaseService()
+    monkeypatch.setattr(db.pool, "_fabrica", ConexionFalsa)
+
+    with db._conexion() as externa:
+        with db._conexion() as interna:
+            assert interna is externa
+        assert db.pool.estadisticas()["en_uso"] == 1
+
+    assert db.pool.estadisticas()["en_uso"] == 0
+    assert db.pool.estadisticas()["creadas"] == 1
+
+
+def test_pool_agotado_no_abre_el_circuito(monkeypatch, tmp_path):
+    db = DatabaseService()
+    monkeypatch.setattr(db, "_crear_conexion", ConexionFalsa)
+    monkeypatch.setattr(db, "driver", "pymysql")
+    monkeypatch.setattr(db, "spool", SpoolEscrituras(str(tmp_path / "spool.jsonl")))
+    monkeypatch.setattr(db, "pool", PoolConexiones(db._conectar, tamano_max=1, timeout_espera=0.01))
+    reproducciones = []
+    monkeypatch.setattr(db, "_reproducir_spool_en_segundo_plano", lambda: reproducciones.append(True))
+
+    ocupada = db.pool.obtener()
+    for _ in range(db.circuito.umbral_fallos + 1):
+        with db._conexion() as conn:
+            assert conn is None
+    assert db.circuito.estado == circuito.CERRADO
+
+    # Lo que fue al spool por el pool agotado se reproduce al volver a haber conexión
+    assert db.registrar_intereses_lote([("300", "Categoría: TV", "2026-01-01 10:00:00")]) == 1
+    db.pool.devolver(ocupada)
+    with db._conexion() as conn:
+        assert conn is ocupada
+    assert reproducciones == [True]
+
+
+def test_fallos_al_conectar_abren_el_circuito(monkeypatch):
+    db = DatabaseService()
+    monkeypatch.setattr(db, "_crear_conexion", lambda: None)
+
+    for _ in range(db.circuito.umbral_fallos):
+        with db._conexion() as conn:
+            assert conn is None
+    assert db.circuito.estado == circuito.ABIERTO
+
+
+def test_cliente_recurrente_no_consulta_la_bd(monkeypatch):
+    db = DatabaseService()
+    conn = ConexionFalsa()
+    monkeypatch.setattr(db.pool, "_fabrica", lambda: conn)
+
+    assert db.obtener_o_crear_cliente("3001112233") == 7
+    assert len(conn.consultas) == 1
+    assert "ON DUPLICATE KEY UPDATE" in conn.consultas[0]
+
+    assert db.obtener_o_crear_cliente("3001112233") == 7
+    assert len(conn.consultas) == 1
+
+    # Con datos nuevos solo se actualiza el cliente ya conocido
+    db.obtener_o_crear_cliente("3001112233", direccion="Calle 5")
+    assert conn.consultas[-1].startswith("UPDATE clientes")
+
+
+def test_venta_con_clave_no_se_duplica_al_reintentar(monkeypatch):
+    db = DatabaseService()
+    conn = ConexionFalsa()
+    monkeypatch.setattr(db.pool, "_fabrica", lambda: conn)
+
+    assert db.crear_venta("3001112233", "Calle 5", "Nevera", 1500000.0, id_articulo=3, clave="abc")
+    assert db.crear_venta("3001112233", "Calle 5", "Nevera", 1500000.0, id_articulo=3, clave="abc")
+
+    ventas = [sql for sql in conn.consultas if sql.startswith("INSERT INTO ventas ")]
+    assert len(ventas) == 1
+    assert conn.transacciones == ["begin", "commit", "begin", "commit"]
+    # La tabla se revisa una sola vez y se purgan las claves vencidas tras la primera venta
+    assert sum("information_schema" in sql for sql in conn.consultas) == 1
+    assert sum(sql.startswith("DELETE FROM ventas_idempotencia") for sql in conn.consultas) == 1
+    assert not any(sql.startswith("CREATE TABLE") for sql in conn.consultas)
+
+
+def test_venta_sin_tabla_de_idempotencia_se_escribe_y_avisa(monkeypatch, capsys):
+    db = DatabaseService()
+    conn = ConexionFalsa()
+    conn.hay_tabla_idempotencia = False
+    monkeypatch.setattr(db.pool, "_fabrica", lambda: conn)
+
+    assert db.crear_venta("3001112233", "Calle 5", "Nevera", 1500000.0, id_articulo=3, clave="abc")
+    assert db.crear_venta("3001112233", "Calle 5", "Nevera", 1500000.0, id_articulo=4, clave="def")
+
+    assert "Falta la tabla 'ventas_idempotencia'" in capsys.readouterr().out
+    assert sum("information_schema" in sql for sql in conn.consultas) == 1
+    assert not any("ventas_idempotencia" in sql for sql in conn.consultas if "information_schema" not in sql)
+    assert sum(sql.startswith("INSERT INTO ventas ") for sql in conn.consultas) == 2
+
+
+def test_venta_completa_en_una_transaccion_y_una_conexion(monkeypatch):
+    db = DatabaseService()
+    conn = ConexionFalsa()
+    monkeypatch.setattr(db.pool, "_fabrica", lambda: conn)
+
+    assert db.crear_venta("3001112233", "Calle 5", "Nevera", 1500000.0, id_articulo=3)
+
+    assert db.pool.estadisticas()["creadas"] == 1
+    assert [sql.split(" (")[0] for sql in conn.consultas] == [
+        "INSERT INTO clientes", "INSERT INTO ventas", "INSERT INTO detalle_ventas",
+    ]
+    assert conn.transacciones == ["begin", "commit"]
+    assert db._clientes.obtener("3001112233") == 7
+
+
+def test_fallo_en_detalle_revierte_la_venta_sin_cachear_el_cliente(monkeypatch):
+    db = DatabaseService()
+    conn = ConexionFalsa()
+    conn.fallar_en = "INSERT INTO detalle_ventas"
+    monkeypatch.setattr(db.pool, "_fabrica", lambda: conn)
+
+    assert not db.crear_venta("3001112233", "Calle 5", "Nevera", 1500000.0, id_articulo=3)
+    assert conn.transacciones == ["begin", "rollback"]
+    assert db._clientes.obtener("3001112233") is None
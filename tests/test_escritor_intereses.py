@@ -0,0 +1,55 @@
+import threading
+
+from src.escritor_intereses import EscritorIntereses
+
+
+class DBFalsa:
+    def __init__(self):
+        self.lotes = []
+        self.escrito = threading.Event()
+
+    def registrar_intereses_lote(self, filas):
+        self.lotes.append([(telefono, termino) for telefono, termino, _ in filas])
+        self.escrito.set()
+        return len(filas)
+
+
+def test_agrupa_por_tamano_de_lote():
+    db = DBFalsa()
+    escritor = EscritorIntereses(db, tamano_lote=3, intervalo_flush=60)
+    for i in range(3):
+        assert escritor.encolar("300", f"Producto {i}")
+
+    assert db.escrito.wait(2)
+    assert db.lotes == [[("300", "Producto 0"), ("300", "Producto 1"), ("300", "Producto 2")]]
+    escritor.detener()
+
+
+def test_apagado_ordenado_escribe_lo_pendiente():
+    db = DBFalsa()
+    escritor = EscritorIntereses(db, tamano_lote=100, intervalo_flush=60)
+    escritor.encolar("300", "Categoría: Neveras")
+    escritor.encolar("301", "Categoría: Televisores")
+    escritor.detener()
+
+    assert sum(len(lote) for lote in db.lotes) == 2
+    metricas = escritor.metricas()
+    assert metricas["escritos"] == 2
+    assert metricas["profundidad"] == 0
+
+
+def test_cola_llena_descarta_y_lo_reporta():
+    bloqueo = threading.Event()
+
+    class DBLenta(DBFalsa):
+        def registrar_intereses_lote(self, filas):
+            bloqueo.wait(2)
+            return super().registrar_intereses_lote(filas)
+
+    escritor = EscritorIntereses(DBLenta(), capacidad=1, tamano_lote=1, intervalo_flush=60)
+    resultados = [escritor.encolar("300", f"p{i}") for i in range(5)]
+    bloqueo.set()
+    escritor.detener()
+
+    assert resultados.count(False) >= 1
+    assert escritor.metricas()["descartados"] == resultados.count(False)
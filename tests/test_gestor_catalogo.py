@@ -0,0 +1,43 @@
+from src.gestor_catalogo import GestorCatalogo
+
+
+def test_refresco_solo_reconstruye_si_cambia_la_firma():
+    estado = {"firma": (10, 10), "cargas": 0}
+
+    def cargador(actual):
+        estado["cargas"] += 1
+        return {"tv": {"nombre": f"TV v{estado['cargas']}"}}, "bd"
+
+    gestor = GestorCatalogo(cargador, firma=lambda: estado["firma"], intervalo_cambios=0)
+    primero = gestor.actual()
+    assert primero.version == 1
+
+    assert gestor.refrescar() is primero
+    assert estado["cargas"] == 1
+
+    estado["firma"] = (11, 11)
+    segundo = gestor.refrescar()
+    assert segundo.version == 2
+    assert segundo.catalogo["tv"]["nombre"] == "TV v2"
+    # el snapshot anterior no se modifica
+    assert primero.catalogo["tv"]["nombre"] == "TV v1"
+
+
+def test_cargador_puede_conservar_el_snapshot_vigente():
+    respuestas = [({"a": {}}, "bd"), None]
+    gestor = GestorCatalogo(lambda actual: respuestas.pop(0), intervalo_cambios=0)
+    primero = gestor.actual()
+
+    assert gestor.refrescar(forzar=True) is primero
+
+
+def test_derivados_se_calculan_una_vez_por_snapshot():
+    gestor = GestorCatalogo(lambda actual: ({"a": {}}, "bd"), intervalo_cambios=0)
+    llamadas = []
+    fabrica = lambda snap: llamadas.append(snap.version) or len(llamadas)
+
+    snap = gestor.actual()
+    assert snap.derivado("indice", fabrica) == snap.derivado("indice", fabrica)
+    nuevo = gestor.refrescar(forzar=True)
+    nuevo.derivado("indice", fabrica)
+    assert llamadas == [1, 2]
@@ -0,0 +1,52 @@
+import time
+
+from src.catalogo import CATALOGO
+from src.catalogo_builder import construir_catalogo_desde_articulos
+from src.indice_busqueda import IndiceProductos
+
+ARTICULOS = [
+    {"id_articulo": 1, "nombre": "Televisor LG 55 UHD", "marca": "LG", "categoria": "Televisores",
+     "referencia": "55NU855BPSA", "precio": 2500000},
+    {"id_articulo": 2, "nombre": "Nevera Samsung 300L", "marca": "Samsung", "categoria": "Neveras",
+     "referencia": "RT29K", "precio": 1800000},
+    {"id_articulo": 3, "nombre": "Televisor Samsung 50", "marca": "Samsung", "categoria": "Televisores",
+     "referencia": "UN50CU", "precio": 2100000},
+]
+
+
+def test_rankea_por_terminos_cubiertos():
+    indice = IndiceProductos.desde_catalogo(construir_catalogo_desde_articulos(ARTICULOS))
+
+    resultados = indice.buscar("televisor samsung")
+    assert resultados[0]["id_articulo"] == 3
+    assert {p["id_articulo"] for p in resultados} == {1, 2, 3}
+
+    assert indice.buscar("55nu855bpsa")[0]["id_articulo"] == 1
+    assert indice.buscar("samsu")[0]["marca"] == "Samsung"  # prefijo
+    assert indice.buscar("xyz") == []
+
+
+def test_busqueda_en_catalogo_de_respaldo_es_submilisegundo():
+    indice = IndiceProductos.desde_catalogo(CATALOGO)
+    assert indice.buscar("nevecón midea")[0]["nombre"] == "Nevecón Midea MDR700FGM45CO2"
+
+    inicio = time.perf_counter()
+    for _ in range(100):
+        indice.buscar("televisor lg")
+    assert (time.perf_counter() - inicio) / 100 < 0.001
+
+
+def test_por_nombre_solo_acepta_el_nombre_exacto():
+    articulos = [
+        {"id_articulo": 4, "nombre": "TV LG 55", "marca": "LG", "categoria": "Televisores", "precio": 2500000},
+        {"id_articulo": 9, "nombre": "Televisor LG Full HD (32\")", "marca": "LG", "categoria": "Televisores",
+         "precio": 900000},
+    ]
+    indice = IndiceProductos.desde_catalogo(construir_catalogo_desde_articulos(articulos))
+
+    assert [p["id_articulo"] for p in indice.por_nombre("televisor lg full hd 32")] == [9]
+    assert [p["id_articulo"] for p in indice.por_nombre("TV LG 55")] == [4]
+    # Palabras en común, prefijos o sinónimos no bastan
+    assert indice.por_nombre("Televisor LG Full HD (43\")") == []
+    assert indice.por_nombre("TV LG") == []
+    assert indice.por_nombre("televisor lg 55") == []
@@ -0,0 +1,35 @@
+import random
+
+from src.intenciones import DetectorIntenciones
+from src.texto import sin_acentos
+
+INTENCIONES = {
+    "fuera_flujo": ["precio", "cuánto", "iva", "información", "envío"],
+    "mas_info": ["mas info", "más información", "detalles", "amplia"],
+    "financiado": ["financia", "crédito", "cuotas"],
+    "sumaspay": ["3", "sumaspay", "sumas pay"],
+    "solapadas": ["he", "she", "hers", "his"],
+}
+
+
+def test_detecta_todas_las_intenciones_sin_tildes():
+    detector = DetectorIntenciones(INTENCIONES)
+
+    assert detector.detectar("¿Cuánto cuesta el IVA?") == {"fuera_flujo"}
+    assert detector.detectar("quiero MÁS INFORMACIÓN") == {"fuera_flujo", "mas_info"}
+    assert detector.detectar("a credito con sumas pay") == {"financiado", "sumaspay"}
+    assert detector.detectar("ushers") == {"solapadas"}
+    assert detector.detectar("") == set()
+
+
+def test_equivale_a_buscar_cada_palabra_como_subcadena():
+    detector = DetectorIntenciones(INTENCIONES)
+    alfabeto = "aeiouhrsnfc3 "
+    rnd = random.Random(7)
+    for _ in range(500):
+        texto = "".join(rnd.choice(alfabeto) for _ in range(rnd.randint(0, 20)))
+        esperado = {
+            nombre for nombre, palabras in INTENCIONES.items()
+            if any(sin_acentos(p) in texto for p in palabras)
+        }
+        assert detector.detectar(texto) == esperado, texto
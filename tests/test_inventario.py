@@ -0,0 +1,44 @@
+from src.catalogo_builder import construir_catalogo_desde_articulos
+from src.gestor_catalogo import GestorCatalogo
+from src.inventario import InventarioService
+
+ARTICULOS = [
+    {"id_articulo": 4, "nombre": "TV LG 55", "marca": "LG", "categoria": "Televisores", "precio": 2500000},
+    {"id_articulo": 9, "nombre": "Televisor LG Full HD (32\")", "marca": "LG", "categoria": "Televisores",
+     "precio": 900000},
+]
+
+
+def _inventario(monkeypatch, filas_bd):
+    inventario = InventarioService()
+    ventas = []
+    monkeypatch.setattr(inventario.db, "obtener_articulos", lambda termino=None: filas_bd)
+    monkeypatch.setattr(inventario.db, "crear_venta", lambda **datos: ventas.append(datos) or True)
+    return inventario, ventas
+
+
+def _orden(nombre_producto):
+    return {"telefono": "3001112233", "cliente": "Ana", "direccion": "Calle 5", "producto_info": nombre_producto,
+            "total": 900000, "nombre_producto": nombre_producto, "id_articulo": None}
+
+
+def test_la_venta_solo_se_asocia_a_un_articulo_con_el_mismo_nombre(monkeypatch):
+    inventario, ventas = _inventario(monkeypatch, [])
+    catalogos = GestorCatalogo(lambda actual: (construir_catalogo_desde_articulos(ARTICULOS), "bd"),
+                               intervalo_cambios=0)
+    inventario.usar_catalogo(catalogos)
+
+    assert inventario._escribir_orden("a", _orden("Televisor LG Full HD (32\")"))
+    # Comparte "LG" y el sinónimo de televisor con "TV LG 55", pero no es ese artículo
+    assert inventario._escribir_orden("b", _orden("Televisor LG Full HD (43\")"))
+
+    assert [v["id_articulo"] for v in ventas] == [9, None]
+
+
+def test_el_respaldo_en_bd_tambien_exige_el_nombre_exacto(monkeypatch):
+    inventario, ventas = _inventario(monkeypatch, ARTICULOS)
+
+    assert inventario._escribir_orden("a", _orden("TV LG 55"))
+    assert inventario._escribir_orden("b", _orden("TV LG"))
+
+    assert [v["id_articulo"] for v in ventas] == [4, None]
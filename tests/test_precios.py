@@ -0,0 +1,101 @@
+from src.catalogo_builder import construir_catalogo_desde_articulos
+from src.catalogo_compacto import TablaProductos
+from src.cerebro import Brain
+from src.indice_busqueda import iterar_productos
+from src.precios import IndicePrecios, interpretar_rango_precio
+
+ARTICULOS = [
+    {"id_articulo": 1, "nombre": "Nevera 300L", "marca": "LG", "categoria": "Neveras",
+     "referencia": "GT32BPP", "precio": 1899900, "estado": "Disponible"},
+    {"id_articulo": 2, "nombre": "Nevecón 600L", "marca": "Samsung", "categoria": "Neveras",
+     "referencia": "RS27T5200", "precio": 3500000, "estado": "Disponible"},
+    {"id_articulo": 3, "nombre": "Nevera 250L", "marca": "Haceb", "categoria": "Neveras",
+     "referencia": "HC250", "precio": 1200000, "estado": "Agotado"},
+    {"id_articulo": 4, "nombre": "Lavadora 18kg", "marca": "LG", "categoria": "Lavadoras",
+     "referencia": "WT18", "precio": 1500000, "estado": "Disponible"},
+    {"id_articulo": 5, "nombre": "Televisor 32\" HD", "marca": "Samsung", "categoria": "Televisores",
+     "referencia": "UN32T4300", "precio": 900000, "estado": "Disponible"},
+    {"id_articulo": 6, "nombre": "Televisor 55\" 4K UHD", "marca": "Samsung", "categoria": "Televisores",
+     "referencia": "UN55AU7000", "precio": 2500000, "estado": "Disponible"},
+]
+
+
+def test_interpreta_montos_colombianos():
+    assert interpretar_rango_precio("neveras de menos de 2 millones") == (0, 2_000_000)
+    assert interpretar_rango_precio("presupuesto de 1.500.000") == (0, 1_500_000)
+    assert interpretar_rango_precio("hasta 2m") == (0, 2_000_000)
+    assert interpretar_rango_precio("$2m") == (0, 2_000_000)
+    assert interpretar_rango_precio("mas de 800 mil") == (800_000, float("inf"))
+    assert interpretar_rango_precio("entre 1 y 2 millones") == (1_000_000, 2_000_000)
+    # el primer número toma la unidad real del segundo ("mil" sigue siendo "mil")
+    assert interpretar_rango_precio("entre 800 y 1200 mil") == (800_000, 1_200_000)
+    assert interpretar_rango_precio("entre 800 y 1,2 millones") == (800_000, 1_200_000)
+    assert interpretar_rango_precio("de 800.000 a 1.200.000") == (800_000, 1_200_000)
+    assert interpretar_rango_precio("un millon y medio") == (0, 1_500_000)
+    # teléfonos, opciones de menú y referencias no son precios
+    assert interpretar_rango_precio("mi numero es 3001234567") is None
+    assert interpretar_rango_precio("2") is None
+    assert interpretar_rango_precio("55nu855bpsa") is None
+    assert interpretar_rango_precio("1.023.456.789") is None
+    # "4k" es la resolución, no $4.000
+    assert interpretar_rango_precio("4k") is None
+    assert interpretar_rango_precio("televisor 4k") is None
+    assert interpretar_rango_precio("55 pulgadas 4k por menos de 3 millones") == (0, 3_000_000)
+
+
+def test_indice_por_categoria_con_productos_disponibles():
+    for fabrica in (None, TablaProductos):
+        catalogo = construir_catalogo_desde_articulos(ARTICULOS, fabrica_productos=fabrica)
+        indice = IndicePrecios(iterar_productos(catalogo))
+        clave = next(c for c, datos in catalogo.items() if datos["nombre"].lower() == "neveras")
+
+        # con solo un tope, primero los más cercanos al presupuesto
+        assert [p["nombre"] for *_, p in indice.en_rango(0, 2_000_000, limite=2)] == ["Nevera 300L", "Lavadora 18kg"]
+        assert [p["nombre"] for *_, p in indice.en_rango(0, 2_000_000, clave)] == ["Nevera 300L"]
+        assert [p["nombre"] for *_, p in indice.en_rango(1_000_000, float("inf"), clave)] == ["Nevera 300L", "Nevecón 600L"]
+        assert indice.en_rango(0, 1_000_000, clave) == []
+        assert indice.en_rango(0, 2_000_000, "no-existe") == []
+
+
+def test_indice_omite_productos_sin_referencia():
+    sin_referencia = dict(ARTICULOS[0], id_articulo=7, nombre="Nevera 200L", referencia=None, precio=1700000)
+    for fabrica in (None, TablaProductos):
+        catalogo = construir_catalogo_desde_articulos(ARTICULOS + [sin_referencia], fabrica_productos=fabrica)
+        indice = IndicePrecios(iterar_productos(catalogo))
+        nombres = [p["nombre"] for *_, p in indice.en_rango(0, 2_000_000, limite=10)]
+        assert "Nevera 200L" not in nombres and "Nevera 300L" in nombres
+
+
+def test_flujo_responde_consulta_por_precio(monkeypatch):
+    brain = Brain()
+    monkeypatch.setattr(brain.inventario, 'registrar_interes', lambda *args, **kwargs: None)
+    monkeypatch.setattr(brain.inventario, 'construir_catalogo_desde_bd',
+                        lambda: construir_catalogo_desde_articulos(ARTICULOS))
+    brain.recargar_catalogo()
+
+    brain.procesar_mensaje('hola', '3000000003')
+    respuesta = brain.procesar_mensaje('cuanto cuestan las neveras de menos de 2 millones', '3000000003')
+    assert 'Nevera 300L (ref. GT32BPP)' in respuesta['texto']
+    assert 'Nevecón' not in respuesta['texto'] and 'Lavadora' not in respuesta['texto']
+
+    # la referencia listada lleva al producto
+    respuesta = brain.procesar_mensaje('GT32BPP', '3000000003')
+    assert 'Has seleccionado: *Nevera 300L*' in respuesta['texto']
+
+
+def test_4k_en_los_menus_no_es_consulta_de_precio(monkeypatch):
+    brain = Brain()
+    monkeypatch.setattr(brain.inventario, 'registrar_interes', lambda *args, **kwargs: None)
+    monkeypatch.setattr(brain.inventario, 'construir_catalogo_desde_bd',
+                        lambda: construir_catalogo_desde_articulos(ARTICULOS))
+    brain.recargar_catalogo()
+
+    brain.procesar_mensaje('hola', '3000000004')
+    respuesta = brain.procesar_mensaje('televisor 4k', '3000000004')
+    assert '$4.000' not in respuesta['texto']
+    assert brain.sesiones.obtener('3000000004').estado == 'SELECCIONANDO_CATEGORIA'
+
+    for mensaje in ('televisores', 'samsung'):
+        brain.procesar_mensaje(mensaje, '3000000004')
+    respuesta = brain.procesar_mensaje('4k', '3000000004')
+    assert 'Has seleccionado: *Televisor 55" 4K UHD*' in respuesta['texto']
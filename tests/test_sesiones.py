@@ -0,0 +1,70 @@
+from src import sesiones
+from src.sesiones import AlmacenSesionesMemoria
+
+
+def test_expira_sesiones_inactivas(monkeypatch):
+    reloj = [0.0]
+    monkeypatch.setattr(sesiones.time, "monotonic", lambda: reloj[0])
+    almacen = AlmacenSesionesMemoria(ttl=60)
+    almacen.guardar("300", {"estado": "INICIO"})
+    almacen.guardar("301", {"estado": "INICIO"})
+
+    reloj[0] = 50
+    assert almacen.obtener("300") is not None  # renueva su TTL
+    reloj[0] = 70
+    assert almacen.obtener("301") is None
+    assert almacen.obtener("300") is not None
+    assert almacen.estadisticas()["expiradas"] == 1
+
+
+def test_expulsa_la_menos_reciente_al_superar_el_tope():
+    almacen = AlmacenSesionesMemoria(ttl=0, max_sesiones=2)
+    almacen.guardar("300", {"estado": "INICIO"})
+    almacen.guardar("301", {"estado": "INICIO"})
+    almacen.obtener("300")
+    almacen.guardar("302", {"estado": "INICIO"})
+
+    assert "301" not in almacen
+    assert "300" in almacen and "302" in almacen
+    stats = almacen.estadisticas()
+    assert stats["vivas"] == 2
+    assert stats["expulsadas"] == 1
+    assert stats["memoria_bytes"] > 0
+
+
+def test_sqlite_comparte_sesiones_con_versionado_optimista(tmp_path):
+    ruta = str(tmp_path / "sesiones.db")
+    worker_a = sesiones.AlmacenSesionesSQLite(ruta)
+    worker_b = sesiones.AlmacenSesionesSQLite(ruta)
+
+    assert worker_a.obtener("300") is None
+    worker_a.guardar("300", {"estado": "SELECCIONANDO_CATEGORIA"})
+
+    sesion_b = worker_b.obtener("300")
+    assert sesion_b == {"estado": "SELECCIONANDO_CATEGORIA"}
+    sesion_a = worker_a.obtener("300")
+
+    sesion_b["estado"] = "SELECCIONANDO_SUBCATEGORIA"
+    worker_b.guardar("300", sesion_b)
+
+    sesion_a["estado"] = "FINALIZADO"
+    try:
+        worker_a.guardar("300", sesion_a)
+        assert False, "se esperaba ConflictoVersion"
+    except sesiones.ConflictoVersion:
+        pass
+
+    assert worker_a.obtener("300")["estado"] == "SELECCIONANDO_SUBCATEGORIA"
+
+
+def test_sqlite_no_acumula_versiones_de_telefonos_atendidos(tmp_path):
+    almacen = sesiones.AlmacenSesionesSQLite(str(tmp_path / "sesiones.db"))
+
+    for telefono in ("300", "301", "302"):
+        almacen.obtener(telefono)
+        almacen.guardar(telefono, {"estado": "INICIO"})
+        sesion = almacen.obtener(telefono)
+        almacen.guardar(telefono, sesion)
+
+    assert almacen._versiones() == {}
+    assert almacen.estadisticas()["vivas"] == 3
@@ -0,0 +1,165 @@
+import json
+import zlib
+
+import pytest
+
+from src.catalogo_builder import construir_catalogo_desde_articulos
+from src.sincronizacion import SincronizadorArticulos
+
+
+class TablaArticulosFalsa:
+    columna_actualizacion = None
+
+    def __init__(self, filas):
+        self.filas = {f["id_articulo"]: dict(f) for f in filas}
+        self.filas_leidas = 0
+
+    def _crc(self, fila):
+        return zlib.crc32(json.dumps(fila, sort_keys=True).encode())
+
+    def obtener_articulos_sincronizacion(self, ids=None, modificados_desde=None):
+        seleccion = self.filas if ids is None else {i: self.filas[i] for i in ids if i in self.filas}
+        self.filas_leidas += len(seleccion)
+        return [dict(f, crc_sync=self._crc(f)) for f in seleccion.values()]
+
+    def obtener_huellas_articulos(self):
+        return {i: self._crc(f) for i, f in self.filas.items()}
+
+
+def _articulo(i, categoria, marca, precio=1000000):
+    return {"id_articulo": i, "nombre": f"Producto {i}", "marca": marca,
+            "categoria": categoria, "referencia": f"REF{i}", "precio": precio, "estado": None}
+
+
+def test_solo_reconstruye_las_categorias_afectadas():
+    tabla = TablaArticulosFalsa(
+        [_articulo(1, "Neveras", "LG"), _articulo(2, "Neveras", "Samsung"),
+         _articulo(3, "Televisores", "LG"), _articulo(4, "Lavadoras", "Haceb")]
+    )
+    sync = SincronizadorArticulos(tabla)
+    inicial = sync.sincronizar()
+    assert tabla.filas_leidas == 4
+
+    tabla.filas[2]["precio"] = 999000
+    tabla.filas[5] = _articulo(5, "Neveras", "Samsung")
+    del tabla.filas[4]
+    tabla.filas_leidas = 0
+    actualizado = sync.sincronizar()
+
+    assert tabla.filas_leidas == 2  # solo la fila modificada y la nueva
+    assert actualizado is not inicial
+    assert actualizado["televisores"] is inicial["televisores"]
+    assert actualizado["neveras"]["subcategorias"]["1"] is inicial["neveras"]["subcategorias"]["1"]
+    assert "lavadoras" not in actualizado
+    assert actualizado == construir_catalogo_desde_articulos(list(tabla.filas.values()))
+
+
+def test_sin_cambios_devuelve_el_mismo_catalogo():
+    tabla = TablaArticulosFalsa([_articulo(1, "Neveras", "LG")])
+    sync = SincronizadorArticulos(tabla)
+    inicial = sync.sincronizar()
+
+    assert sync.sincronizar() is inicial
+
+
+def test_carga_completa_en_paralelo_permite_reutilizar_marcas(monkeypatch):
+    monkeypatch.setattr("src.sincronizacion.MIN_ARTICULOS_PARALELO", 0)
+    tabla = TablaArticulosFalsa(
+        [_articulo(1, "Neveras", "LG"), _articulo(2, "Neveras", "Samsung"), _articulo(3, "Televisores", "LG")]
+    )
+    sync = SincronizadorArticulos(tabla, procesos=2)
+    inicial = sync.sincronizar()
+    assert inicial == construir_catalogo_desde_articulos(list(tabla.filas.values()))
+
+    tabla.filas[2]["precio"] = 999000
+    actualizado = sync.sincronizar()
+    assert actualizado["neveras"]["subcategorias"]["1"] is inicial["neveras"]["subcategorias"]["1"]
+    assert actualizado["neveras"]["subcategorias"]["2"]["productos"]["1"]["precio_num"] == 999000
+
+
+def test_motor_compacto_rearma_categorias_sin_guardar_las_filas():
+    from src.catalogo_compacto import TablaProductos
+
+    tabla = TablaArticulosFalsa(
+        [_articulo(1, "Neveras", "LG", precio=1899900.5), _articulo(2, "Neveras", "Samsung"),
+         _articulo(3, "Neveras", "LG", precio=None), _articulo(4, "Televisores", "LG")]
+    )
+    sync = SincronizadorArticulos(tabla, fabrica_productos=TablaProductos)
+    inicial = sync.sincronizar()
+    assert all(len(entrada) == 2 for entrada in sync._articulos.values())  # (crc, categoría), sin filas
+
+    tabla.filas[2]["precio"] = 999000
+    tabla.filas[4]["categoria"] = "Neveras"
+    actualizado = sync.sincronizar()
+
+    esperado = construir_catalogo_desde_articulos(list(tabla.filas.values()), fabrica_productos=TablaProductos)
+    assert actualizado == esperado
+    assert "televisores" not in actualizado
+    # La marca LG de neveras cambió (llegó el televisor); Samsung solo cambió de precio
+    assert actualizado["neveras"]["subcategorias"]["2"]["productos"]["1"]["precio_num"] == 999000
+    lg = actualizado["neveras"]["subcategorias"]["1"]["productos"]
+    assert [lg[pid]["precio"] for pid in lg] == [esperado["neveras"]["subcategorias"]["1"]["productos"][pid]["precio"] for pid in lg]
+
+
+class TablaConMarcaDeAgua(TablaArticulosFalsa):
+    columna_actualizacion = "actualizado"
+
+    def obtener_articulos_sincronizacion(self, ids=None, modificados_desde=None):
+        if modificados_desde is None:
+            return super().obtener_articulos_sincronizacion(ids)
+        seleccion = [f for f in self.filas.values() if f["actualizado"] >= modificados_desde]
+        self.filas_leidas += len(seleccion)
+        return [dict(f, crc_sync=self._crc(f)) for f in seleccion]
+
+    def firma_articulos(self):
+        return (len(self.filas),)
+
+
+def test_marca_de_agua_no_pierde_cambios_del_mismo_segundo():
+    tabla = TablaConMarcaDeAgua(
+        [dict(_articulo(1, "Neveras", "LG"), actualizado=10), dict(_articulo(2, "Neveras", "Samsung"), actualizado=10),
+         dict(_articulo(3, "Televisores", "LG"), actualizado=5)]
+    )
+    sync = SincronizadorArticulos(tabla)
+    inicial = sync.sincronizar()
+
+    # Sin cambios: las filas del segundo 10 vuelven, pero no se reconstruye nada
+    assert sync.sincronizar() is inicial
+
+    # Modificada en el mismo segundo que la marca de agua
+    tabla.filas[2]["precio"] = 999000
+    tabla.filas_leidas = 0
+    actualizado = sync.sincronizar()
+    assert tabla.filas_leidas == 2
+    assert actualizado["neveras"]["subcategorias"]["2"]["productos"]["1"]["precio_num"] == 999000
+    assert actualizado["televisores"] is inicial["televisores"]
+
+    tabla.filas[4] = dict(_articulo(4, "Televisores", "Samsung"), actualizado=11)
+    del tabla.filas[1]
+    actualizado = sync.sincronizar()
+    assert actualizado == construir_catalogo_desde_articulos(list(tabla.filas.values()))
+
+
+def test_carga_completa_usa_la_construccion_vectorizada_si_se_pide(monkeypatch):
+    from src import catalogo_builder
+
+    if not catalogo_builder._pandas():
+        pytest.skip("requiere pandas")
+    llamadas = []
+    original = catalogo_builder.construir_catalogo_vectorizado
+    monkeypatch.setattr("src.sincronizacion.construir_catalogo_vectorizado",
+                        lambda *args: llamadas.append(True) or original(*args))
+    tabla = TablaArticulosFalsa(
+        [_articulo(1, "Neveras", "LG"), _articulo(2, "Neveras", "Samsung"), _articulo(3, "Televisores", "LG")]
+    )
+    assert SincronizadorArticulos(tabla).sincronizar() and llamadas == []
+
+    sync = SincronizadorArticulos(tabla, vectorizado=True)
+    inicial = sync.sincronizar()
+    assert llamadas == [True]
+    assert inicial == construir_catalogo_desde_articulos(list(tabla.filas.values()))
+
+    tabla.filas[2]["precio"] = 999000
+    actualizado = sync.sincronizar()
+    assert actualizado["neveras"]["subcategorias"]["1"] is inicial["neveras"]["subcategorias"]["1"]
+    assert actualizado["neveras"]["subcategorias"]["2"]["productos"]["1"]["precio_num"] == 999000